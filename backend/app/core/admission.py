@@ -0,0 +1,181 @@
+"""Admission control: bounded concurrency and load shedding per request class.
+
+Under a write burst, every sync write route holds a threadpool worker while it waits for the
+SQLite write lock; reads then queue behind them for threads, and everything times out together.
+`AdmissionMiddleware` keeps that from happening: reads and writes each get a concurrency limit
+and a bounded FIFO wait queue. A request that finds the queue full, or waits longer than the
+queue timeout, is answered at once with ``503`` and ``Retry-After`` instead of tying up a
+thread, so the requests that are admitted still finish in normal time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.errors import error_response
+from app.core.metrics import admission_in_flight, admission_queue_depth, admission_shed
+
+READ = "read"
+WRITE = "write"
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionStats:
+    limit: int
+    queue_size: int
+    in_flight: int
+    queued: int
+    admitted: int
+    shed: int
+
+
+class AdmissionLimiter:
+    """A FIFO semaphore with a bounded, time-limited wait queue.
+
+    Lives on the event loop (no locks): slots are handed directly to the oldest waiter on
+    release, so a burst cannot overtake requests that are already queued.
+    """
+
+    def __init__(self, name: str, *, limit: int, queue_size: int, queue_timeout: float) -> None:
+        self.name = name
+        self.limit = max(limit, 1)
+        self.queue_size = max(queue_size, 0)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._waiters: deque[asyncio.Future[bool]] = deque()
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False means the request is shed."""
+
+        if self.in_flight < self.limit and not self._waiters:
+            self._admit()
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self._shed("queue_full")
+            return False
+
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[bool] = loop.create_future()
+        self._waiters.append(waiter)
+        admission_queue_depth.inc((self.name,))
+        timer = loop.call_later(self.queue_timeout, self._expire, waiter)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # The client went away while queued; a slot handed over meanwhile goes to the next one.
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            else:
+                self._forget(waiter)
+            raise
+        finally:
+            timer.cancel()
+        if not admitted:
+            self._shed("queue_timeout")
+        return admitted
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            admission_queue_depth.dec((self.name,))
+            if not waiter.done():
+                # The slot passes straight to the waiter: `in_flight` is unchanged.
+                self.admitted += 1
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+        admission_in_flight.dec((self.name,))
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            limit=self.limit,
+            queue_size=self.queue_size,
+            in_flight=self.in_flight,
+            queued=len(self._waiters),
+            admitted=self.admitted,
+            shed=self.shed,
+        )
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+        admission_in_flight.inc((self.name,))
+
+    def _shed(self, reason: str) -> None:
+        self.shed += 1
+        admission_shed.inc((self.name, reason))
+
+    def _expire(self, waiter: asyncio.Future[bool]) -> None:
+        if not waiter.done():
+            self._forget(waiter)
+            waiter.set_result(False)
+
+    def _forget(self, waiter: asyncio.Future[bool]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            return
+        admission_queue_depth.dec((self.name,))
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware routing each request through the read or the write limiter.
+
+    Writes are the non-safe methods, except ``read_posts`` (POST routes that only read, e.g.
+    batch lookups). ``exempt`` paths bypass admission entirely: health and metrics must answer
+    under overload, and long-lived streams would otherwise hold a slot for their lifetime.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        reads: AdmissionLimiter,
+        writes: AdmissionLimiter,
+        retry_after_seconds: int,
+        read_posts: Collection[str] = (),
+        exempt: Collection[str] = (),
+    ) -> None:
+        self.app = app
+        self.reads = reads
+        self.writes = writes
+        self.retry_after_seconds = retry_after_seconds
+        self.read_posts = frozenset(read_posts)
+        self.exempt = frozenset(exempt)
+
+    def limiter_for(self, scope: Scope) -> AdmissionLimiter | None:
+        path = scope["path"]
+        if path in self.exempt:
+            return None
+        if scope["method"] in _READ_METHODS or path in self.read_posts:
+            return self.reads
+        return self.writes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self.limiter_for(scope) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = error_response(
+                503,
+                code="overloaded",
+                message=f"Too many concurrent {limiter.name} requests; retry later.",
+                headers={"Retry-After": str(self.retry_after_seconds)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+
+from fastapi import Response
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Whether an ``Accept-Encoding`` header allows gzip (``gzip;q=0`` refuses it)."""
+
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedBody:
+    """A response body with its gzip form, compressed once up front."""
+
+    identity: bytes
+    # None when compression is off, the body is below the threshold, or gzip did not shrink it.
+    gzip: bytes | None = None
+
+
+def encode_body(body: bytes, *, minimum_size: int, level: int) -> EncodedBody:
+    if level <= 0 or len(body) < minimum_size:
+        return EncodedBody(body)
+    # mtime=0: identical bodies give identical bytes, whichever process compressed them.
+    compressed = gzip.compress(body, compresslevel=level, mtime=0)
+    return EncodedBody(body, compressed if len(compressed) < len(body) else None)
+
+
+def encoded_response(
+    body: EncodedBody, accept_encoding: str | None, *, media_type: str = "application/json"
+) -> Response:
+    """Serve the stored gzip bytes to clients that accept them, the raw bytes otherwise.
+
+    ``GZipMiddleware`` leaves responses that already carry ``Content-Encoding`` alone.
+    """
+
+    headers = {"Vary": "Accept-Encoding"}
+    if body.gzip is not None and accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=body.gzip, media_type=media_type, headers=headers)
+    return Response(content=body.identity, media_type=media_type, headers=headers)
+
+
+# zlib window bits for a gzip header and trailer around the deflate stream.
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def gzip_stream(chunks: Iterable[str], *, level: int) -> Iterator[bytes]:
+    """Gzip a streamed body chunk by chunk.
+
+    Each chunk ends with a sync flush, so the client can decode everything sent so far:
+    unlike ``GZipMiddleware``, nothing is held back until the compressor's buffer fills.
+    """
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+async def agzip_stream(chunks: AsyncIterable[str], *, level: int) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
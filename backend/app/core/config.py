@@ -4,10 +4,100 @@ from dataclasses import dataclass
 import os
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 @dataclass(frozen=True, slots=True)
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
+    # Serve the expense routers from native `async def` routes backed by an AsyncEngine
+    # (aiosqlite for SQLite) instead of sync routes on the threadpool.
+    db_async: bool = _env_bool("DB_ASYNC", False)
+    # Optional explicit async URL; derived from `database_url` when empty.
+    async_database_url: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # Optional read-only database for the list / search / catalog routes: a replica, or locally
+    # a second SQLite file or the primary opened read-only (`sqlite:///file:app.db?mode=ro&uri=true`).
+    # Empty: reads go to the primary.
+    read_database_url: str = os.getenv("READ_DATABASE_URL", "")
+    async_read_database_url: str = os.getenv("ASYNC_READ_DATABASE_URL", "")
+
+    # SQLite connection tuning applied on every new connection.
+    # "production": WAL journal (readers never block the writer), synchronous=NORMAL
+    # (durable at checkpoints, safe with WAL), a busy timeout instead of instant
+    # "database is locked", bigger page cache, memory-mapped reads, in-memory temp tables.
+    # "legacy": only `foreign_keys=ON` (rollback journal, SQLite defaults).
+    sqlite_profile: str = os.getenv("SQLITE_PROFILE", "production")
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    # Negative values are KiB (SQLite convention): -65536 = 64 MiB per connection.
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    sqlite_temp_store: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # Connection pool (QueuePool; ignored for in-memory SQLite, which uses one connection per thread).
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Seconds after which a connection is replaced; -1 keeps connections forever.
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    db_pool_pre_ping: bool = _env_bool("DB_POOL_PRE_PING", False)
+
+    # Lifetime of cached list / catalog responses (see `PAYLOAD_CACHE_MAX_ENTRIES` below).
+    catalog_cache_ttl_seconds: float = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+    # Multi-worker coherence: the cached read routes check, at most every
+    # `CACHE_COHERENCE_INTERVAL_MS` (0 = every request), whether another process wrote to the
+    # database, and drop only what changed. Bounds how stale another worker's write can look.
+    cache_coherence: bool = _env_bool("CACHE_COHERENCE", True)
+    cache_coherence_interval_ms: int = int(os.getenv("CACHE_COHERENCE_INTERVAL_MS", "100"))
+
+    # gzip for responses of at least `GZIP_MINIMUM_SIZE` bytes when the client accepts it;
+    # `GZIP_LEVEL=0` turns compression off. List and catalog payloads are compressed once per
+    # catalog revision and kept, raw and gzipped, in a cache of `PAYLOAD_CACHE_MAX_ENTRIES`
+    # responses (`0` disables it).
+    gzip_minimum_size: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+    gzip_level: int = int(os.getenv("GZIP_LEVEL", "6"))
+    payload_cache_max_entries: int = int(os.getenv("PAYLOAD_CACHE_MAX_ENTRIES", "256"))
+
+    # `GET /events` (server-sent change events): per-connection queue bound (a client that falls
+    # further behind is sent `resync` and disconnected), events kept for `Last-Event-ID` resume,
+    # and the keep-alive interval of an idle stream.
+    events_queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+    events_replay_size: int = int(os.getenv("EVENTS_REPLAY_SIZE", "1024"))
+    events_keepalive_seconds: float = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+
+    # Start-up seeding of an empty DB, off unless `SEED_ON_STARTUP` is set: the small demo catalog
+    # by default, or a synthetic catalog of `SEED_SYNTHETIC_CODES` codes (see `app.db.synthetic`).
+    seed_on_startup: bool = _env_bool("SEED_ON_STARTUP", False)
+    seed_synthetic_codes: int = int(os.getenv("SEED_SYNTHETIC_CODES", "0"))
+    seed_synthetic_categories: int = int(os.getenv("SEED_SYNTHETIC_CATEGORIES", "1000"))
+    seed_synthetic_seed: int = int(os.getenv("SEED_SYNTHETIC_SEED", "0"))
+
+    # Open the pool's connections and run the hot read statements once before serving.
+    startup_warmup: bool = _env_bool("STARTUP_WARMUP", True)
+
+    # Admission control (see `app.core.admission`): concurrent reads and writes each get a limit
+    # and a bounded wait queue; a request that finds its queue full, or waits longer than
+    # `ADMISSION_QUEUE_TIMEOUT_MS`, gets 503 with `Retry-After`. Keep the two limits together
+    # under the threadpool size (40), so an admitted sync request never waits for a thread.
+    # SQLite has one writer, so a few concurrent writes already keep it busy.
+    admission_control: bool = _env_bool("ADMISSION_CONTROL", True)
+    admission_read_limit: int = int(os.getenv("ADMISSION_READ_LIMIT", "32"))
+    admission_read_queue: int = int(os.getenv("ADMISSION_READ_QUEUE", "128"))
+    admission_write_limit: int = int(os.getenv("ADMISSION_WRITE_LIMIT", "4"))
+    admission_write_queue: int = int(os.getenv("ADMISSION_WRITE_QUEUE", "64"))
+    admission_queue_timeout_ms: int = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+    admission_retry_after_seconds: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+    # Request / SQL / pool metrics, exposed in Prometheus text format at `GET /metrics`.
+    metrics_enabled: bool = _env_bool("METRICS_ENABLED", True)
+
     # Comma-separated list of allowed origins for CORS
     cors_origins: str = os.getenv(
         "CORS_ORIGINS",
@@ -35,20 +35,25 @@ class DatabaseError(AppError):
     pass
 
 
+def error_response(
+    status_code: int, *, code: str, message: str, headers: dict[str, str] | None = None, **extra: Any
+) -> JSONResponse:
+    """The error envelope, for handlers below and for middleware (which runs outside them)."""
+
+    detail: dict[str, Any] = {"code": code, "message": message}
+    if extra:
+        detail.update(extra)
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
 def register_error_handlers(app: FastAPI) -> None:
     """Register JSON error handlers to keep a consistent error format."""
 
-    def _response(status_code: int, *, code: str, message: str, **extra: Any) -> JSONResponse:
-        detail: dict[str, Any] = {"code": code, "message": message}
-        if extra:
-            detail.update(extra)
-        return JSONResponse(status_code=status_code, content={"detail": detail})
-
     # --- FastAPI / Pydantic validation (422) -> same envelope format ---
     @app.exception_handler(RequestValidationError)
     async def _request_validation_error_handler(_request: Request, exc: RequestValidationError) -> JSONResponse:
         # exc.errors() -> list of validation issues from Pydantic
-        return _response(
+        return error_response(
             422,
             code="validation_error",
             message="Request validation failed.",
@@ -63,7 +68,7 @@ def register_error_handlers(app: FastAPI) -> None:
             return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
         # Otherwise normalise into our envelope.
-        return _response(exc.status_code, code="http_error", message=str(exc.detail))
+        return error_response(exc.status_code, code="http_error", message=str(exc.detail))
 
     # --- Domain errors ---
     @app.exception_handler(ValidationError)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Response
+
+
+def make_etag(*parts: object) -> str:
+    """Strong entity tag over ``parts`` (revision numbers, query fingerprint, ...)."""
+
+    raw = "|".join(str(p) for p in parts).encode()
+    return '"' + hashlib.blake2s(raw, digest_size=12).hexdigest() + '"'
+
+
+def gzip_etag(etag: str) -> str:
+    """The tag of ``etag``'s gzip-encoded representation.
+
+    A strong tag names exact bytes, so the gzip body needs its own (RFC 9110, 8.8.3).
+    """
+
+    return etag[:-1] + '-gz"'
+
+
+def matching_etag(if_none_match: str | None, etag: str) -> str | None:
+    """The tag in ``If-None-Match`` naming a representation of ``etag`` (identity or gzip).
+
+    Weak comparison, as RFC 9110 requires for ``If-None-Match``. ``*`` is not honoured:
+    answering it would need to know the resource exists, which is exactly the query we are
+    trying to skip.
+    """
+
+    if not if_none_match:
+        return None
+
+    variants = (etag, gzip_etag(etag))
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in variants:
+            return candidate
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    """``304`` carrying ``etag``: the matched tag, so caches refresh the variant they hold."""
+
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but always revalidate with If-None-Match.
+    response.headers["Cache-Control"] = "no-cache"
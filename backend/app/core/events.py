@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+# Sent to a subscriber that fell behind (its queue overflowed) or asked to resume from an event
+# that is no longer buffered: it must refetch whatever it shows, then carry on from the live stream.
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+KEEPALIVE_FRAME = b": keep-alive\n\n"
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    seq: int
+    frame: bytes
+
+
+@dataclass(eq=False, slots=True)
+class Subscription:
+    """One connected client: a bounded queue of encoded frames, filled on the event loop."""
+
+    queue: asyncio.Queue[Event | None]
+    backlog: list[bytes] = field(default_factory=list)
+    # Highest sequence number already queued or replayed; later duplicates are skipped.
+    last_seq: int = 0
+    lagged: bool = False
+
+    def offer(self, event: Event) -> None:
+        if self.lagged or event.seq <= self.last_seq:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.end(resync=True)
+            return
+        self.last_seq = event.seq
+
+    def end(self, *, resync: bool = False) -> None:
+        # Backpressure: rather than buffer without bound for a slow client, drop what it has not
+        # read yet and make it resync (EventSource reconnects and resumes from the replay buffer).
+        # A plain close keeps what is queued, unless there is no room left for the end marker.
+        self.lagged = self.lagged or resync or self.queue.full()
+        if self.lagged:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventBroker:
+    """In-process pub/sub for server-sent events.
+
+    `publish` is thread-safe and cheap: the frame is encoded once, appended to a bounded replay
+    buffer, and handed to the event loop, which copies it into every subscriber's bounded queue.
+    Subscribers are plain asyncio queues, so thousands of idle connections cost no threads.
+    Event ids are ``<epoch>:<seq>``; the random per-process epoch makes ids from a previous
+    process resync instead of resuming at the wrong place.
+    """
+
+    def __init__(self, *, queue_size: int, replay_size: int) -> None:
+        self.queue_size = max(queue_size, 2)
+        self._lock = threading.Lock()
+        self._recent: deque[Event] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.epoch = secrets.token_hex(4)
+        self._seq = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Mapping[str, Any]) -> int:
+        payload = json.dumps(data, separators=(",", ":"))
+        with self._lock:
+            self._seq += 1
+            event = Event(
+                self._seq, f"id: {self.epoch}:{self._seq}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+            )
+            self._recent.append(event)
+            # Scheduled under the lock, so the loop fans events out in sequence order.
+            self._call_in_loop(self._fan_out, event)
+        return event.seq
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscription:
+        """Register a subscriber on the running loop, with any missed events as its backlog."""
+
+        subscription = Subscription(asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(subscription)
+            subscription.last_seq = self._seq
+            recent = list(self._recent)
+
+        if last_event_id is not None:
+            epoch, _, seq = last_event_id.partition(":")
+            resume_after = int(seq) if epoch == self.epoch and seq.isdigit() else -1
+            if resume_after >= 0 and (not recent or recent[0].seq <= resume_after + 1):
+                subscription.backlog = [e.frame for e in recent if e.seq > resume_after]
+            elif resume_after != subscription.last_seq:
+                subscription.backlog = [RESYNC_FRAME]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    async def stream(self, subscription: Subscription, *, keepalive_seconds: float) -> AsyncIterator[bytes]:
+        """SSE body for ``subscription``; ends on `close` or overflow, unsubscribes when done."""
+
+        try:
+            for frame in subscription.backlog:
+                yield frame
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), keepalive_seconds)
+                except TimeoutError:
+                    # Keeps proxies from timing the connection out and surfaces dead clients.
+                    yield KEEPALIVE_FRAME
+                    continue
+                if event is None:
+                    if subscription.lagged:
+                        yield RESYNC_FRAME
+                    return
+                yield event.frame
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self) -> None:
+        """End every open stream (e.g. on shutdown, so the server does not wait on them)."""
+
+        with self._lock:
+            self._call_in_loop(self._end_all)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._subscribers.clear()
+            self._loop = None
+            self.epoch = secrets.token_hex(4)
+            self._seq = 0
+
+    def _call_in_loop(self, callback: Any, *args: Any) -> None:
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop has shut down; its subscribers are gone with it.
+            self._loop = None
+
+    def _fan_out(self, event: Event) -> None:
+        for subscription in list(self._subscribers):
+            subscription.offer(event)
+
+    def _end_all(self) -> None:
+        for subscription in list(self._subscribers):
+            subscription.end()
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Labels = tuple[str, ...]
+
+# Prometheus client defaults.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _check(self, labels: Labels) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels!r}")
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop every recorded value (tests start each case from zero)."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._check(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        lines = super().render()
+        lines += [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in values]
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._check(labels)
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        # Unlabelled gauges are always exposed, even before their first update.
+        if not self.labelnames and () not in self._values:
+            self.set(0.0)
+        return super().render()
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; buckets are stored per bucket and made cumulative on render."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # labels -> [count per finite bucket..., count above the last bucket], sum
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        self._check(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+
+        lines = super().render()
+        names = (*self.labelnames, "le")
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = _format_labels(names, (*labels, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Sampled(_Metric):
+    """A counter or gauge read from its owner at scrape time (e.g. a cache's own counters)."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        kind: str,
+        sample: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self._sample = sample
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines += [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._sample()]
+        return lines
+
+    def reset(self) -> None:
+        # Nothing stored here; the owner resets its own counters.
+        pass
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def sampled(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        kind: str,
+        sample: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> Sampled:
+        return self._register(Sampled(name, documentation, labelnames, kind=kind, sample=sample))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+registry = MetricsRegistry()
+
+_ROUTE_LABELS = ("method", "route")
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", (*_ROUTE_LABELS, "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the last body byte is sent.", _ROUTE_LABELS
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+request_db_statements = registry.histogram(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request.",
+    _ROUTE_LABELS,
+    buckets=(0, 1, 2, 3, 4, 5, 10, 25, 50, 100),
+)
+request_db_time = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request.",
+    _ROUTE_LABELS,
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+db_statements = registry.counter("db_statements_total", "SQL statements executed, in or out of requests.")
+db_pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a pooled connection (waiting for a free slot, or opening a new one).",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+admission_in_flight = registry.gauge(
+    "admission_in_flight", "Requests admitted and being served, by class (read / write).", ("class",)
+)
+admission_queue_depth = registry.gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot, by class.", ("class",)
+)
+admission_shed = registry.counter(
+    "admission_shed_total", "Requests rejected with 503 by admission control.", ("class", "reason")
+)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+# Set by `MetricsMiddleware` for the duration of a request. Threadpool work (sync routes and
+# dependencies, streamed bodies) runs in a copy of the context, so it updates the same object.
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def record_statement(seconds: float) -> None:
+    """Called by the engine hooks after every cursor execution."""
+
+    db_statements.inc()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_label(scope: Scope) -> str:
+    # FastAPI stores the matched route in the scope; its template keeps label cardinality bounded.
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task, unlike ``BaseHTTPMiddleware``)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        http_in_flight.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - start
+            http_in_flight.dec()
+            _request_stats.reset(token)
+
+            labels = (scope["method"], _route_label(scope))
+            http_requests.inc((*labels, str(status_code)))
+            http_request_duration.observe(elapsed, labels)
+            request_db_statements.observe(stats.statements, labels)
+            request_db_time.observe(stats.db_seconds, labels)
+
+
+def metrics_response() -> Response:
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Generic, Literal, TypeVar
+
+from app.core.errors import ValidationError
+
+T = TypeVar("T")
+
+SortOrder = Literal["asc", "desc"]
+
+MAX_PAGE_LIMIT = 1000
+
+# Response header carrying the opaque cursor of the next page (absent on the last page).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the keyset position (last seen id) as an opaque, URL-safe token."""
+
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValidationError("invalid_cursor", "Pagination cursor is malformed.")
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValidationError("invalid_cursor", "Pagination cursor is malformed.")
+    return last_id
+
+
+def paginate(rows: list[T], limit: int | None, *, key: str = "id") -> Page[T]:
+    """Build a page from ``limit + 1`` fetched rows.
+
+    Repos fetch one extra row so we know whether another page exists without a COUNT.
+    """
+
+    if limit is None or len(rows) <= limit:
+        return Page(items=rows)
+
+    items = rows[:limit]
+    return Page(items=items, next_cursor=encode_cursor(getattr(items[-1], key)))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Generic, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+R = TypeVar("R")
+
+
+class RecordListEncoder(Generic[R]):
+    """Encode plain rows straight to JSON bytes through a pre-built ``TypeAdapter``.
+
+    ``record`` is a ``TypedDict`` mirroring a response model field for field, so the output
+    is byte-identical to what FastAPI renders for ``response_model=list[Model]``, without
+    validating every row into a model first and then dumping it again.
+    """
+
+    def __init__(self, record: type[R]) -> None:
+        self._adapter = TypeAdapter(list[record])
+
+    def encode(self, records: Iterable[Mapping[str, Any]]) -> bytes:
+        return self._adapter.dump_json(records if isinstance(records, list) else list(records))
+
+    def encode_rows(self, rows: Iterable[Any]) -> bytes:
+        """Encode SQLAlchemy ``Row`` objects whose column labels match the record keys."""
+
+        return self._adapter.dump_json([row._asdict() for row in rows])
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap bytes that are already JSON; FastAPI skips ``response_model`` for a ``Response``."""
+
+    return Response(content=body, status_code=status_code, media_type="application/json")
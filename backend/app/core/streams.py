@@ -0,0 +1,40 @@
+"""Blocking reads of an ASGI request body, for parsers that run on the threadpool."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import AsyncIterator
+
+from anyio.from_thread import run as run_on_loop
+
+
+class RequestBodyReader(io.RawIOBase):
+    """Raw binary stream over ``Request.stream()``, read from a threadpool worker.
+
+    A read that needs more data fetches the next body chunk from the event loop, so a parser
+    consumes the body as it arrives: nothing is buffered beyond the chunk being parsed, and
+    the client is slowed down by TCP backpressure while the worker is busy with the database.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        while not self._pending and not self._eof:
+            chunk = run_on_loop(self._next_chunk)
+            if chunk is None:
+                self._eof = True
+            else:
+                self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    async def _next_chunk(self) -> bytes | None:
+        return await anext(self._chunks, None)
@@ -0,0 +1,155 @@
+"""Per-category code counters: ``expense_categories.active_codes`` / ``inactive_codes``.
+
+On SQLite, triggers on ``expense_codes`` keep the counters in the writing transaction, so
+every write path (single-row, bulk, status cascades, imports, raw SQL) is covered and a
+single-row write is still one statement. Other databases get no triggers; the categories
+repo counts live there instead.
+
+The counters can only drift if the triggers were missing while codes changed (e.g. a
+restore from a database written by an older release). To check and repair:
+
+    python -m app.db.counts check
+    python -m app.db.counts rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import Boolean, Connection, Integer, cast, column, func, or_, select, table, text, update
+
+from .revisions import NEXT_REVISION
+
+# Lightweight table clauses: `models` installs the triggers from here, so this module cannot
+# import the mapped tables.
+_categories = table(
+    "expense_categories",
+    column("id", Integer),
+    column("active_codes", Integer),
+    column("inactive_codes", Integer),
+    column("revision", Integer),
+)
+_codes = table("expense_codes", column("category_id", Integer), column("is_active", Boolean))
+
+_ACTIVE = "CASE WHEN {row}.is_active THEN 1 ELSE 0 END"
+_INACTIVE = "CASE WHEN {row}.is_active THEN 0 ELSE 1 END"
+
+
+def _adjust(row: str, sign: str) -> str:
+    return f"""
+        UPDATE expense_categories
+        SET active_codes = active_codes {sign} {_ACTIVE.format(row=row)},
+            inactive_codes = inactive_codes {sign} {_INACTIVE.format(row=row)}
+        WHERE id = {row}.category_id;"""
+
+
+_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_count_ai AFTER INSERT ON expense_codes BEGIN{_adjust("new", "+")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_count_ad AFTER DELETE ON expense_codes BEGIN{_adjust("old", "-")}
+    END
+    """,
+    # Only status or category moves change a count; description edits skip the trigger body.
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_count_au AFTER UPDATE OF is_active, category_id ON expense_codes
+    WHEN old.is_active IS NOT new.is_active OR old.category_id IS NOT new.category_id
+    BEGIN{_adjust("old", "-")}{_adjust("new", "+")}
+    END
+    """,
+)
+_TRIGGER_NAMES = ("expense_codes_count_ai", "expense_codes_count_ad", "expense_codes_count_au")
+
+# Everything `install_code_counts` creates (part of the schema fingerprint).
+CODE_COUNTS_DDL = _TRIGGERS
+
+
+def install_code_counts(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in _TRIGGERS:
+        connection.execute(text(trigger))
+
+
+def drop_code_counts(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in _TRIGGER_NAMES:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+
+
+def _actual_counts():
+    """``(category_id, active, inactive)`` for every category that has codes: one pass over the
+    ``(category_id, is_active)`` index."""
+
+    return (
+        select(
+            _codes.c.category_id,
+            func.sum(cast(_codes.c.is_active, Integer)).label("active"),
+            func.sum(cast(~_codes.c.is_active, Integer)).label("inactive"),
+        )
+        .group_by(_codes.c.category_id)
+        .subquery()
+    )
+
+
+def _drifted():
+    """Categories whose counters disagree with their codes, with the correct counts."""
+
+    actual = _actual_counts()
+    active = func.coalesce(actual.c.active, 0)
+    inactive = func.coalesce(actual.c.inactive, 0)
+    return (
+        select(_categories.c.id, active.label("active"), inactive.label("inactive"))
+        .select_from(_categories.outerjoin(actual, actual.c.category_id == _categories.c.id))
+        .where(or_(_categories.c.active_codes != active, _categories.c.inactive_codes != inactive))
+    )
+
+
+def rebuild_code_counts(connection: Connection) -> int:
+    """Recompute the counters with one ``GROUP BY``; returns how many categories were wrong.
+
+    Only the drifted categories are written, and they get a new ``revision``: the counts are
+    part of the `include_counts` lists, so their ETags and cached payloads must move too (in
+    every worker, through the coherence check).
+    """
+
+    drifted = _drifted().subquery()
+    if not connection.execute(select(func.count()).select_from(drifted)).scalar_one():
+        return 0
+    return connection.execute(
+        update(_categories)
+        .where(_categories.c.id == drifted.c.id)
+        .values(active_codes=drifted.c.active, inactive_codes=drifted.c.inactive, revision=NEXT_REVISION)
+    ).rowcount
+
+
+def count_drift(connection: Connection) -> int:
+    """Number of categories whose counters disagree with their codes."""
+
+    return connection.execute(select(func.count()).select_from(_drifted().subquery())).scalar_one()
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.core.logging import configure_logging
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("check", "rebuild"))
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    with engine.begin() as connection:
+        if args.command == "rebuild":
+            repaired = rebuild_code_counts(connection)
+            print(f"repaired counters of {repaired} categories")
+            return 0
+        drifted = count_drift(connection)
+    print(f"{drifted} categories with drifted counters")
+    return 1 if drifted else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
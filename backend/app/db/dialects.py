@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session | AsyncSession, table: Any) -> sqlite.Insert | postgresql.Insert:
+    """Return a dialect-specific INSERT supporting ``ON CONFLICT`` clauses.
+
+    SQLite (3.24+) and Postgres share the ``on_conflict_do_nothing`` / ``RETURNING`` API,
+    so repos can build set-based "insert, skip duplicates" statements without caring
+    which backend they run on.
+    """
+
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
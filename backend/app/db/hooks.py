@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+_ON_COMMIT_KEY = "on_commit_callbacks"
+
+
+def on_commit(db: Session | AsyncSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction has committed.
+
+    Services use this for side effects that must not happen on flush (cache invalidation,
+    notifications): if the transaction rolls back, the callback is dropped.
+    """
+
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info.setdefault(_ON_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_ON_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_on_commit_callbacks(session: Session, transaction: SessionTransaction) -> None:
+    # Fires after `after_commit` on success, so anything left here belongs to a rollback.
+    if transaction.parent is None:
+        session.info.pop(_ON_COMMIT_KEY, None)
@@ -0,0 +1,87 @@
+"""Bulk-load categories and codes from a CSV or NDJSON file.
+
+    python -m app.db.importer catalog.csv --rejected rejected.csv
+
+CSV columns: ``category``, ``code``, ``description``, ``is_active``, ``category_is_active``
+(a file from ``GET /export?format=csv`` works as-is). Rows without a code only create
+the category. Rejected rows are written to ``--rejected`` with their line and reason.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+
+from app.core.logging import configure_logging
+from app.db.schema import bootstrap_schema
+from app.db.session import SessionLocal, engine
+from app.modules.expenses.imports import service as import_service
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=sorted(import_service.READERS), default=None)
+    parser.add_argument("--batch-size", type=int, default=import_service.IMPORT_BATCH_SIZE)
+    parser.add_argument("--commit-every", type=int, default=import_service.IMPORT_COMMIT_EVERY)
+    parser.add_argument("--rejected", type=Path, default=None, help="CSV file for rejected rows")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    fmt = args.format or ("ndjson" if args.path.suffix in {".ndjson", ".jsonl"} else "csv")
+    rejected_path = args.rejected or args.path.with_suffix(".rejected.csv")
+
+    bootstrap_schema(engine)
+
+    started = time.perf_counter()
+    with args.path.open(encoding="utf-8-sig", newline="") as source, rejected_path.open(
+        "w", encoding="utf-8", newline=""
+    ) as rejected_file:
+        writer = csv.writer(rejected_file)
+        writer.writerow(["line", "reason", "data"])
+
+        def on_reject(row: import_service.RejectedRow) -> None:
+            data = row.data if isinstance(row.data, str) else json.dumps(row.data, ensure_ascii=False)
+            writer.writerow([row.line, row.reason, data])
+
+        def on_progress(report: import_service.ImportReport) -> None:
+            logger.info(
+                "import progress: %d rows read, %d codes created, %d rejected (%.1fs)",
+                report.rows_read,
+                report.codes_created,
+                report.rejected,
+                time.perf_counter() - started,
+            )
+
+        try:
+            report = import_service.import_catalog(
+                SessionLocal,
+                import_service.READERS[fmt](source),
+                batch_size=args.batch_size,
+                commit_every=args.commit_every,
+                on_reject=on_reject,
+                on_progress=on_progress,
+            )
+        except import_service.ImportBodyError as exc:
+            logger.error("import aborted: %s", exc.message)
+            return 1
+
+    logger.info(
+        "import done in %.1fs: %d categories and %d codes created, %d rows rejected (see %s)",
+        time.perf_counter() - started,
+        report.categories_created,
+        report.codes_created,
+        report.rejected,
+        rejected_path,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,13 @@
 # backend/app/models.py
 from __future__ import annotations
 
-from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, UniqueConstraint, event
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from .counts import install_code_counts
+from .revisions import NEXT_REVISION, install_revision_counter
+from .search import drop_search_index, install_search_index
+
 
 class Base(DeclarativeBase):
     pass
@@ -15,10 +19,18 @@ class ExpenseCategory(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Bumped by every write (see `NEXT_REVISION`); `GET /catalog/changes` reads it.
+    revision: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=NEXT_REVISION, onupdate=NEXT_REVISION, index=True
+    )
+    # Maintained by triggers on expense_codes (see `counts`); never written by the app.
+    active_codes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    inactive_codes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     # one-to-many
     codes: Mapped[list["ExpenseCode"]] = relationship(
         back_populates="category",
+        order_by="ExpenseCode.id",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
@@ -42,6 +54,9 @@ class ExpenseCode(Base):
     code: Mapped[str] = mapped_column(String(64), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    revision: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=NEXT_REVISION, onupdate=NEXT_REVISION, index=True
+    )
 
     category: Mapped["ExpenseCategory"] = relationship(back_populates="codes")
 
@@ -50,3 +65,15 @@ class ExpenseCode(Base):
         Index("ix_expense_codes_category_id_is_active", "category_id", "is_active"),
         Index("ix_expense_codes_code", "code"),
     )
+
+
+@event.listens_for(ExpenseCode.__table__, "after_create")
+def _create_search_index(_target, connection, **_kw) -> None:
+    install_search_index(connection)
+    install_code_counts(connection)
+    install_revision_counter(connection)
+
+
+@event.listens_for(ExpenseCode.__table__, "after_drop")
+def _drop_search_index(_target, connection, **_kw) -> None:
+    drop_search_index(connection)
@@ -0,0 +1,130 @@
+"""Catalog revisions: the ``revision`` every write stamps on the rows it touches.
+
+Revisions must become visible in increasing order: `GET /catalog/changes?since=` and the list
+ETags assume that once revision ``r`` is visible, nothing at or below ``r`` can still appear.
+
+SQLite has a single writer, so `NEXT_REVISION` is simply one more than the highest revision
+in either table, evaluated inside the write. Elsewhere concurrent transactions would read the
+same maximum, and a sequence would hand out unique values that still commit out of order. So
+each writing transaction first bumps the one row of ``catalog_revision``: the row lock is held
+until commit, writers queue on it, and the revision a transaction gets is always above every
+revision already committed. Every row that transaction writes carries its value.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    Integer,
+    MetaData,
+    Table,
+    column,
+    event,
+    func,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.dml import Insert, Update
+from sqlalchemy.sql.expression import FunctionElement
+
+# Tables whose rows carry a revision (lightweight clauses: `models` imports this module).
+_REVISIONED = ("expense_categories", "expense_codes")
+
+
+def _latest_revision():
+    revisions = union_all(
+        *(
+            select(func.max(column("revision")).label("revision")).select_from(table(name, column("revision")))
+            for name in _REVISIONED
+        )
+    ).subquery()
+    return select(func.coalesce(func.max(revisions.c.revision), 0))
+
+
+LATEST_REVISION = _latest_revision()
+
+# Kept out of `Base.metadata`: only databases with concurrent writers get it.
+_counter_metadata = MetaData()
+revision_counter_table = Table(
+    "catalog_revision",
+    _counter_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+_COUNTER = revision_counter_table.c
+_CURRENT = select(_COUNTER.value).where(_COUNTER.id == 1)
+_BUMP = revision_counter_table.update().where(_COUNTER.id == 1).values(value=_COUNTER.value + 1)
+
+# `Connection.info` flag: this transaction already holds the counter.
+_BUMPED_KEY = "catalog_revision_bumped"
+
+
+def uses_revision_counter(dialect: Dialect) -> bool:
+    return dialect.name != "sqlite"
+
+
+class _NextRevision(FunctionElement):
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(_NextRevision, "sqlite")
+def _next_revision_sqlite(element, compiler, **kw):
+    # Two index lookups inside the write, no extra statement. All rows that one statement
+    # writes share its revision.
+    return compiler.process((LATEST_REVISION.scalar_subquery() + 1).self_group(), **kw)
+
+
+@compiles(_NextRevision)
+def _next_revision(element, compiler, **kw):
+    # The value `_bump_revision_counter` just took for this transaction.
+    return compiler.process(_CURRENT.scalar_subquery(), **kw)
+
+
+# Catalog revision of a write, rendered per dialect.
+NEXT_REVISION = _NextRevision()
+
+
+@event.listens_for(Engine, "before_execute")
+def _bump_revision_counter(conn, clauseelement, multiparams, params, execution_options) -> None:
+    if not isinstance(clauseelement, (Insert, Update)) or clauseelement.table.name not in _REVISIONED:
+        return
+    if not uses_revision_counter(conn.dialect) or conn.info.get(_BUMPED_KEY):
+        return
+    conn.info[_BUMPED_KEY] = True
+    conn.execute(_BUMP)
+
+
+@event.listens_for(Engine, "begin")
+@event.listens_for(Engine, "rollback_savepoint")
+def _release_revision_counter(conn, *_args) -> None:
+    # A new transaction takes its own revision; after a savepoint rollback the bump may be undone.
+    conn.info.pop(_BUMPED_KEY, None)
+
+
+def revision_counter_ddl(dialect: Dialect) -> tuple[str, ...]:
+    """Everything `install_revision_counter` creates (part of the schema fingerprint there)."""
+
+    return (str(CreateTable(revision_counter_table).compile(dialect=dialect)).strip(),)
+
+
+def install_revision_counter(connection: Connection) -> None:
+    """Create the counter where it is used, starting from the highest revision already written."""
+
+    if not uses_revision_counter(connection.dialect):
+        return
+    revision_counter_table.create(connection, checkfirst=True)
+    latest = connection.execute(LATEST_REVISION).scalar_one()
+    updated = connection.execute(
+        revision_counter_table.update()
+        .where(_COUNTER.id == 1, _COUNTER.value < latest)
+        .values(value=latest)
+    ).rowcount
+    if not updated and connection.execute(_CURRENT).first() is None:
+        connection.execute(revision_counter_table.insert().values(id=1, value=latest))
@@ -0,0 +1,299 @@
+"""Versioned schema bootstrap.
+
+Every process start reads one row from ``schema_version`` and compares it with the code's
+`SCHEMA_VERSION` and schema fingerprint; when they match (the normal case) nothing else
+touches the catalog. Only when the database is behind does a process take the migration
+lock, re-check (another worker may have just finished), and apply the pending `MIGRATIONS`.
+
+    python -m app.db.schema status
+    python -m app.db.schema upgrade
+
+To change the schema: change the models, then append a `Migration` that brings an existing
+database from the previous version to the new one. Fresh databases are created from the
+models directly and stamped with the latest version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Connection, Engine, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.db.counts import CODE_COUNTS_DDL, install_code_counts, rebuild_code_counts
+from app.db.revisions import install_revision_counter, revision_counter_ddl, uses_revision_counter
+from app.db.search import SEARCH_INDEX_DDL, install_search_index
+
+logger = logging.getLogger(__name__)
+
+# Kept out of `Base.metadata`: bookkeeping, not part of the fingerprinted schema.
+_bookkeeping = MetaData()
+schema_version_table = Table(
+    "schema_version",
+    _bookkeeping,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", String(32), nullable=False),
+)
+
+# How long a worker waits for another process's migration before giving up.
+MIGRATION_LOCK_TIMEOUT_SECONDS = 300.0
+# Arbitrary application-wide key for `pg_advisory_xact_lock`.
+_PG_LOCK_KEY = 0x65787063
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _baseline(connection: Connection) -> None:
+    """Version 1: the schema as ``create_all`` + search index built it before versioning.
+
+    Also adopts databases from that era (tables present, no ``schema_version`` row):
+    ``create_all`` only adds what is missing.
+    """
+
+    Base.metadata.create_all(bind=connection)
+    install_search_index(connection)
+
+
+def _add_revision_columns(connection: Connection) -> None:
+    """Version 2: ``revision`` on categories and codes, for ``GET /catalog/changes``.
+
+    Existing rows all count as revision 1, so a sync from 0 still returns them.
+    """
+
+    for model in (ExpenseCategory, ExpenseCode):
+        table = model.__table__
+        if "revision" not in {c["name"] for c in inspect(connection).get_columns(table.name)}:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN revision INTEGER NOT NULL DEFAULT 1"))
+        for index in table.indexes:
+            if "revision" in index.columns:
+                index.create(connection, checkfirst=True)
+
+
+def _add_code_counts(connection: Connection) -> None:
+    """Version 3: ``active_codes`` / ``inactive_codes`` on categories, filled by one ``GROUP BY``."""
+
+    existing = {c["name"] for c in inspect(connection).get_columns(ExpenseCategory.__tablename__)}
+    for name in ("active_codes", "inactive_codes"):
+        if name not in existing:
+            connection.execute(
+                text(f"ALTER TABLE {ExpenseCategory.__tablename__} ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0")
+            )
+    install_code_counts(connection)
+    rebuild_code_counts(connection)
+
+
+def _add_revision_counter(connection: Connection) -> None:
+    """Version 4: where writers are concurrent (not SQLite), revisions come from a row-locked
+    counter that continues from the highest revision already written."""
+
+    install_revision_counter(connection)
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "baseline", _baseline),
+    Migration(2, "revision columns", _add_revision_columns),
+    Migration(3, "code counts", _add_code_counts),
+    Migration(4, "revision counter", _add_revision_counter),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+@dataclass(frozen=True, slots=True)
+class SchemaState:
+    version: int
+    fingerprint: str
+
+
+@dataclass(frozen=True, slots=True)
+class BootstrapReport:
+    # "checked": already current; "created": fresh database; "migrated": pending migrations applied.
+    action: str
+    from_version: int | None
+    to_version: int
+    seconds: float
+
+
+_fingerprints: dict[str, str] = {}
+
+
+def _compute_fingerprint(dialect: Dialect) -> str:
+    ddl: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)).strip())
+        ddl += sorted(str(CreateIndex(index).compile(dialect=dialect)).strip() for index in table.indexes)
+    if dialect.name == "sqlite":
+        ddl += [" ".join(statement.split()) for statement in (*SEARCH_INDEX_DDL, *CODE_COUNTS_DDL)]
+    if uses_revision_counter(dialect):
+        ddl += revision_counter_ddl(dialect)
+    return hashlib.blake2s("\n".join(ddl).encode(), digest_size=16).hexdigest()
+
+
+def schema_fingerprint(dialect: Dialect) -> str:
+    """Hash of the DDL the models compile to on ``dialect`` (cached per dialect)."""
+
+    fingerprint = _fingerprints.get(dialect.name)
+    if fingerprint is None:
+        fingerprint = _fingerprints[dialect.name] = _compute_fingerprint(dialect)
+    return fingerprint
+
+
+def read_schema_state(connection: Connection) -> SchemaState | None:
+    if not inspect(connection).has_table(schema_version_table.name):
+        return None
+    row = connection.execute(
+        select(schema_version_table.c.version, schema_version_table.c.fingerprint).where(
+            schema_version_table.c.id == 1
+        )
+    ).first()
+    return SchemaState(version=row.version, fingerprint=row.fingerprint) if row else None
+
+
+def _write_schema_state(connection: Connection, version: int, fingerprint: str) -> None:
+    _bookkeeping.create_all(bind=connection)
+    values = {
+        "version": version,
+        "fingerprint": fingerprint,
+        "applied_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    updated = connection.execute(
+        schema_version_table.update().where(schema_version_table.c.id == 1).values(**values)
+    ).rowcount
+    if not updated:
+        connection.execute(schema_version_table.insert().values(id=1, **values))
+
+
+@contextmanager
+def migration_lock(db_engine: Engine, timeout: float = MIGRATION_LOCK_TIMEOUT_SECONDS) -> Iterator[Connection]:
+    """A transaction that only one process at a time can hold.
+
+    SQLite: ``BEGIN IMMEDIATE`` takes the database write lock up front (retried past
+    ``busy_timeout`` until ``timeout``). PostgreSQL: a transaction-scoped advisory lock.
+    """
+
+    with db_engine.connect() as connection:
+        if connection.dialect.name != "sqlite":
+            with connection.begin():
+                if connection.dialect.name == "postgresql":
+                    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PG_LOCK_KEY})
+                yield connection
+            return
+
+        # Manage the transaction by hand so it starts as IMMEDIATE rather than DEFERRED.
+        connection.execution_options(isolation_level="AUTOCOMMIT")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+                break
+            except OperationalError as exc:
+                if "locked" not in str(exc.orig) or time.monotonic() > deadline:
+                    raise
+                logger.info("waiting for another process to finish migrating the schema")
+                time.sleep(0.1)
+        try:
+            yield connection
+        except BaseException:
+            connection.exec_driver_sql("ROLLBACK")
+            raise
+        connection.exec_driver_sql("COMMIT")
+
+
+def _check(state: SchemaState | None, fingerprint: str) -> bool:
+    """True when ``state`` needs no migration; warns about drift it cannot fix."""
+
+    if state is None or state.version < SCHEMA_VERSION:
+        return False
+    if state.version > SCHEMA_VERSION:
+        # Normal during a rolling deploy: a newer release already migrated the database.
+        logger.warning("database schema v%d is newer than this release (v%d)", state.version, SCHEMA_VERSION)
+    elif state.fingerprint != fingerprint:
+        logger.warning(
+            "schema fingerprint mismatch at v%d: models changed without a migration, or the database "
+            "was altered by hand",
+            state.version,
+        )
+    return True
+
+
+def bootstrap_schema(db_engine: Engine) -> BootstrapReport:
+    """Bring the database to `SCHEMA_VERSION`; when it already is, only ``schema_version`` is read."""
+
+    started = time.perf_counter()
+    fingerprint = schema_fingerprint(db_engine.dialect)
+
+    with db_engine.connect() as connection:
+        state = read_schema_state(connection)
+    if _check(state, fingerprint):
+        return BootstrapReport("checked", state.version, state.version, time.perf_counter() - started)
+
+    with migration_lock(db_engine) as connection:
+        # Another worker may have migrated while we waited for the lock.
+        state = read_schema_state(connection)
+        if _check(state, fingerprint):
+            return BootstrapReport("checked", state.version, state.version, time.perf_counter() - started)
+
+        if state is None and not inspect(connection).has_table(ExpenseCategory.__tablename__):
+            # Fresh database: build the current schema directly instead of replaying history.
+            Base.metadata.create_all(bind=connection)
+            install_search_index(connection)
+            install_code_counts(connection)
+            action, from_version = "created", None
+        else:
+            # No version row but tables present: a database from before versioning (v0).
+            from_version = state.version if state else 0
+            for migration in MIGRATIONS:
+                if migration.version > from_version:
+                    logger.info("applying schema migration %d (%s)", migration.version, migration.name)
+                    migration.upgrade(connection)
+            action = "migrated"
+
+        _write_schema_state(connection, SCHEMA_VERSION, fingerprint)
+
+    report = BootstrapReport(action, from_version, SCHEMA_VERSION, time.perf_counter() - started)
+    logger.info("schema %s: v%s -> v%d in %.1f ms", action, from_version, SCHEMA_VERSION, report.seconds * 1000)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.core.logging import configure_logging
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("status", "upgrade"))
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    if args.command == "upgrade":
+        bootstrap_schema(engine)
+
+    with engine.connect() as connection:
+        state = read_schema_state(connection)
+    fingerprint = schema_fingerprint(engine.dialect)
+    if state is None:
+        print(f"unversioned database; code is at v{SCHEMA_VERSION}")
+        return 1
+    drift = "" if state.fingerprint == fingerprint else " (fingerprint mismatch)"
+    print(f"database v{state.version}, code v{SCHEMA_VERSION}{drift}")
+    return 0 if state.version >= SCHEMA_VERSION and not drift else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from sqlalchemy import Connection, text
+
+# External-content FTS5 index over expense_codes(code, description): the index stores
+# only tokens and reads the text back from expense_codes by rowid. `prefix='2 3'` keeps
+# short prefix queries ("FL*") on a dedicated index; `-`, `_` and `.` stay inside tokens
+# so codes like "MEAL-01" are matched as a whole.
+FTS_TABLE = "expense_codes_fts"
+
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    code,
+    description,
+    content='expense_codes',
+    content_rowid='id',
+    tokenize="unicode61 remove_diacritics 2 tokenchars '-_.'",
+    prefix='2 3'
+)
+"""
+
+# Triggers keep the index in sync with every write path (ORM, Core bulk inserts, raw SQL).
+_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_fts_ai AFTER INSERT ON expense_codes BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, code, description) VALUES (new.id, new.code, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_fts_ad AFTER DELETE ON expense_codes BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, code, description)
+        VALUES ('delete', old.id, old.code, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS expense_codes_fts_au AFTER UPDATE OF code, description ON expense_codes BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, code, description)
+        VALUES ('delete', old.id, old.code, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, code, description) VALUES (new.id, new.code, new.description);
+    END
+    """,
+)
+
+
+# Everything `install_search_index` creates, in order (part of the schema fingerprint).
+SEARCH_INDEX_DDL = (_CREATE_TABLE, *_TRIGGERS)
+
+
+def install_search_index(connection: Connection) -> None:
+    """Create the FTS5 table and its triggers; backfill when the table is new."""
+
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+
+    connection.execute(text(_CREATE_TABLE))
+    for trigger in _TRIGGERS:
+        connection.execute(text(trigger))
+
+    if exists is None:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def drop_search_index(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in ("expense_codes_fts_ai", "expense_codes_fts_ad", "expense_codes_fts_au"):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
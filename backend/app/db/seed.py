@@ -3,16 +3,36 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.models import ExpenseCategory, ExpenseCode
 
 from .session import db_session
+from .synthetic import SyntheticSpec, generate
 
 
 def seed_if_empty() -> None:
-    """Populate DB with initial values, only if it is empty."""
+    """Populate DB with initial values, only if it is empty.
+
+    ``SEED_SYNTHETIC_CODES`` > 0 swaps the demo rows for a generated catalog of that size.
+    """
 
     with db_session() as db:
-        _seed_if_empty(db)
+        if settings.seed_synthetic_codes > 0:
+            _seed_synthetic_if_empty(db)
+        else:
+            _seed_if_empty(db)
+
+
+def _seed_synthetic_if_empty(db: Session) -> None:
+    if db.execute(select(ExpenseCategory.id).limit(1)).first() is not None:
+        return
+
+    spec = SyntheticSpec(
+        categories=settings.seed_synthetic_categories,
+        codes=settings.seed_synthetic_codes,
+        seed=settings.seed_synthetic_seed,
+    )
+    generate(db.connection(), spec)
 
 
 def _seed_if_empty(db: Session) -> None:
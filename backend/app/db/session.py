@@ -1,33 +1,188 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
-from contextlib import contextmanager
+import logging
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from time import perf_counter
+from typing import Any
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.core.metrics import db_pool_checkout_wait, record_statement
 
-from .uow import UnitOfWork
+from .uow import AsyncUnitOfWork, UnitOfWork
 
 DATABASE_URL = settings.database_url
 
-is_sqlite = DATABASE_URL.startswith("sqlite")
+# Async drivers used when `DB_ASYNC` is on and no explicit `ASYNC_DATABASE_URL` is given.
+_ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if is_sqlite else {},
-)
 
-# Enable FK constraints for SQLite (required for ON DELETE CASCADE).
-if is_sqlite:
+def to_async_url(url: str) -> str:
+    """Swap the sync DBAPI driver of ``url`` for its asyncio counterpart."""
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{backend}' URLs; set ASYNC_DATABASE_URL.")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def sqlite_pragmas(cfg: Settings) -> list[str]:
+    """PRAGMAs run on every new SQLite connection for the configured profile."""
+
+    # FK constraints are required for ON DELETE CASCADE.
+    pragmas = ["PRAGMA foreign_keys=ON"]
+    if cfg.sqlite_profile == "legacy":
+        return pragmas
+
+    return [
+        # Set first, so switching the journal mode waits for a lock instead of failing.
+        f"PRAGMA busy_timeout={cfg.sqlite_busy_timeout_ms:d}",
+        f"PRAGMA journal_mode={cfg.sqlite_journal_mode}",
+        f"PRAGMA synchronous={cfg.sqlite_synchronous}",
+        f"PRAGMA cache_size={cfg.sqlite_cache_size:d}",
+        f"PRAGMA mmap_size={cfg.sqlite_mmap_size:d}",
+        f"PRAGMA temp_store={cfg.sqlite_temp_store}",
+        *pragmas,
+    ]
 
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragma(dbapi_connection, _connection_record) -> None:  # type: ignore[no-redef]
+
+def _pragma_listener(pragmas: list[str]) -> Callable[..., None]:
+    def _set_sqlite_pragma(dbapi_connection, _connection_record) -> None:
         cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
+        for pragma in pragmas:
+            cursor.execute(pragma)
         cursor.close()
 
+    return _set_sqlite_pragma
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout takes (queueing for a slot included)."""
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            db_pool_checkout_wait.observe(perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+# Pool loggers are named after the pool class. Keep ours at the WARN level SQLAlchemy sets for
+# its own `sqlalchemy.pool` loggers, so dispose/recreate messages don't leak into INFO logs.
+for _pool_cls in (TimedQueuePool, TimedAsyncAdaptedQueuePool):
+    logging.getLogger(f"{_pool_cls.__module__}.{_pool_cls.__name__}").setLevel(logging.WARNING)
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    record_statement(perf_counter() - conn.info["query_start"].pop())
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches `after_cursor_execute`; keep the start-time stack balanced.
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            record_statement(perf_counter() - starts.pop())
+
+
+def instrument_engine(db_engine: Engine) -> None:
+    """Count SQL statements and their time into the current request's metrics."""
+
+    event.listen(db_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(db_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(db_engine, "handle_error", _handle_error)
+
+
+def engine_options(url: str, cfg: Settings, *, is_async: bool = False) -> dict[str, Any]:
+    """Keyword arguments for `create_engine` / `create_async_engine`."""
+
+    options: dict[str, Any] = {"pool_pre_ping": cfg.db_pool_pre_ping}
+
+    parsed = make_url(url)
+    in_memory = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if not in_memory:
+        if cfg.metrics_enabled:
+            options["poolclass"] = TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+        options.update(
+            pool_size=cfg.db_pool_size,
+            max_overflow=cfg.db_max_overflow,
+            pool_timeout=cfg.db_pool_timeout,
+            pool_recycle=cfg.db_pool_recycle,
+        )
+    return options
+
+
+def build_engine(url: str, cfg: Settings) -> Engine:
+    sqlite = url.startswith("sqlite")
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if sqlite else {},
+        **engine_options(url, cfg),
+    )
+    if sqlite:
+        event.listen(db_engine, "connect", _pragma_listener(sqlite_pragmas(cfg)))
+    if cfg.metrics_enabled:
+        instrument_engine(db_engine)
+    return db_engine
+
+
+def build_async_engine(url: str, cfg: Settings) -> AsyncEngine:
+    db_engine = create_async_engine(url, **engine_options(url, cfg, is_async=True))
+    if url.startswith("sqlite"):
+        event.listen(db_engine.sync_engine, "connect", _pragma_listener(sqlite_pragmas(cfg)))
+    if cfg.metrics_enabled:
+        instrument_engine(db_engine.sync_engine)
+    return db_engine
+
+
+def _warm_size(pool: Any, connections: int) -> int:
+    # Single-connection pools (in-memory SQLite's StaticPool / SingletonThreadPool) hold one at most.
+    return min(connections, pool.size()) if isinstance(pool, QueuePool) else 1
+
+
+def warm_pool(db_engine: Engine, connections: int) -> int:
+    """Open ``connections`` pooled connections now, so first requests don't pay connect + PRAGMAs."""
+
+    count = _warm_size(db_engine.pool, connections)
+    with ExitStack() as stack:
+        # Held together: checking each one in before the next checkout would reuse a single connection.
+        for _ in range(count):
+            stack.enter_context(db_engine.connect())
+    return count
+
+
+async def warm_async_pool(db_engine: AsyncEngine, connections: int) -> int:
+    count = _warm_size(db_engine.sync_engine.pool, connections)
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            await stack.enter_async_context(db_engine.connect())
+    return count
+
+
+engine = build_engine(DATABASE_URL, settings)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -36,15 +191,110 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only routes go to `READ_DATABASE_URL` when set (a replica, or the primary file opened with
+# `mode=ro`), with a pool of their own; otherwise they share the primary engine.
+read_engine = build_engine(settings.read_database_url, settings) if settings.read_database_url else engine
+
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+)
+
+
+# --- Async path (only built when enabled, so the async driver stays optional) ---
+
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+async_read_engine: AsyncEngine | None = None
+AsyncReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.db_async:
+    async_engine = build_async_engine(settings.async_database_url or to_async_url(DATABASE_URL), settings)
+    async_read_engine = async_engine
+    if settings.read_database_url:
+        async_read_engine = build_async_engine(
+            settings.async_read_database_url or to_async_url(settings.read_database_url), settings
+        )
+
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        bind=async_read_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
 
 def get_db() -> Iterator[Session]:
-    """FastAPI dependency: one transaction per request."""
+    """FastAPI dependency: one transaction per request on the primary."""
 
     with UnitOfWork(SessionLocal) as uow:
         assert uow.session is not None
         yield uow.session
 
 
+def get_read_db() -> Iterator[Session]:
+    """FastAPI dependency for read-only routes: a replica session that is never committed.
+
+    Routes that write, or read what they just wrote, use `get_db` instead.
+    """
+
+    with UnitOfWork(ReadSessionLocal, read_only=True) as uow:
+        assert uow.session is not None
+        yield uow.session
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency for `async def` routes: one transaction per request on the primary."""
+
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set DB_ASYNC=1.")
+
+    async with AsyncUnitOfWork(AsyncSessionLocal) as uow:
+        assert uow.session is not None
+        yield uow.session
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of `get_read_db`."""
+
+    if AsyncReadSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set DB_ASYNC=1.")
+
+    async with AsyncUnitOfWork(AsyncReadSessionLocal, read_only=True) as uow:
+        assert uow.session is not None
+        yield uow.session
+
+
+def get_session_factory() -> sessionmaker[Session]:
+    """FastAPI dependency for work that outlives the request scope (e.g. streamed responses)."""
+
+    return SessionLocal
+
+
+def get_read_session_factory() -> sessionmaker[Session]:
+    """Like `get_session_factory`, for read-only work (e.g. exports)."""
+
+    return ReadSessionLocal
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set DB_ASYNC=1.")
+    return AsyncSessionLocal
+
+
+def get_async_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    if AsyncReadSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set DB_ASYNC=1.")
+    return AsyncReadSessionLocal
+
+
 @contextmanager
 def db_session() -> Iterator[Session]:
     """Helper for scripts / seeding."""
@@ -0,0 +1,265 @@
+"""Generate a large, realistic catalog for load tests, benchmarks and local profiling.
+
+    python -m app.db.synthetic --categories 5000 --codes 1000000 --seed 42
+    python -m app.db.synthetic --codes 1000000 --snapshot snapshots/1m.db --database-url sqlite:///./scratch.db
+
+Category sizes follow a Zipf law (a few huge categories, a long tail of small ones, placed at
+random ids), active flags are mixed and descriptions range from a few words to a paragraph.
+The same ``--seed`` always produces the same rows. Everything is written with Core
+``executemany`` inserts in one transaction; the full-text index is rebuilt once at the end
+instead of being maintained row by row. ``--snapshot`` additionally writes a compacted copy
+of the database (``VACUUM INTO``) that `restore_snapshot` can clone for later runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import random
+import shutil
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Connection, Engine, func, insert, select, text
+
+from app.core.config import settings
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.counts import drop_code_counts, install_code_counts, rebuild_code_counts
+from app.db.schema import bootstrap_schema
+from app.db.search import drop_search_index, install_search_index
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany call; bounds memory while generating 1M+ codes.
+INSERT_CHUNK_ROWS = 50_000
+
+_AREAS = (
+    "Travel", "Meals", "Office", "Software", "Hardware", "Marketing", "Training", "Legal", "Facilities",
+    "Logistics", "Recruiting", "Research", "Events", "Telecom", "Insurance", "Consulting", "Fleet", "Health",
+)
+_KINDS = ("Domestic", "International", "Client", "Internal", "Project", "Regional", "Team", "Contract", "Capital")
+# Description vocabulary; benchmarks draw search terms from it.
+WORDS = (
+    "airfare", "hotel", "taxi", "rideshare", "mileage", "parking", "toll", "train", "ferry", "per-diem",
+    "lunch", "dinner", "catering", "coffee", "supplies", "printer", "toner", "license", "subscription",
+    "laptop", "monitor", "headset", "conference", "workshop", "course", "certification", "postage",
+    "courier", "freight", "customs", "visa", "insurance", "repairs", "cleaning", "utilities", "rent",
+    "advertising", "sponsorship", "merchandise", "hosting", "storage", "bandwidth", "consulting", "audit",
+    "legal", "translation", "relocation", "recruiting", "background-check", "wellness", "gym", "uniforms",
+)
+_FILLER = (
+    "for", "with", "and", "including", "reimbursable", "approved", "quarterly", "annual", "client",
+    "site", "visit", "team", "project", "regional", "office", "vendor", "invoice", "receipt", "required",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSpec:
+    categories: int = 1_000
+    codes: int = 100_000
+    seed: int = 0
+    # Zipf exponent of the category size distribution; 0 spreads codes evenly.
+    skew: float = 1.1
+    category_active_ratio: float = 0.85
+    code_active_ratio: float = 0.9
+    # Share of codes without a description.
+    null_description_ratio: float = 0.05
+
+    @property
+    def snapshot_name(self) -> str:
+        return f"synthetic-c{self.categories}-n{self.codes}-s{self.seed}-k{self.skew:g}.db"
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticReport:
+    categories: int
+    codes: int
+    seconds: float
+
+
+def category_sizes(spec: SyntheticSpec, rng: random.Random) -> list[int]:
+    """Codes per category id (index 0 = id 1): Zipf-distributed sizes in random id order."""
+
+    weights = [1.0 / (rank**spec.skew) for rank in range(1, spec.categories + 1)]
+    total = sum(weights)
+    exact = [spec.codes * w / total for w in weights]
+    sizes = [math.floor(x) for x in exact]
+    # Largest-remainder rounding keeps the total exact.
+    by_remainder = sorted(range(len(exact)), key=lambda i: exact[i] - sizes[i], reverse=True)
+    for i in by_remainder[: spec.codes - sum(sizes)]:
+        sizes[i] += 1
+    rng.shuffle(sizes)
+    return sizes
+
+
+def _phrases(rng: random.Random, count: int) -> list[str]:
+    phrases = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(1, 3)) + rng.choices(_FILLER, k=rng.randint(1, 4))
+        rng.shuffle(words)
+        phrases.append(" ".join(words))
+    return phrases
+
+
+def _category_rows(spec: SyntheticSpec, rng: random.Random) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": category_id,
+            "name": f"{rng.choice(_AREAS)} {rng.choice(_KINDS)} {category_id:05d}",
+            "is_active": rng.random() < spec.category_active_ratio,
+        }
+        for category_id in range(1, spec.categories + 1)
+    ]
+
+
+def _code_rows(spec: SyntheticSpec, sizes: list[int], rng: random.Random) -> Iterator[list[dict[str, Any]]]:
+    """Code rows in chunks of `INSERT_CHUNK_ROWS`, category by category."""
+
+    # Descriptions are stitched from a shared phrase pool: far cheaper than drawing every word,
+    # while still giving the full-text index a realistic vocabulary and length spread (1-12 phrases).
+    phrases = _phrases(rng, 4096)
+    lengths = [1, 1, 2, 2, 2, 3, 3, 4, 5, 8, 12]
+
+    chunk: list[dict[str, Any]] = []
+    for category_id, size in enumerate(sizes, start=1):
+        prefix = f"{_AREAS[category_id % len(_AREAS)][:3].upper()}{category_id}"
+        for n in range(1, size + 1):
+            description = None
+            if rng.random() >= spec.null_description_ratio:
+                description = "; ".join(rng.choices(phrases, k=rng.choice(lengths))).capitalize()
+            chunk.append(
+                {
+                    "category_id": category_id,
+                    "code": f"{prefix}-{n:06d}",
+                    "description": description,
+                    "is_active": rng.random() < spec.code_active_ratio,
+                }
+            )
+            if len(chunk) >= INSERT_CHUNK_ROWS:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate(connection: Connection, spec: SyntheticSpec) -> SyntheticReport:
+    """Insert the synthetic catalog through ``connection`` (the caller owns the transaction).
+
+    The target tables must be empty: category ids are assigned up front so codes can be
+    generated without reading anything back.
+    """
+
+    if spec.categories < 1 and spec.codes:
+        raise ValueError("codes need at least one category")
+    if connection.execute(select(func.count()).select_from(ExpenseCategory)).scalar():
+        raise ValueError("synthetic data can only be generated into an empty catalog")
+
+    started = time.perf_counter()
+    rng = random.Random(spec.seed)
+    sizes = category_sizes(spec, rng) if spec.categories else []
+
+    # Maintaining the FTS index and the code counters per row costs more than the inserts
+    # themselves; rebuild both once at the end.
+    drop_search_index(connection)
+    drop_code_counts(connection)
+
+    # The catalog is empty, so this one transaction is revision 1 throughout (the counter
+    # rebuild at the end stamps the categories it fills with 2); a constant also spares every
+    # row the `NEXT_REVISION` lookup.
+    connection.execute(insert(ExpenseCategory.__table__).values(revision=1), _category_rows(spec, rng))
+    inserted = 0
+    for chunk in _code_rows(spec, sizes, rng):
+        connection.execute(insert(ExpenseCode.__table__).values(revision=1), chunk)
+        inserted += len(chunk)
+        logger.info("synthetic data: %d / %d codes (%.1fs)", inserted, spec.codes, time.perf_counter() - started)
+
+    install_search_index(connection)
+    install_code_counts(connection)
+    rebuild_code_counts(connection)
+    return SyntheticReport(categories=spec.categories, codes=inserted, seconds=time.perf_counter() - started)
+
+
+def generate_database(db_engine: Engine, spec: SyntheticSpec) -> SyntheticReport:
+    bootstrap_schema(db_engine)
+    with db_engine.begin() as connection:
+        return generate(connection, spec)
+
+
+def write_snapshot(db_engine: Engine, path: Path) -> Path:
+    """Write a compacted, standalone copy of a SQLite database (``VACUUM INTO``)."""
+
+    if db_engine.dialect.name != "sqlite":
+        raise ValueError("snapshots are only supported for SQLite")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    with db_engine.connect() as connection:
+        connection.execute(text("VACUUM INTO :path"), {"path": str(path)})
+    return path
+
+
+def restore_snapshot(snapshot: Path, target: Path) -> Path:
+    """Clone a snapshot to ``target`` so every run starts from identical, untouched data."""
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(snapshot, target)
+    return target
+
+
+def ensure_snapshot(spec: SyntheticSpec, directory: Path) -> Path:
+    """Path of the snapshot for ``spec`` in ``directory``, generating it on first use."""
+
+    from app.db.session import build_engine
+
+    path = directory / spec.snapshot_name
+    if path.exists():
+        return path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    pending = path.with_suffix(".partial")
+    pending.unlink(missing_ok=True)
+    db_engine = build_engine(f"sqlite:///{pending}", settings)
+    try:
+        generate_database(db_engine, spec)
+        write_snapshot(db_engine, path)
+    finally:
+        db_engine.dispose()
+        for leftover in pending.parent.glob(pending.name + "*"):
+            leftover.unlink()
+    return path
+
+
+def main(argv: list[str] | None = None) -> int:
+    from app.core.logging import configure_logging
+    from app.db.session import build_engine
+
+    defaults = SyntheticSpec()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=defaults.categories)
+    parser.add_argument("--codes", type=int, default=defaults.codes)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--skew", type=float, default=defaults.skew, help="Zipf exponent of category sizes")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--snapshot", type=Path, default=None, help="also write a compacted copy here")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    spec = SyntheticSpec(categories=args.categories, codes=args.codes, seed=args.seed, skew=args.skew)
+    db_engine = build_engine(args.database_url, settings)
+    try:
+        report = generate_database(db_engine, spec)
+        logger.info(
+            "generated %d categories and %d codes in %.1fs", report.categories, report.codes, report.seconds
+        )
+        if args.snapshot is not None:
+            logger.info("snapshot written to %s", write_snapshot(db_engine, args.snapshot))
+    finally:
+        db_engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -11,10 +12,12 @@ class UnitOfWork:
 
     - Commits on successful exit
     - Rolls back on exceptions
+    - ``read_only``: never commits; the transaction is only ended (rolled back) on exit
     """
 
-    def __init__(self, session_factory: Callable[[], Session]):
+    def __init__(self, session_factory: Callable[[], Session], *, read_only: bool = False):
         self._session_factory = session_factory
+        self.read_only = read_only
         self.session: Session | None = None
 
     def __enter__(self) -> "UnitOfWork":
@@ -29,9 +32,37 @@ class UnitOfWork:
     ) -> None:
         assert self.session is not None
         try:
-            if exc_type is None:
+            if exc_type is None and not self.read_only:
                 self.session.commit()
             else:
                 self.session.rollback()
         finally:
             self.session.close()
+
+
+class AsyncUnitOfWork:
+    """Async counterpart of `UnitOfWork` for an `AsyncSession`."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], *, read_only: bool = False):
+        self._session_factory = session_factory
+        self.read_only = read_only
+        self.session: AsyncSession | None = None
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        self.session = self._session_factory()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: Any,
+    ) -> None:
+        assert self.session is not None
+        try:
+            if exc_type is None and not self.read_only:
+                await self.session.commit()
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
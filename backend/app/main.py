@@ -1,25 +1,108 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from app.core.admission import READ, WRITE, AdmissionLimiter, AdmissionMiddleware
+from app.core.config import settings
 from app.core.errors import register_error_handlers
 from app.core.logging import configure_logging
-from app.db.models import Base
+from app.core.metrics import MetricsMiddleware, metrics_response
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.schema import bootstrap_schema
 from app.db.seed import seed_if_empty
-from app.db.session import engine
+from app.db.session import (
+    AsyncReadSessionLocal,
+    ReadSessionLocal,
+    async_engine,
+    async_read_engine,
+    engine,
+    read_engine,
+    warm_async_pool,
+    warm_pool,
+)
+from app.modules.expenses.categories.async_router import router as categories_async_router
 from app.modules.expenses.categories.router import router as categories_router
+from app.modules.expenses.codes.async_router import router as codes_async_router
+from app.modules.expenses.cache import caches
+from app.modules.expenses.catalog.async_router import router as catalog_async_router
+from app.modules.expenses.catalog.router import router as catalog_router
+from app.modules.expenses.changes import catalog_events
+from app.modules.expenses.coherence import catalog_watcher, watch_catalog
 from app.modules.expenses.codes.router import router as codes_router
+from app.modules.expenses.events.router import router as events_router
+from app.modules.expenses.export.async_router import router as export_async_router
+from app.modules.expenses.export.router import router as export_router
+from app.modules.expenses.imports.router import router as import_router
+from app.modules.expenses.warmup import warm_up, warm_up_async
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _phase(timings: dict[str, float], name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - started) * 1000, 2)
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
-    # For the coding challenge, creating tables on startup is acceptable.
-    Base.metadata.create_all(bind=engine)
-    seed_if_empty()
+async def lifespan(application: FastAPI):
+    started = time.perf_counter()
+    timings: dict[str, float] = {}
+
+    # One `schema_version` read when the schema is current; migrations run in one process only.
+    with _phase(timings, "schema"):
+        bootstrap_schema(engine)
+    if settings.seed_on_startup:
+        with _phase(timings, "seed"):
+            seed_if_empty()
+    if settings.cache_coherence:
+        # Baseline for spotting other workers' writes, taken before anything is cached.
+        with _phase(timings, "coherence"):
+            catalog_watcher.prime()
+    if settings.startup_warmup:
+        with _phase(timings, "pool"):
+            for db_engine in {engine, read_engine}:
+                warm_pool(db_engine, settings.db_pool_size)
+            for async_db_engine in {async_engine, async_read_engine} - {None}:
+                await warm_async_pool(async_db_engine, settings.db_pool_size)
+        with _phase(timings, "warmup"):
+            # The hot statements are all reads, so they warm the read engine.
+            with ReadSessionLocal() as db:
+                warm_up(db)
+            if AsyncReadSessionLocal is not None:
+                async with AsyncReadSessionLocal() as adb:
+                    await warm_up_async(adb)
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    application.state.startup_timings = timings
+    logger.info(
+        "ready in %.1f ms (%s)",
+        timings["total"],
+        ", ".join(f"{name} {ms:.1f}" for name, ms in timings.items() if name != "total"),
+    )
+    # Event subscribers hear about other workers' writes even when no reads trigger a check.
+    watch_task = asyncio.create_task(watch_catalog()) if settings.cache_coherence else None
     yield
+    if watch_task is not None:
+        watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await watch_task
+    # Open event streams would otherwise hold up the server's graceful shutdown.
+    catalog_events.close()
+    catalog_watcher.close()
+    for async_db_engine in {async_engine, async_read_engine} - {None}:
+        await async_db_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -31,6 +114,31 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    admission: dict[str, AdmissionLimiter] = {}
+    if settings.admission_control:
+        queue_timeout = settings.admission_queue_timeout_ms / 1000
+        admission[READ] = AdmissionLimiter(
+            READ,
+            limit=settings.admission_read_limit,
+            queue_size=settings.admission_read_queue,
+            queue_timeout=queue_timeout,
+        )
+        admission[WRITE] = AdmissionLimiter(
+            WRITE,
+            limit=settings.admission_write_limit,
+            queue_size=settings.admission_write_queue,
+            queue_timeout=queue_timeout,
+        )
+        # Added first, so it sits inside CORS (preflights skip it, 503s keep their CORS headers).
+        application.add_middleware(
+            AdmissionMiddleware,
+            reads=admission[READ],
+            writes=admission[WRITE],
+            retry_after_seconds=settings.admission_retry_after_seconds,
+            read_posts=("/codes:validate",),
+            exempt=("/health", "/metrics", "/cache/stats", "/admission/stats", "/events"),
+        )
+
     # CORS (dev-friendly defaults)
     application.add_middleware(
         CORSMiddleware,
@@ -43,17 +151,51 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     )
+    if settings.gzip_level > 0:
+        # List and catalog routes send precompressed bodies (`payloads`); this covers the rest.
+        # Event streams and responses that already carry `Content-Encoding` pass through.
+        application.add_middleware(
+            GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_level
+        )
+    if settings.metrics_enabled:
+        # Added last, so it is the outermost middleware and times the whole request.
+        application.add_middleware(MetricsMiddleware)
 
     register_error_handlers(application)
 
-    application.include_router(categories_router)
-    application.include_router(codes_router)
+    if settings.db_async:
+        application.include_router(categories_async_router)
+        application.include_router(codes_async_router)
+        application.include_router(catalog_async_router)
+        application.include_router(export_async_router)
+    else:
+        application.include_router(categories_router)
+        application.include_router(codes_router)
+        application.include_router(catalog_router)
+        application.include_router(export_router)
+
+    # Runs on the threadpool with the sync engine in both modes.
+    application.include_router(import_router)
+    # Async in both modes; it never touches the database.
+    application.include_router(events_router)
 
     @application.get("/health")
     def health():
         return {"status": "ok"}
 
+    @application.get("/cache/stats")
+    def cache_stats():
+        return {name: asdict(cache.stats()) for name, cache in caches.items()}
+
+    @application.get("/admission/stats")
+    def admission_stats():
+        return {name: asdict(limiter.stats()) for name, limiter in admission.items()}
+
+    if settings.metrics_enabled:
+        application.add_api_route("/metrics", metrics_response, methods=["GET"], include_in_schema=False)
+
     return application
 
 
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import registry
+
+from .categories.schemas import CategoryListQuery
+from .code_index import active_code_index
+
+# Encoded response bodies (raw + gzip, see `payloads`), keyed by the response's ETag, which
+# carries the catalog revision: a write moves the revision, so an entry is never served stale
+# and is only rebuilt after a committed write. Invalidation just frees the dead entries early.
+# This is the only list cache: a page cache behind it would be keyed by the same lists and
+# cleared by the same writes, so it could only hit after this one evicted an entry.
+payload_cache = TTLCache(
+    max_entries=settings.payload_cache_max_entries,
+    ttl_seconds=settings.catalog_cache_ttl_seconds,
+)
+
+# The persisted revision each list's ETag is derived from (see `changes`), under the key
+# prefixes of that list's payloads, so the same invalidations drop both. Entries are a few
+# dozen bytes: one per category's code list, plus the category list and the whole catalog.
+revision_cache = TTLCache(max_entries=4096, ttl_seconds=settings.catalog_cache_ttl_seconds)
+
+# Name -> cache, as reported by `GET /cache/stats` and the `cache_*` metrics.
+caches = {"payloads": payload_cache, "revisions": revision_cache}
+
+
+
+def _sample(field: str) -> Callable[[], list[tuple[tuple[str, ...], float]]]:
+    return lambda: [((name,), getattr(cache.stats(), field)) for name, cache in caches.items()]
+
+
+_CACHE_LABELS = ("cache",)
+
+registry.sampled(
+    "cache_hits_total", "Lookups answered from the cache.", _CACHE_LABELS, kind="counter", sample=_sample("hits")
+)
+registry.sampled(
+    "cache_misses_total", "Lookups that had to load the value.", _CACHE_LABELS, kind="counter", sample=_sample("misses")
+)
+registry.sampled(
+    "cache_evictions_total",
+    "Entries dropped to stay within the size bound.",
+    _CACHE_LABELS,
+    kind="counter",
+    sample=_sample("evictions"),
+)
+registry.sampled(
+    "cache_invalidations_total",
+    "Entries dropped by writes.",
+    _CACHE_LABELS,
+    kind="counter",
+    sample=_sample("invalidations"),
+)
+registry.sampled("cache_entries", "Entries currently cached.", _CACHE_LABELS, kind="gauge", sample=_sample("size"))
+
+_CATEGORIES = "categories"
+# Category lists with code counts: these also go stale when a category's codes change.
+_CATEGORY_COUNTS = "category_counts"
+_CODES = "codes"
+_CATALOG = "catalog"
+
+
+def _categories_prefix(query: CategoryListQuery) -> str:
+    return _CATEGORY_COUNTS if query.include_counts else _CATEGORIES
+
+
+def categories_payload_key(query: CategoryListQuery, etag: str) -> tuple:
+    return (_categories_prefix(query), etag)
+
+
+def codes_payload_key(category_id: int, etag: str) -> tuple:
+    return (_CODES, category_id, etag)
+
+
+def catalog_payload_key(etag: str) -> tuple:
+    return (_CATALOG, etag)
+
+
+def categories_revision_key() -> tuple:
+    return (_CATEGORIES,)
+
+
+def codes_revision_key(category_id: int) -> tuple:
+    return (_CODES, category_id)
+
+
+def catalog_revision_key() -> tuple:
+    return (_CATALOG,)
+
+
+def _invalidate(*prefixes: tuple) -> None:
+    for prefix in prefixes:
+        payload_cache.invalidate_prefix(prefix)
+        revision_cache.invalidate_prefix(prefix)
+
+
+def invalidate_categories() -> None:
+    active_code_index.categories_changed()
+    _invalidate((_CATEGORIES,), (_CATEGORY_COUNTS,), (_CATALOG,))
+
+
+def invalidate_codes(category_id: int) -> None:
+    active_code_index.codes_changed(category_id)
+    _invalidate((_CODES, category_id), (_CATEGORY_COUNTS,), (_CATALOG,))
+
+
+def invalidate_all() -> None:
+    active_code_index.clear()
+    _invalidate(())
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.revisions import LATEST_REVISION
+
+from .repo import (
+    categories_stmt,
+    changed_categories_stmt,
+    changed_codes_stmt,
+    changed_revisions_stmt,
+    codes_stmt,
+)
+
+
+async def list_categories(db: AsyncSession, *, is_active: bool | None = None) -> list[Row[Any]]:
+    return (await db.execute(categories_stmt(is_active=is_active))).all()
+
+
+async def list_codes(db: AsyncSession, *, is_active: bool | None = None) -> list[Row[Any]]:
+    return (await db.execute(codes_stmt(is_active=is_active))).all()
+
+
+async def latest_revision(db: AsyncSession) -> int:
+    return (await db.execute(LATEST_REVISION)).scalar_one()
+
+
+async def changed_revisions(db: AsyncSession, since: int, limit: int) -> list[int]:
+    return list((await db.execute(changed_revisions_stmt(since, limit))).scalars())
+
+
+async def changed_categories(db: AsyncSession, since: int, until: int) -> list[Row[Any]]:
+    return (await db.execute(changed_categories_stmt(since, until))).all()
+
+
+async def changed_codes(db: AsyncSession, since: int, until: int) -> list[Row[Any]]:
+    return (await db.execute(changed_codes_stmt(since, until))).all()
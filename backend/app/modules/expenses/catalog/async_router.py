@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import matching_etag, not_modified
+from app.core.pagination import MAX_PAGE_LIMIT
+from app.core.serialization import json_bytes_response
+from app.db.session import get_async_read_db
+
+from ..cache import catalog_payload_key
+from ..changes import catalog_etag_async
+from ..coherence import sync_catalog
+from ..payloads import Payload, build_payload, cached_payload_async, payload_response
+from . import async_service as catalog_service
+from .schemas import CatalogCategoryOut, CatalogChangesOut, catalog_changes_adapter, catalog_encoder
+
+router = APIRouter(tags=["catalog"])
+
+
+@router.get("/catalog", response_model=list[CatalogCategoryOut], dependencies=[Depends(sync_catalog)])
+async def get_catalog(
+    request: Request,
+    is_active: bool | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = await catalog_etag_async(db, is_active)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
+
+    async def load() -> Payload:
+        return build_payload(catalog_encoder.encode(await catalog_service.get_catalog(db, is_active=is_active)))
+
+    payload = await cached_payload_async(catalog_payload_key(etag), load)
+    return payload_response(request, payload, etag)
+
+
+@router.get("/catalog/changes", response_model=CatalogChangesOut)
+async def get_catalog_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(MAX_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    changes = await catalog_service.get_changes(db, since=since, limit=limit)
+    return json_bytes_response(catalog_changes_adapter.dump_json(changes))
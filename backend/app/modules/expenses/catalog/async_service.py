@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import async_repo as catalog_repo
+from .schemas import CatalogCategoryRecord, CatalogChangesRecord
+from .service import changes_record, changes_until, check_since, nest_codes
+
+
+async def get_catalog(db: AsyncSession, *, is_active: bool | None = None) -> list[CatalogCategoryRecord]:
+    categories = await catalog_repo.list_categories(db, is_active=is_active)
+    codes = await catalog_repo.list_codes(db, is_active=is_active) if categories else []
+    return nest_codes(categories, codes)
+
+
+async def get_changes(db: AsyncSession, *, since: int, limit: int) -> CatalogChangesRecord:
+    latest = await catalog_repo.latest_revision(db)
+    check_since(since, latest)
+    if since == latest:
+        return changes_record([], [], latest, latest)
+
+    until = changes_until(await catalog_repo.changed_revisions(db, since, limit), limit, latest)
+    return changes_record(
+        await catalog_repo.changed_categories(db, since, until),
+        await catalog_repo.changed_codes(db, since, until),
+        until,
+        latest,
+    )
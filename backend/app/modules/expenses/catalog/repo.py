@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Row, Select, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.revisions import LATEST_REVISION
+
+from ..categories.repo import LIST_COLUMNS as CATEGORY_COLUMNS
+from ..codes.repo import LIST_COLUMNS as CODE_COLUMNS
+
+
+def categories_stmt(*, is_active: bool | None = None) -> Select[tuple[int, str, bool]]:
+    stmt = select(*CATEGORY_COLUMNS).order_by(ExpenseCategory.id)
+    if is_active is not None:
+        stmt = stmt.where(ExpenseCategory.is_active == is_active)
+    return stmt
+
+
+def codes_stmt(*, is_active: bool | None = None) -> Select[tuple[int, int, str, str | None, bool]]:
+    """Codes of the categories selected by `categories_stmt`, grouped by category.
+
+    Together the two statements replace a ``selectinload``: still two queries for the whole
+    catalog, but as plain rows with no identity map and no ``IN (...)`` chunking.
+    ``ix_expense_codes_category_id`` carries the rowid, so the ordering needs no sort step.
+    """
+
+    stmt = select(*CODE_COLUMNS)
+    if is_active is not None:
+        stmt = stmt.where(
+            ExpenseCode.is_active == is_active,
+            ExpenseCode.category_id.in_(select(ExpenseCategory.id).where(ExpenseCategory.is_active == is_active)),
+        )
+    return stmt.order_by(ExpenseCode.category_id, ExpenseCode.id)
+
+
+def list_categories(db: Session, *, is_active: bool | None = None) -> list[Row[Any]]:
+    return db.execute(categories_stmt(is_active=is_active)).all()
+
+
+def list_codes(db: Session, *, is_active: bool | None = None) -> list[Row[Any]]:
+    return db.execute(codes_stmt(is_active=is_active)).all()
+
+
+# --- Delta sync (`GET /catalog/changes`) ---
+#
+# Everything below is a range scan of the `revision` indexes, so it costs in proportion to
+# the rows changed since the cursor, not to the catalog.
+
+
+def changed_revisions_stmt(since: int, limit: int) -> Select[tuple[int]]:
+    """Revisions of the first ``limit`` + 1 rows (either table) changed after ``since``."""
+
+    revisions = union_all(
+        select(ExpenseCategory.revision).where(ExpenseCategory.revision > since),
+        select(ExpenseCode.revision).where(ExpenseCode.revision > since),
+    ).subquery()
+    return select(revisions.c.revision).order_by(revisions.c.revision).limit(limit + 1)
+
+
+def changed_categories_stmt(since: int, until: int) -> Select[tuple[int, str, bool]]:
+    return (
+        select(*CATEGORY_COLUMNS)
+        .where(ExpenseCategory.revision > since, ExpenseCategory.revision <= until)
+        .order_by(ExpenseCategory.revision, ExpenseCategory.id)
+    )
+
+
+def changed_codes_stmt(since: int, until: int) -> Select[tuple[int, int, str, str | None, bool]]:
+    return (
+        select(*CODE_COLUMNS)
+        .where(ExpenseCode.revision > since, ExpenseCode.revision <= until)
+        .order_by(ExpenseCode.revision, ExpenseCode.id)
+    )
+
+
+def latest_revision(db: Session) -> int:
+    return db.execute(LATEST_REVISION).scalar_one()
+
+
+def changed_revisions(db: Session, since: int, limit: int) -> list[int]:
+    return list(db.execute(changed_revisions_stmt(since, limit)).scalars())
+
+
+def changed_categories(db: Session, since: int, until: int) -> list[Row[Any]]:
+    return db.execute(changed_categories_stmt(since, until)).all()
+
+
+def changed_codes(db: Session, since: int, until: int) -> list[Row[Any]]:
+    return db.execute(changed_codes_stmt(since, until)).all()
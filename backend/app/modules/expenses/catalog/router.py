@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.etag import matching_etag, not_modified
+from app.core.pagination import MAX_PAGE_LIMIT
+from app.core.serialization import json_bytes_response
+from app.db.session import get_read_db
+
+from ..cache import catalog_payload_key
+from ..changes import catalog_etag
+from ..coherence import sync_catalog
+from ..payloads import Payload, build_payload, cached_payload, payload_response
+from . import service as catalog_service
+from .schemas import CatalogCategoryOut, CatalogChangesOut, catalog_changes_adapter, catalog_encoder
+
+router = APIRouter(tags=["catalog"])
+
+
+@router.get("/catalog", response_model=list[CatalogCategoryOut], dependencies=[Depends(sync_catalog)])
+def get_catalog(
+    request: Request,
+    is_active: bool | None = None,
+    db: Session = Depends(get_read_db),
+) -> Response:
+    etag = catalog_etag(db, is_active)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
+
+    def load() -> Payload:
+        return build_payload(catalog_encoder.encode(catalog_service.get_catalog(db, is_active=is_active)))
+
+    payload = cached_payload(catalog_payload_key(etag), load)
+    return payload_response(request, payload, etag)
+
+
+@router.get("/catalog/changes", response_model=CatalogChangesOut)
+def get_catalog_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(MAX_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    changes = catalog_service.get_changes(db, since=since, limit=limit)
+    return json_bytes_response(catalog_changes_adapter.dump_json(changes))
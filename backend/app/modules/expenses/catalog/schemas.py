@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.core.serialization import RecordListEncoder
+from app.modules.expenses.categories.schemas import CategoryOut, CategoryRecord
+from app.modules.expenses.codes.schemas import CodeOut, CodeRecord
+
+
+class CatalogCategoryOut(CategoryOut):
+    codes: list[CodeOut]
+
+
+class CatalogCategoryRecord(CategoryRecord):
+    codes: list[CodeRecord]
+
+
+catalog_encoder = RecordListEncoder(CatalogCategoryRecord)
+
+
+class CatalogChangesOut(BaseModel):
+    # High-water mark: pass it as the next ``since``.
+    revision: int
+    # More changes are waiting past ``revision``; ask again right away.
+    has_more: bool
+    categories: list[CategoryOut]
+    codes: list[CodeOut]
+
+
+class CatalogChangesRecord(TypedDict):
+    revision: int
+    has_more: bool
+    categories: list[CategoryRecord]
+    codes: list[CodeRecord]
+
+
+catalog_changes_adapter = TypeAdapter(CatalogChangesRecord)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.errors import ValidationError
+
+from . import repo as catalog_repo
+from .schemas import CatalogCategoryRecord, CatalogChangesRecord
+
+
+def nest_codes(categories: list[Any], codes: list[Any]) -> list[CatalogCategoryRecord]:
+    """Attach code rows (ordered by category, then id) to their category records."""
+
+    catalog: list[CatalogCategoryRecord] = [{**row._asdict(), "codes": []} for row in categories]
+    codes_by_category = {entry["id"]: entry["codes"] for entry in catalog}
+    for row in codes:
+        bucket = codes_by_category.get(row.category_id)
+        if bucket is not None:
+            bucket.append(row._asdict())
+    return catalog
+
+
+def get_catalog(db: Session, *, is_active: bool | None = None) -> list[CatalogCategoryRecord]:
+    categories = catalog_repo.list_categories(db, is_active=is_active)
+    codes = catalog_repo.list_codes(db, is_active=is_active) if categories else []
+    return nest_codes(categories, codes)
+
+
+def check_since(since: int, latest: int) -> None:
+    if since > latest:
+        # The database was replaced (restored, reseeded); the client's copy no longer applies.
+        raise ValidationError("since_ahead", "`since` is ahead of the catalog; sync again from 0.")
+
+
+def changes_until(revisions: list[int], limit: int, latest: int) -> int:
+    """Upper revision of this page: whole revisions only, so a cursor never splits one.
+
+    ``revisions`` are those of the first ``limit`` + 1 changed rows. A single revision larger
+    than ``limit`` (e.g. a ``codes:status`` on a big category) is returned in one page.
+    """
+
+    if len(revisions) <= limit:
+        return latest
+    overflow = revisions[limit]
+    return overflow - 1 if overflow > revisions[0] else overflow
+
+
+def changes_record(categories: list[Any], codes: list[Any], until: int, latest: int) -> CatalogChangesRecord:
+    return {
+        "revision": until,
+        "has_more": until < latest,
+        "categories": [row._asdict() for row in categories],
+        "codes": [row._asdict() for row in codes],
+    }
+
+
+def get_changes(db: Session, *, since: int, limit: int) -> CatalogChangesRecord:
+    """Rows written after revision ``since`` (deactivations included), plus the new high-water mark.
+
+    Every query is bounded by the revision read first: a write that commits meanwhile gets a
+    higher revision, so it is left whole for the next call instead of being half-returned.
+    """
+
+    latest = catalog_repo.latest_revision(db)
+    check_since(since, latest)
+    if since == latest:
+        return changes_record([], [], latest, latest)
+
+    until = changes_until(catalog_repo.changed_revisions(db, since, limit), limit, latest)
+    return changes_record(
+        catalog_repo.changed_categories(db, since, until),
+        catalog_repo.changed_codes(db, since, until),
+        until,
+        latest,
+    )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import SortOrder
+from app.db.models import ExpenseCategory
+
+from .repo import create_stmt, list_stmt, update_by_id_stmt
+
+
+async def list(
+    db: AsyncSession,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    name_prefix: str | None = None,
+    order: SortOrder = "asc",
+    include_counts: bool = False,
+) -> list[Row[Any]]:
+    stmt = list_stmt(
+        limit=limit,
+        after_id=after_id,
+        is_active=is_active,
+        name_prefix=name_prefix,
+        order=order,
+        include_counts=include_counts,
+        dialect_name=db.get_bind().dialect.name,
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def get(db: AsyncSession, category_id: int) -> ExpenseCategory | None:
+    return await db.get(ExpenseCategory, category_id)
+
+
+async def create(db: AsyncSession, *, name: str, is_active: bool = True) -> Row[Any] | None:
+    return (await db.execute(create_stmt(db, name=name, is_active=is_active))).first()
+
+
+async def update_by_id(db: AsyncSession, category_id: int, values: dict[str, Any]) -> Row[Any] | None:
+    return (await db.execute(update_by_id_stmt(category_id, values))).first()
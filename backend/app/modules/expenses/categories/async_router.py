@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import matching_etag, not_modified
+from app.db.session import get_async_db, get_async_read_db
+from app.modules.expenses.codes.schemas import (
+    CodeBulkResult,
+    CodeCreate,
+    CodeListQuery,
+    CodeOut,
+    code_list_encoder,
+)
+
+from ..cache import categories_payload_key, codes_payload_key
+from ..changes import categories_etag_async, codes_etag_async
+from ..coherence import sync_catalog
+from ..payloads import Payload, build_payload, cached_payload_async, payload_response
+from . import async_service as categories_service
+from .router import MAX_BULK_CODES
+from .schemas import (
+    CategoryCountsOut,
+    CategoryCreate,
+    CategoryListQuery,
+    CategoryOut,
+    CategoryUpdate,
+    CategoryUpdateOut,
+    category_counts_list_encoder,
+    category_list_encoder,
+)
+
+# Same contract as `router`, served by native coroutines (no threadpool hop per request).
+router = APIRouter(tags=["categories"])
+
+
+@router.get(
+    "/categories",
+    response_model=list[CategoryOut] | list[CategoryCountsOut],
+    dependencies=[Depends(sync_catalog)],
+)
+async def list_categories(
+    request: Request,
+    query: Annotated[CategoryListQuery, Query()],
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = await categories_etag_async(db, query)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
+
+    async def load() -> Payload:
+        page = await categories_service.list_categories(db, query)
+        encoder = category_counts_list_encoder if query.include_counts else category_list_encoder
+        return build_payload(encoder.encode_rows(page.items), page.next_cursor)
+
+    payload = await cached_payload_async(categories_payload_key(query, etag), load)
+    return payload_response(request, payload, etag)
+
+
+@router.post("/categories", response_model=CategoryOut, status_code=status.HTTP_201_CREATED)
+async def create_category(payload: CategoryCreate, db: AsyncSession = Depends(get_async_db)) -> Row[Any]:
+    return await categories_service.create_category(db, payload)
+
+
+@router.put("/categories/{id}", response_model=CategoryUpdateOut, response_model_exclude_none=True)
+async def update_category(
+    id: int,
+    payload: CategoryUpdate,
+    cascade_codes: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+) -> Row[Any] | dict[str, Any]:
+    return await categories_service.update_category(db, id, payload, cascade_codes=cascade_codes)
+
+
+@router.get("/categories/{id}/codes", response_model=list[CodeOut], dependencies=[Depends(sync_catalog)])
+async def list_codes_for_category(
+    id: int,
+    request: Request,
+    query: Annotated[CodeListQuery, Query()],
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    etag = await codes_etag_async(db, id, query)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
+
+    async def load() -> Payload:
+        page = await categories_service.list_codes_for_category(db, id, query)
+        return build_payload(code_list_encoder.encode_rows(page.items), page.next_cursor)
+
+    payload = await cached_payload_async(codes_payload_key(id, etag), load)
+    return payload_response(request, payload, etag)
+
+
+@router.post("/categories/{id}/codes", response_model=CodeOut, status_code=status.HTTP_201_CREATED)
+async def create_code_for_category(
+    id: int,
+    payload: CodeCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> Row[Any]:
+    return await categories_service.create_code_for_category(db, id, payload)
+
+
+@router.post("/categories/{id}/codes:bulk", response_model=CodeBulkResult)
+async def bulk_create_codes_for_category(
+    id: int,
+    payload: Annotated[list[CodeCreate], Body(min_length=1, max_length=MAX_BULK_CODES)],
+    db: AsyncSession = Depends(get_async_db),
+) -> CodeBulkResult:
+    return await categories_service.bulk_create_codes_for_category(db, id, payload)
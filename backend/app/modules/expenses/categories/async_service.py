@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import ValidationError
+from app.core.pagination import Page, decode_cursor, paginate
+from app.db.hooks import on_commit
+
+from . import async_repo as categories_repo
+from ..changes import categories_changed, codes_changed
+from ..codes import async_repo as codes_repo
+from .schemas import CategoryCreate, CategoryListQuery, CategoryUpdate
+from ..codes.schemas import CodeBulkResult, CodeCreate, CodeListQuery
+from .service import (
+    BULK_INSERT_BATCH_SIZE,
+    bulk_result,
+    category_not_found_error,
+    category_update_values,
+    check_cascade,
+    clean_category_name,
+    clean_code,
+    duplicate_code_error,
+    duplicate_name_error,
+    plan_bulk_codes,
+)
+
+
+async def list_categories(db: AsyncSession, query: CategoryListQuery | None = None) -> Page[Row[Any]]:
+    query = query or CategoryListQuery()
+    rows = await categories_repo.list(
+        db,
+        limit=query.limit,
+        after_id=decode_cursor(query.after) if query.after else None,
+        is_active=query.is_active,
+        name_prefix=query.name_prefix,
+        order=query.order,
+        include_counts=query.include_counts,
+    )
+    return paginate(rows, query.limit)
+
+
+async def create_category(db: AsyncSession, payload: CategoryCreate) -> Row[Any]:
+    row = await categories_repo.create(db, name=clean_category_name(payload.name), is_active=True)
+    if row is None:
+        raise duplicate_name_error()
+
+    on_commit(db, partial(categories_changed, "category.created", row))
+    return row
+
+
+async def update_category(
+    db: AsyncSession, category_id: int, payload: CategoryUpdate, *, cascade_codes: bool = False
+) -> Row[Any] | dict[str, Any]:
+    try:
+        check_cascade(payload, cascade_codes)
+        values = category_update_values(payload)
+    except ValidationError:
+        # A missing category is still a 404 before any body error; only this path pays the lookup.
+        if not await codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise
+    try:
+        row = await categories_repo.update_by_id(db, category_id, values)
+    except IntegrityError:
+        raise duplicate_name_error()
+    if row is None:
+        raise category_not_found_error()
+
+    if values:
+        on_commit(db, partial(categories_changed, "category.updated", row))
+    if not cascade_codes:
+        return row
+
+    assert payload.is_active is not None
+    codes_updated = await codes_repo.set_status_by_category(db, category_id, payload.is_active)
+    if codes_updated:
+        on_commit(db, partial(codes_changed, category_id))
+    return {**row._asdict(), "codes_updated": codes_updated}
+
+
+async def list_codes_for_category(
+    db: AsyncSession,
+    category_id: int,
+    query: CodeListQuery | None = None,
+) -> Page[Row[Any]]:
+    query = query or CodeListQuery()
+    rows = await codes_repo.list_by_category(
+        db,
+        category_id,
+        limit=query.limit,
+        after_id=decode_cursor(query.after) if query.after else None,
+        is_active=query.is_active,
+        code_prefix=query.code_prefix,
+        order=query.order,
+    )
+    # Only an empty page needs the existence check (saves a query on the common path).
+    if not rows and await categories_repo.get(db, category_id) is None:
+        raise category_not_found_error()
+
+    return paginate(rows, query.limit)
+
+
+async def create_code_for_category(db: AsyncSession, category_id: int, payload: CodeCreate) -> Row[Any]:
+    try:
+        code = clean_code(payload.code)
+    except ValidationError:
+        if not await codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise
+    row = await codes_repo.create(
+        db,
+        category_id=category_id,
+        code=code,
+        description=payload.description,
+        is_active=True,
+    )
+    if row is None:
+        if not await codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise duplicate_code_error()
+
+    on_commit(db, partial(codes_changed, category_id, "code.created", row))
+    return row
+
+
+async def bulk_create_codes_for_category(
+    db: AsyncSession,
+    category_id: int,
+    payloads: list[CodeCreate],
+) -> CodeBulkResult:
+    if await categories_repo.get(db, category_id) is None:
+        raise category_not_found_error()
+
+    plan = plan_bulk_codes(category_id, payloads)
+    inserted = await codes_repo.insert_many_skip_conflicts(db, plan.rows, batch_size=BULK_INSERT_BATCH_SIZE)
+    if inserted:
+        on_commit(db, partial(codes_changed, category_id))
+    return bulk_result(plan, inserted)
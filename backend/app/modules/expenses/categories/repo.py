@@ -1,20 +1,155 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, Select, Update, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import ExpenseCategory
+from app.core.pagination import SortOrder
+from app.db.dialects import upsert_insert
+from app.db.models import ExpenseCategory, ExpenseCode
+
+_categories = ExpenseCategory.__table__
+_codes = ExpenseCode.__table__
+# `CategoryOut` columns. Lists select these instead of the entity: plain rows skip
+# identity-map bookkeeping and go straight to the JSON encoder. Writes return them too.
+LIST_COLUMNS = (_categories.c.id, _categories.c.name, _categories.c.is_active)
+
+
+def count_columns(dialect_name: str) -> tuple[ColumnElement[int], ColumnElement[int]]:
+    """``active_codes`` / ``inactive_codes`` for a categories query.
+
+    SQLite reads the trigger-maintained counters (`app.db.counts`); other backends have no
+    triggers yet, so they count live with correlated subqueries on the
+    ``(category_id, is_active)`` index.
+    """
+
+    if dialect_name == "sqlite":
+        return _categories.c.active_codes, _categories.c.inactive_codes
+
+    def live(is_active: bool) -> ColumnElement[int]:
+        return (
+            select(func.count())
+            .where(_codes.c.category_id == _categories.c.id, _codes.c.is_active == is_active)
+            .scalar_subquery()
+        )
+
+    return live(True).label("active_codes"), live(False).label("inactive_codes")
+
+
+def list_stmt(
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    name_prefix: str | None = None,
+    order: SortOrder = "asc",
+    include_counts: bool = False,
+    dialect_name: str = "sqlite",
+) -> Select[tuple[int, str, bool]]:
+    """Keyset query: seek past ``after_id`` instead of OFFSET, so every page costs the same.
+
+    ``is_active`` is served by ``ix_expense_categories_is_active`` (which carries the rowid,
+    so the id ordering comes straight from the index).
+    """
+
+    stmt = select(*LIST_COLUMNS)
+    if include_counts:
+        stmt = stmt.add_columns(*count_columns(dialect_name))
+    if is_active is not None:
+        stmt = stmt.where(ExpenseCategory.is_active == is_active)
+    if name_prefix:
+        stmt = stmt.where(ExpenseCategory.name.startswith(name_prefix, autoescape=True))
+
+    if order == "desc":
+        if after_id is not None:
+            stmt = stmt.where(ExpenseCategory.id < after_id)
+        stmt = stmt.order_by(ExpenseCategory.id.desc())
+    else:
+        if after_id is not None:
+            stmt = stmt.where(ExpenseCategory.id > after_id)
+        stmt = stmt.order_by(ExpenseCategory.id)
+
+    if limit is not None:
+        # One extra row tells the caller whether there is a next page.
+        stmt = stmt.limit(limit + 1)
+    return stmt
 
 
-def list(db: Session) -> list[ExpenseCategory]:
-    return db.execute(select(ExpenseCategory).order_by(ExpenseCategory.id)).scalars().all()
+def list(
+    db: Session,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    name_prefix: str | None = None,
+    order: SortOrder = "asc",
+    include_counts: bool = False,
+) -> list[Row[Any]]:
+    stmt = list_stmt(
+        limit=limit,
+        after_id=after_id,
+        is_active=is_active,
+        name_prefix=name_prefix,
+        order=order,
+        include_counts=include_counts,
+        dialect_name=db.get_bind().dialect.name,
+    )
+    return db.execute(stmt).all()
 
 
 def get(db: Session, category_id: int) -> ExpenseCategory | None:
     return db.get(ExpenseCategory, category_id)
 
 
-def create(db: Session, *, name: str, is_active: bool = True) -> ExpenseCategory:
-    obj = ExpenseCategory(name=name, is_active=is_active)
-    db.add(obj)
-    return obj
+def create_stmt(
+    db: Session | AsyncSession, *, name: str, is_active: bool = True
+) -> sqlite.Insert | postgresql.Insert:
+    """``INSERT ... ON CONFLICT (name) DO NOTHING RETURNING``: no row back means the name is taken."""
+
+    return (
+        upsert_insert(db, _categories)
+        .values(name=name, is_active=is_active)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(*LIST_COLUMNS)
+    )
+
+
+def create(db: Session, *, name: str, is_active: bool = True) -> Row[Any] | None:
+    return db.execute(create_stmt(db, name=name, is_active=is_active)).first()
+
+
+def update_by_id_stmt(category_id: int, values: dict[str, Any]) -> Update | Select:
+    """``UPDATE ... WHERE id = :id RETURNING``: no row back means no such category.
+
+    Without ``values`` there is nothing to write, so this is a plain read of the row.
+    """
+
+    if not values:
+        return select(*LIST_COLUMNS).where(_categories.c.id == category_id)
+    return update(_categories).where(_categories.c.id == category_id).values(**values).returning(*LIST_COLUMNS)
+
+
+def update_by_id(db: Session, category_id: int, values: dict[str, Any]) -> Row[Any] | None:
+    return db.execute(update_by_id_stmt(category_id, values)).first()
+
+
+def name_to_id(db: Session) -> dict[str, int]:
+    return dict(db.execute(select(ExpenseCategory.name, ExpenseCategory.id)).tuples().all())
+
+
+def insert_or_get_id(db: Session, *, name: str, is_active: bool = True) -> tuple[int, bool]:
+    """Return ``(id, created)`` for the category called ``name``, creating it if missing."""
+
+    stmt = (
+        upsert_insert(db, ExpenseCategory)
+        .values(name=name, is_active=is_active)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(ExpenseCategory.id)
+    )
+    category_id = db.execute(stmt).scalar()
+    if category_id is not None:
+        return category_id, True
+    return db.execute(select(ExpenseCategory.id).where(ExpenseCategory.name == name)).scalar_one(), False
@@ -1,35 +1,82 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status, HTTPException
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from app.db.models import ExpenseCategory, ExpenseCode
-from app.db.session import get_db
-from app.modules.expenses.codes.schemas import CodeCreate, CodeOut
+from app.core.etag import matching_etag, not_modified
+from app.db.session import get_db, get_read_db
+from app.modules.expenses.codes.schemas import (
+    CodeBulkResult,
+    CodeCreate,
+    CodeListQuery,
+    CodeOut,
+    code_list_encoder,
+)
 
+from ..cache import categories_payload_key, codes_payload_key
+from ..changes import categories_etag, codes_etag
+from ..coherence import sync_catalog
+from ..payloads import Payload, build_payload, cached_payload, payload_response
 from . import service as categories_service
-from .schemas import CategoryCreate, CategoryOut, CategoryUpdate
+from .schemas import (
+    CategoryCountsOut,
+    CategoryCreate,
+    CategoryListQuery,
+    CategoryOut,
+    CategoryUpdate,
+    CategoryUpdateOut,
+    category_counts_list_encoder,
+    category_list_encoder,
+)
 
 router = APIRouter(tags=["categories"])
 
 MAX_CATEGORY_NAME_LEN = 120
 MAX_CODE_LEN = 64
+MAX_BULK_CODES = 5000
+
 
+@router.get(
+    "/categories",
+    response_model=list[CategoryOut] | list[CategoryCountsOut],
+    dependencies=[Depends(sync_catalog)],
+)
+def list_categories(
+    request: Request,
+    query: Annotated[CategoryListQuery, Query()],
+    db: Session = Depends(get_read_db),
+) -> Response:
+    etag = categories_etag(db, query)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
 
-@router.get("/categories", response_model=list[CategoryOut])
-def list_categories(db: Session = Depends(get_db)) -> list[ExpenseCategory]:
-    return categories_service.list_categories(db)
+    def load() -> Payload:
+        page = categories_service.list_categories(db, query)
+        encoder = category_counts_list_encoder if query.include_counts else category_list_encoder
+        return build_payload(encoder.encode_rows(page.items), page.next_cursor)
+
+    payload = cached_payload(categories_payload_key(query, etag), load)
+    return payload_response(request, payload, etag)
 
 
 @router.post("/categories", response_model=CategoryOut, status_code=status.HTTP_201_CREATED)
-def create_category(payload: CategoryCreate, db: Session = Depends(get_db)) -> ExpenseCategory:
+def create_category(payload: CategoryCreate, db: Session = Depends(get_db)) -> Row[Any]:
     if len(payload.name) > MAX_CATEGORY_NAME_LEN:
         raise HTTPException(status_code=422, detail="name too long")
     return categories_service.create_category(db, payload)
 
 
-@router.put("/categories/{id}", response_model=CategoryOut)
-def update_category(id: int, payload: CategoryUpdate, db: Session = Depends(get_db)) -> ExpenseCategory:
+@router.put("/categories/{id}", response_model=CategoryUpdateOut, response_model_exclude_none=True)
+def update_category(
+    id: int,
+    payload: CategoryUpdate,
+    cascade_codes: bool = Query(False),
+    db: Session = Depends(get_db),
+) -> Row[Any] | dict[str, Any]:
     if payload.name is not None and len(payload.name) > MAX_CATEGORY_NAME_LEN:
         raise HTTPException(
             status_code=422,
@@ -39,16 +86,31 @@ def update_category(id: int, payload: CategoryUpdate, db: Session = Depends(get_
                 "type": "string_too_long",
             }],
         )
-    return categories_service.update_category(db, id, payload)
+    return categories_service.update_category(db, id, payload, cascade_codes=cascade_codes)
+
 
+@router.get("/categories/{id}/codes", response_model=list[CodeOut], dependencies=[Depends(sync_catalog)])
+def list_codes_for_category(
+    id: int,
+    request: Request,
+    query: Annotated[CodeListQuery, Query()],
+    db: Session = Depends(get_read_db),
+) -> Response:
+    etag = codes_etag(db, id, query)
+    matched = matching_etag(request.headers.get("if-none-match"), etag)
+    if matched is not None:
+        return not_modified(matched)
 
-@router.get("/categories/{id}/codes", response_model=list[CodeOut])
-def list_codes_for_category(id: int, db: Session = Depends(get_db)) -> list[ExpenseCode]:
-    return categories_service.list_codes_for_category(db, id)
+    def load() -> Payload:
+        page = categories_service.list_codes_for_category(db, id, query)
+        return build_payload(code_list_encoder.encode_rows(page.items), page.next_cursor)
+
+    payload = cached_payload(codes_payload_key(id, etag), load)
+    return payload_response(request, payload, etag)
 
 
 @router.post("/categories/{id}/codes", response_model=CodeOut, status_code=status.HTTP_201_CREATED)
-def create_code_for_category(id: int, payload: CodeCreate, db: Session = Depends(get_db)) -> ExpenseCode:
+def create_code_for_category(id: int, payload: CodeCreate, db: Session = Depends(get_db)) -> Row[Any]:
     if len(payload.code) > MAX_CODE_LEN:
         raise HTTPException(
             status_code=422,
@@ -59,3 +121,12 @@ def create_code_for_category(id: int, payload: CodeCreate, db: Session = Depends
             }],
         )
     return categories_service.create_code_for_category(db, id, payload)
+
+
+@router.post("/categories/{id}/codes:bulk", response_model=CodeBulkResult)
+def bulk_create_codes_for_category(
+    id: int,
+    payload: Annotated[list[CodeCreate], Body(min_length=1, max_length=MAX_BULK_CODES)],
+    db: Session = Depends(get_db),
+) -> CodeBulkResult:
+    return categories_service.bulk_create_codes_for_category(db, id, payload)
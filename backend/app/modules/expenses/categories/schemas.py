@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing_extensions import Annotated
-from pydantic import BaseModel, ConfigDict
+from typing_extensions import Annotated, TypedDict
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic.types import StringConstraints, StrictBool
 
+from app.core.pagination import MAX_PAGE_LIMIT, SortOrder
+from app.core.serialization import RecordListEncoder
+
 CategoryName = Annotated[str, StringConstraints(min_length=1, max_length=120)]
 
 class CategoryBase(BaseModel):
@@ -21,3 +24,41 @@ class CategoryOut(BaseModel):
     id: int
     name: str
     is_active: bool
+
+class CategoryCountsOut(CategoryOut):
+    """`CategoryOut` with its code counters, from ``GET /categories?include_counts=true``."""
+
+    active_codes: int
+    inactive_codes: int
+
+class CategoryUpdateOut(CategoryOut):
+    # Only present with ``?cascade_codes=true``: codes switched to the category's new status.
+    codes_updated: int | None = None
+
+class CategoryRecord(TypedDict):
+    """Wire shape of `CategoryOut` (same keys, same order) for the row fast path."""
+
+    id: int
+    name: str
+    is_active: bool
+
+class CategoryCountsRecord(CategoryRecord):
+    """Wire shape of `CategoryCountsOut`."""
+
+    active_codes: int
+    inactive_codes: int
+
+category_list_encoder = RecordListEncoder(CategoryRecord)
+category_counts_list_encoder = RecordListEncoder(CategoryCountsRecord)
+
+class CategoryListQuery(BaseModel):
+    """Query parameters of ``GET /categories``; without ``limit`` every row is returned."""
+
+    model_config = ConfigDict(frozen=True)
+
+    limit: int | None = Field(None, ge=1, le=MAX_PAGE_LIMIT)
+    after: str | None = None
+    is_active: bool | None = None
+    name_prefix: str | None = Field(None, max_length=120)
+    order: SortOrder = "asc"
+    include_counts: bool = False
@@ -1,87 +1,258 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.errors import ConflictError, NotFoundError, ValidationError
-from app.db.models import ExpenseCategory, ExpenseCode
+from app.core.pagination import Page, decode_cursor, paginate
+from app.db.hooks import on_commit
 
 from . import repo as categories_repo
+from ..changes import categories_changed, codes_changed
 from ..codes import repo as codes_repo
-from .schemas import CategoryCreate, CategoryUpdate
-from ..codes.schemas import CodeCreate
+from .schemas import CategoryCreate, CategoryListQuery, CategoryUpdate
+from ..codes.schemas import CodeBulkError, CodeBulkResult, CodeCreate, CodeListQuery, CodeOut
+
+# Rows per multi-row INSERT; 500 x 4 bound parameters stays well below SQLite's variable limit.
+BULK_INSERT_BATCH_SIZE = 500
 
 
-def list_categories(db: Session) -> list[ExpenseCategory]:
-    return categories_repo.list(db)
+# --- Shared rules (also used by the async service) ---
 
 
-def create_category(db: Session, payload: CategoryCreate) -> ExpenseCategory:
-    name = payload.name.strip()
+def clean_category_name(raw: str) -> str:
+    name = raw.strip()
     if not name:
         raise ValidationError("empty_name", "Category name must not be empty.")
+    return name
 
-    obj = categories_repo.create(db, name=name, is_active=True)
 
-    try:
-        db.flush()
-    except IntegrityError:
-        raise ConflictError("duplicate_name", "Category name must be unique.")
+def clean_code(raw: str) -> str:
+    code_value = raw.strip()
+    if not code_value:
+        raise ValidationError("empty_code", "Expense code must not be empty.")
+    return code_value
 
-    return obj
 
+def duplicate_name_error() -> ConflictError:
+    return ConflictError("duplicate_name", "Category name must be unique.")
 
-def update_category(db: Session, category_id: int, payload: CategoryUpdate) -> ExpenseCategory:
-    obj = categories_repo.get(db, category_id)
-    if obj is None:
-        raise NotFoundError("not_found", "Category not found.")
 
-    if payload.name is not None:
-        name = payload.name.strip()
-        if not name:
-            raise ValidationError("empty_name", "Category name must not be empty.")
-        obj.name = name
+def duplicate_code_error() -> ConflictError:
+    return ConflictError("duplicate_code", "Expense code must be unique within category.")
 
+
+def category_not_found_error() -> NotFoundError:
+    return NotFoundError("not_found", "Category not found.")
+
+
+def check_cascade(payload: CategoryUpdate, cascade_codes: bool) -> None:
+    if cascade_codes and payload.is_active is None:
+        raise ValidationError("cascade_without_status", "cascade_codes needs is_active in the body.")
+
+
+def category_update_values(payload: CategoryUpdate) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+    if payload.name is not None:
+        values["name"] = clean_category_name(payload.name)
     if payload.is_active is not None:
-        obj.is_active = payload.is_active
+        values["is_active"] = payload.is_active
+    return values
+
+
+@dataclass(slots=True)
+class BulkCodePlan:
+    """Rows that passed in-memory validation, plus the per-item errors found so far."""
+
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    pending: dict[str, int] = field(default_factory=dict)  # code -> request index
+    errors: list[CodeBulkError] = field(default_factory=list)
+
+
+def plan_bulk_codes(category_id: int, payloads: list[CodeCreate]) -> BulkCodePlan:
+    plan = BulkCodePlan()
+
+    for index, payload in enumerate(payloads):
+        code_value = payload.code.strip()
+        if not code_value:
+            plan.errors.append(
+                CodeBulkError(
+                    index=index,
+                    code=payload.code,
+                    error="empty_code",
+                    message="Expense code must not be empty.",
+                )
+            )
+        elif code_value in plan.pending:
+            plan.errors.append(
+                CodeBulkError(
+                    index=index,
+                    code=code_value,
+                    error="duplicate_code",
+                    message="Expense code is repeated within the request.",
+                )
+            )
+        else:
+            plan.pending[code_value] = index
+            plan.rows.append(
+                {
+                    "category_id": category_id,
+                    "code": code_value,
+                    "description": payload.description,
+                    "is_active": True,
+                }
+            )
+
+    return plan
+
+
+def bulk_result(plan: BulkCodePlan, inserted: list[Any]) -> CodeBulkResult:
+    """Rows missing from ``RETURNING`` were skipped by ``ON CONFLICT`` -> report as duplicates."""
+
+    inserted_codes = {row.code for row in inserted}
+    errors = plan.errors + [
+        CodeBulkError(
+            index=index,
+            code=code_value,
+            error="duplicate_code",
+            message="Expense code must be unique within category.",
+        )
+        for code_value, index in plan.pending.items()
+        if code_value not in inserted_codes
+    ]
+    errors.sort(key=lambda e: e.index)
+
+    created = sorted(inserted, key=lambda row: row.id)
+    return CodeBulkResult(
+        created=[CodeOut.model_validate(row) for row in created],
+        errors=errors,
+    )
+
+
+# --- Use cases ---
+
+
+def list_categories(db: Session, query: CategoryListQuery | None = None) -> Page[Row[Any]]:
+    query = query or CategoryListQuery()
+    rows = categories_repo.list(
+        db,
+        limit=query.limit,
+        after_id=decode_cursor(query.after) if query.after else None,
+        is_active=query.is_active,
+        name_prefix=query.name_prefix,
+        order=query.order,
+        include_counts=query.include_counts,
+    )
+    return paginate(rows, query.limit)
+
+
+def create_category(db: Session, payload: CategoryCreate) -> Row[Any]:
+    row = categories_repo.create(db, name=clean_category_name(payload.name), is_active=True)
+    if row is None:
+        raise duplicate_name_error()
+
+    on_commit(db, partial(categories_changed, "category.created", row))
+    return row
+
+
+def update_category(
+    db: Session, category_id: int, payload: CategoryUpdate, *, cascade_codes: bool = False
+) -> Row[Any] | dict[str, Any]:
+    """Update one category; with ``cascade_codes`` its codes follow the new ``is_active`` in the same
+    transaction (one set-based ``UPDATE``) and the result carries ``codes_updated``.
+    """
 
     try:
-        db.flush()
+        check_cascade(payload, cascade_codes)
+        values = category_update_values(payload)
+    except ValidationError:
+        # A missing category is still a 404 before any body error; only this path pays the lookup.
+        if not codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise
+    try:
+        row = categories_repo.update_by_id(db, category_id, values)
     except IntegrityError:
-        raise ConflictError("duplicate_name", "Category name must be unique.")
-
-    return obj
+        # A rename onto a taken name; UPDATE has no ON CONFLICT clause to report it quietly.
+        raise duplicate_name_error()
+    if row is None:
+        raise category_not_found_error()
 
+    if values:
+        on_commit(db, partial(categories_changed, "category.updated", row))
+    if not cascade_codes:
+        return row
 
-def list_codes_for_category(db: Session, category_id: int) -> list[ExpenseCode]:
-    if categories_repo.get(db, category_id) is None:
-        raise NotFoundError("not_found", "Category not found.")
+    assert payload.is_active is not None
+    codes_updated = codes_repo.set_status_by_category(db, category_id, payload.is_active)
+    if codes_updated:
+        on_commit(db, partial(codes_changed, category_id))
+    return {**row._asdict(), "codes_updated": codes_updated}
 
-    return codes_repo.list_by_category(db, category_id)
 
+def list_codes_for_category(
+    db: Session,
+    category_id: int,
+    query: CodeListQuery | None = None,
+) -> Page[Row[Any]]:
+    query = query or CodeListQuery()
+    rows = codes_repo.list_by_category(
+        db,
+        category_id,
+        limit=query.limit,
+        after_id=decode_cursor(query.after) if query.after else None,
+        is_active=query.is_active,
+        code_prefix=query.code_prefix,
+        order=query.order,
+    )
+    # Only an empty page needs the existence check (saves a query on the common path).
+    if not rows and categories_repo.get(db, category_id) is None:
+        raise category_not_found_error()
 
-def create_code_for_category(db: Session, category_id: int, payload: CodeCreate) -> ExpenseCode:
-    if categories_repo.get(db, category_id) is None:
-        raise NotFoundError("not_found", "Category not found.")
+    return paginate(rows, query.limit)
 
-    code_value = payload.code.strip()
-    if not code_value:
-        raise ValidationError("empty_code", "Expense code must not be empty.")
 
-    obj = codes_repo.create(
+def create_code_for_category(db: Session, category_id: int, payload: CodeCreate) -> Row[Any]:
+    try:
+        code = clean_code(payload.code)
+    except ValidationError:
+        if not codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise
+    row = codes_repo.create(
         db,
         category_id=category_id,
-        code=code_value,
+        code=code,
         description=payload.description,
         is_active=True,
     )
+    if row is None:
+        # Nothing inserted: either the category is missing or the code is taken.
+        if not codes_repo.category_exists(db, category_id):
+            raise category_not_found_error()
+        raise duplicate_code_error()
 
-    try:
-        db.flush()
-    except IntegrityError:
-        raise ConflictError(
-            "duplicate_code",
-            "Expense code must be unique within category.",
-        )
+    on_commit(db, partial(codes_changed, category_id, "code.created", row))
+    return row
+
+
+def bulk_create_codes_for_category(
+    db: Session,
+    category_id: int,
+    payloads: list[CodeCreate],
+) -> CodeBulkResult:
+    """Create many codes in one transaction, reporting per-item failures instead of aborting."""
+
+    if categories_repo.get(db, category_id) is None:
+        raise category_not_found_error()
 
-    return obj
+    plan = plan_bulk_codes(category_id, payloads)
+    inserted = codes_repo.insert_many_skip_conflicts(db, plan.rows, batch_size=BULK_INSERT_BATCH_SIZE)
+    if inserted:
+        on_commit(db, partial(codes_changed, category_id))
+    return bulk_result(plan, inserted)
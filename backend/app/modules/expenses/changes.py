@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import Select, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.core.events import EventBroker
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.revisions import LATEST_REVISION
+
+from .cache import (
+    catalog_revision_key,
+    categories_revision_key,
+    codes_revision_key,
+    invalidate_all,
+    invalidate_categories,
+    invalidate_codes,
+    revision_cache,
+)
+from .categories.schemas import CategoryListQuery
+from .codes.schemas import CodeListQuery
+
+# Change events for `GET /events`, published after commit.
+catalog_events = EventBroker(queue_size=settings.events_queue_size, replay_size=settings.events_replay_size)
+
+
+# --- Post-commit bookkeeping (registered by services via `on_commit`) ---
+#
+# The caches (and the revisions the ETags come from) are invalidated before the event goes
+# out, so a client reacting to it already gets the new list.
+# Single-row writes pass ``event`` ("category.updated", ...) and the new ``row``; set-based
+# writes publish the generic "categories.changed" / "codes.changed" and clients refetch.
+
+
+def categories_changed(event: str = "categories.changed", row: Any = None) -> None:
+    invalidate_categories()
+    data: dict[str, Any] = {}
+    if row is not None:
+        data["row"] = row._asdict()
+    catalog_events.publish(event, data)
+
+
+def codes_changed(category_id: int, event: str = "codes.changed", row: Any = None) -> None:
+    invalidate_codes(category_id)
+    data: dict[str, Any] = {"category_id": category_id}
+    if row is not None:
+        data["row"] = row._asdict()
+    catalog_events.publish(event, data)
+
+
+def external_changes(*, categories: bool, category_ids: Iterable[int]) -> None:
+    """Writes committed by another process (found by `coherence`), as set-based changes.
+
+    The rows are not at hand, so subscribers get the generic events and refetch.
+    """
+
+    if categories:
+        categories_changed()
+    for category_id in category_ids:
+        codes_changed(category_id)
+
+
+def catalog_replaced() -> None:
+    """The database went back in time (restored, reseeded): nothing cached can be trusted."""
+
+    invalidate_all()
+
+
+# --- Entity tags for the list endpoints ---
+#
+# A list's tag is derived from the highest persisted ``revision`` among its rows. Rows are
+# never deleted and codes never change category, so that number moves with every write to
+# the list, and every worker computes the same tag for the same data. The revision is read
+# once per change (an index lookup; `revision_cache`) in the request's own read session, so
+# it matches the rows the list query then sees. Read it *before* running the query: if a
+# write lands in between, the response carries the older tag and the next conditional GET
+# simply gets a 200.
+
+_CATEGORIES_REVISION = select(func.coalesce(func.max(ExpenseCategory.revision), 0))
+_CODES_REVISION = select(func.coalesce(func.max(ExpenseCode.revision), 0)).where(
+    ExpenseCode.category_id == bindparam("category_id")
+)
+
+
+def _categories_source(query: CategoryListQuery) -> tuple[tuple, Select]:
+    # Code counts move with code writes too, so those lists follow the latest revision.
+    if query.include_counts:
+        return catalog_revision_key(), LATEST_REVISION
+    return categories_revision_key(), _CATEGORIES_REVISION
+
+
+def _revision(db: Session, key: tuple, stmt: Select, params: dict[str, Any] | None = None) -> int:
+    revision = revision_cache.get(key)
+    if revision is None:
+        generation = revision_cache.generation
+        revision = db.execute(stmt, params).scalar_one()
+        revision_cache.set(key, revision, generation=generation)
+    return revision
+
+
+async def _revision_async(db: AsyncSession, key: tuple, stmt: Select, params: dict[str, Any] | None = None) -> int:
+    revision = revision_cache.get(key)
+    if revision is None:
+        generation = revision_cache.generation
+        revision = (await db.execute(stmt, params)).scalar_one()
+        revision_cache.set(key, revision, generation=generation)
+    return revision
+
+
+def categories_etag(db: Session, query: CategoryListQuery) -> str:
+    return make_etag("categories", _revision(db, *_categories_source(query)), query.model_dump_json())
+
+
+async def categories_etag_async(db: AsyncSession, query: CategoryListQuery) -> str:
+    return make_etag("categories", await _revision_async(db, *_categories_source(query)), query.model_dump_json())
+
+
+def codes_etag(db: Session, category_id: int, query: CodeListQuery) -> str:
+    revision = _revision(db, codes_revision_key(category_id), _CODES_REVISION, {"category_id": category_id})
+    return make_etag("codes", category_id, revision, query.model_dump_json())
+
+
+async def codes_etag_async(db: AsyncSession, category_id: int, query: CodeListQuery) -> str:
+    revision = await _revision_async(db, codes_revision_key(category_id), _CODES_REVISION, {"category_id": category_id})
+    return make_etag("codes", category_id, revision, query.model_dump_json())
+
+
+# The full catalog changes with any write, so it follows the latest revision.
+
+
+def catalog_etag(db: Session, is_active: bool | None) -> str:
+    return make_etag("catalog", _revision(db, catalog_revision_key(), LATEST_REVISION), is_active)
+
+
+async def catalog_etag_async(db: AsyncSession, is_active: bool | None) -> str:
+    return make_etag("catalog", await _revision_async(db, catalog_revision_key(), LATEST_REVISION), is_active)
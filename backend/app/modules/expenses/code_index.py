@@ -0,0 +1,150 @@
+"""In-memory index behind ``POST /codes:validate``.
+
+A `CodeIndexSnapshot` answers "is code X active in category Y?" with two dict lookups and is
+never mutated once published: readers take a reference and need no lock. Writes mark what
+they touched as stale (through the `cache` invalidation hooks, so commits of this process and
+of other workers found by `coherence` are both covered); the next validation reloads just that
+(the stale categories' active codes, or the category table) and publishes a patched copy.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from .categories import repo as categories_repo
+from .codes import repo as codes_repo
+
+# Reloading more categories than this at once reads every active code instead (one scan
+# rather than an ever longer ``IN`` list).
+MAX_PATCH_CATEGORIES = 500
+
+
+@dataclass(frozen=True, slots=True)
+class CodeIndexSnapshot:
+    # category id -> is_active, for every category.
+    categories: dict[int, bool]
+    # category name -> id.
+    category_ids: dict[str, int]
+    # category id -> {code: code id}, active codes only: `uq_expense_codes_category_id_code`
+    # makes ``(category_id, code)`` a unique key. Categories without active codes are absent.
+    codes: dict[int, dict[str, int]]
+
+
+@dataclass(frozen=True, slots=True)
+class _Reload:
+    generation: int
+    # None: every category's codes.
+    category_ids: frozenset[int] | None
+    categories: bool
+
+
+def _group_codes(rows: Iterable[Any]) -> dict[int, dict[str, int]]:
+    codes: dict[int, dict[str, int]] = {}
+    for category_id, code, code_id in rows:
+        codes.setdefault(category_id, {})[code] = code_id
+    return codes
+
+
+class ActiveCodeIndex:
+    """Copy-on-write index of active codes, patched per category after writes.
+
+    Each staleness mark bumps ``generation`` and records it. A reload reads everything marked
+    up to the generation it started at and always publishes what it read; marks that arrived
+    while it read are newer than that, so they stay stale and the next call reloads just them.
+    A reload is only dropped when a newer one already published, or the index was cleared
+    meanwhile (its read may predate a replaced database).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: CodeIndexSnapshot | None = None
+        # What is stale -> generation of its latest mark.
+        self._stale_codes: dict[int, int] = {}
+        self._stale_categories: int | None = None
+        self._cleared = 0
+        self._published = 0
+        self.generation = 0
+        self.reloads = 0
+
+    # --- Staleness marks (called from the `cache` invalidation hooks) ---
+
+    def categories_changed(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._stale_categories = self.generation
+
+    def codes_changed(self, category_id: int) -> None:
+        with self._lock:
+            self.generation += 1
+            self._stale_codes[category_id] = self.generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+            self.generation += 1
+            self._cleared = self.generation
+
+    # --- Reads ---
+
+    def snapshot(self, db: Session) -> CodeIndexSnapshot:
+        """The current snapshot, reloading whatever is stale through ``db`` first."""
+
+        snapshot = self._snapshot
+        if snapshot is not None and not self._stale_codes and self._stale_categories is None:
+            return snapshot
+
+        with self._lock:
+            base = self._snapshot
+            categories = self._stale_categories is not None
+            if base is None:
+                reload = _Reload(self.generation, None, True)
+            elif len(self._stale_codes) > MAX_PATCH_CATEGORIES:
+                reload = _Reload(self.generation, None, categories)
+            else:
+                reload = _Reload(self.generation, frozenset(self._stale_codes), categories)
+
+        # Read without the lock: concurrent reloads may overlap.
+        fresh = self._load(db, base, reload)
+
+        with self._lock:
+            self.reloads += 1
+            if reload.generation < max(self._published, self._cleared):
+                return fresh
+            self._snapshot = fresh
+            self._published = reload.generation
+            # The reload covered every mark up to its generation; later ones stay stale.
+            self._stale_codes = {cid: mark for cid, mark in self._stale_codes.items() if mark > reload.generation}
+            if self._stale_categories is not None and self._stale_categories <= reload.generation:
+                self._stale_categories = None
+        return fresh
+
+    @staticmethod
+    def _load(db: Session, base: CodeIndexSnapshot | None, reload: _Reload) -> CodeIndexSnapshot:
+        if base is None or reload.categories:
+            rows = db.execute(categories_repo.list_stmt()).all()
+            categories = {row.id: row.is_active for row in rows}
+            category_ids = {row.name: row.id for row in rows}
+        else:
+            categories, category_ids = base.categories, base.category_ids
+
+        if base is None or reload.category_ids is None:
+            codes = _group_codes(db.execute(codes_repo.active_keys_stmt()))
+        elif reload.category_ids:
+            codes = dict(base.codes)
+            loaded = _group_codes(db.execute(codes_repo.active_keys_stmt(reload.category_ids)))
+            for category_id in reload.category_ids:
+                if category_id in loaded:
+                    codes[category_id] = loaded[category_id]
+                else:
+                    codes.pop(category_id, None)
+        else:
+            codes = base.codes
+        return CodeIndexSnapshot(categories, category_ids, codes)
+
+
+active_code_index = ActiveCodeIndex()
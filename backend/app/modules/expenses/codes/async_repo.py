@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import SortOrder
+from app.db.models import ExpenseCode
+
+from .repo import (
+    category_exists_stmt,
+    create_stmt,
+    insert_skip_conflicts_stmt,
+    list_by_category_stmt,
+    search_stmt,
+    set_status_by_category_stmt,
+    set_status_by_ids_stmt,
+    update_by_id_stmt,
+)
+
+
+async def get(db: AsyncSession, code_id: int) -> ExpenseCode | None:
+    return await db.get(ExpenseCode, code_id)
+
+
+async def list_by_category(
+    db: AsyncSession,
+    category_id: int,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    code_prefix: str | None = None,
+    order: SortOrder = "asc",
+) -> list[Row[Any]]:
+    stmt = list_by_category_stmt(
+        category_id,
+        limit=limit,
+        after_id=after_id,
+        is_active=is_active,
+        code_prefix=code_prefix,
+        order=order,
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def create(
+    db: AsyncSession,
+    *,
+    category_id: int,
+    code: str,
+    description: str | None,
+    is_active: bool = True,
+) -> Row[Any] | None:
+    stmt = create_stmt(db, category_id=category_id, code=code, description=description, is_active=is_active)
+    return (await db.execute(stmt)).first()
+
+
+async def category_exists(db: AsyncSession, category_id: int) -> bool:
+    return bool((await db.execute(category_exists_stmt(category_id))).scalar())
+
+
+async def update_by_id(db: AsyncSession, code_id: int, values: dict[str, Any]) -> Row[Any] | None:
+    return (await db.execute(update_by_id_stmt(code_id, values))).first()
+
+
+async def set_status_by_ids(db: AsyncSession, ids: Sequence[int], is_active: bool) -> list[int]:
+    return list((await db.execute(set_status_by_ids_stmt(ids, is_active))).scalars())
+
+
+async def set_status_by_category(
+    db: AsyncSession, category_id: int, is_active: bool, *, code_prefix: str | None = None
+) -> int:
+    stmt = set_status_by_category_stmt(category_id, is_active, code_prefix=code_prefix)
+    return (await db.execute(stmt)).rowcount
+
+
+async def insert_many_skip_conflicts(
+    db: AsyncSession,
+    rows: Sequence[dict[str, Any]],
+    *,
+    batch_size: int,
+) -> list[Row[Any]]:
+    stmt = insert_skip_conflicts_stmt(db)
+    inserted: list[Row[Any]] = []
+    for start in range(0, len(rows), batch_size):
+        batch = list(rows[start : start + batch_size])
+        inserted.extend((await db.execute(stmt, batch)).all())
+    return inserted
+
+
+async def search(
+    db: AsyncSession,
+    match: str,
+    *,
+    category_id: int | None = None,
+    is_active: bool | None = None,
+    limit: int,
+) -> list[Row[Any]]:
+    stmt = search_stmt(
+        db.get_bind().dialect.name,
+        match,
+        category_id=category_id,
+        is_active=is_active,
+        limit=limit,
+    )
+    return (await db.execute(stmt)).all()
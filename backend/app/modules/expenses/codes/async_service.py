@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.errors import DatabaseError
+from app.db.hooks import on_commit
+
+from ..categories.service import category_not_found_error
+from ..changes import codes_changed
+from ..code_index import active_code_index
+from . import async_repo as codes_repo
+from .schemas import (
+    CodeSearchQuery,
+    CodeStatusResult,
+    CodeStatusUpdate,
+    CodeUpdate,
+    CodeValidationItem,
+    CodeValidationRecord,
+)
+from .service import check_codes, code_not_found_error, code_update_values, codes_status_changed, search_match
+
+
+async def search_codes(db: AsyncSession, query: CodeSearchQuery) -> list[Any]:
+    return await codes_repo.search(
+        db,
+        search_match(db.get_bind().dialect.name, query),
+        category_id=query.category_id,
+        is_active=query.is_active,
+        limit=query.limit,
+    )
+
+
+async def update_code(db: AsyncSession, code_id: int, payload: CodeUpdate) -> Row[Any]:
+    values = code_update_values(payload)
+    try:
+        row = await codes_repo.update_by_id(db, code_id, values)
+    except SQLAlchemyError:
+        raise DatabaseError("db_error", "Database error.")
+    if row is None:
+        raise code_not_found_error()
+
+    if values:
+        on_commit(db, partial(codes_changed, row.category_id, "code.updated", row))
+    return row
+
+
+async def set_codes_status(db: AsyncSession, payload: CodeStatusUpdate) -> CodeStatusResult:
+    if payload.ids is not None:
+        category_ids = await codes_repo.set_status_by_ids(db, payload.ids, payload.is_active)
+        codes_status_changed(db, category_ids)
+        return CodeStatusResult(updated=len(category_ids))
+
+    assert payload.category_id is not None
+    updated = await codes_repo.set_status_by_category(
+        db, payload.category_id, payload.is_active, code_prefix=payload.code_prefix
+    )
+    if not updated and not await codes_repo.category_exists(db, payload.category_id):
+        raise category_not_found_error()
+    codes_status_changed(db, [payload.category_id] if updated else [])
+    return CodeStatusResult(updated=updated)
+
+
+async def validate_codes(db: AsyncSession, items: list[CodeValidationItem]) -> list[CodeValidationRecord]:
+    # Reloads (when something is stale) run the sync index code on this session's connection.
+    return check_codes(await db.run_sync(active_code_index.snapshot), items)
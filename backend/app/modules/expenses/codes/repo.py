@@ -1,18 +1,121 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import Collection, Sequence
+from typing import Any
+
+from sqlalchemy import Row, Select, TextualSelect, Update, exists, literal, or_, select, text, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import ExpenseCode
+from app.core.pagination import SortOrder
+from app.db.dialects import upsert_insert
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.search import FTS_TABLE
+
+_codes = ExpenseCode.__table__
+_categories = ExpenseCategory.__table__
+# `CodeOut` columns, selected / returned as plain rows instead of hydrated entities.
+LIST_COLUMNS = (_codes.c.id, _codes.c.category_id, _codes.c.code, _codes.c.description, _codes.c.is_active)
 
 
 def get(db: Session, code_id: int) -> ExpenseCode | None:
     return db.get(ExpenseCode, code_id)
 
 
-def list_by_category(db: Session, category_id: int) -> list[ExpenseCode]:
-    stmt = select(ExpenseCode).where(ExpenseCode.category_id == category_id).order_by(ExpenseCode.id)
-    return db.execute(stmt).scalars().all()
+def active_keys_stmt(category_ids: Collection[int] | None = None) -> Select[tuple[int, str, int]]:
+    """``(category_id, code, id)`` of the active codes (of ``category_ids``), for `code_index`."""
+
+    stmt = select(_codes.c.category_id, _codes.c.code, _codes.c.id).where(_codes.c.is_active == true())
+    if category_ids is not None:
+        stmt = stmt.where(_codes.c.category_id.in_(sorted(category_ids)))
+    return stmt
+
+
+def list_by_category_stmt(
+    category_id: int,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    code_prefix: str | None = None,
+    order: SortOrder = "asc",
+) -> Select[tuple[int, int, str, str | None, bool]]:
+    """Keyset query over one category, projecting the `CodeOut` columns as plain rows.
+
+    ``(category_id, is_active)`` equality lands on ``ix_expense_codes_category_id_is_active``
+    (or ``ix_expense_codes_category_id`` without a status filter); both carry the rowid, so
+    seeking past ``after_id`` and ordering by id need no sort step.
+    """
+
+    stmt = select(*LIST_COLUMNS).where(ExpenseCode.category_id == category_id)
+    if is_active is not None:
+        stmt = stmt.where(ExpenseCode.is_active == is_active)
+    if code_prefix:
+        stmt = stmt.where(ExpenseCode.code.startswith(code_prefix, autoescape=True))
+
+    if order == "desc":
+        if after_id is not None:
+            stmt = stmt.where(ExpenseCode.id < after_id)
+        stmt = stmt.order_by(ExpenseCode.id.desc())
+    else:
+        if after_id is not None:
+            stmt = stmt.where(ExpenseCode.id > after_id)
+        stmt = stmt.order_by(ExpenseCode.id)
+
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def list_by_category(
+    db: Session,
+    category_id: int,
+    *,
+    limit: int | None = None,
+    after_id: int | None = None,
+    is_active: bool | None = None,
+    code_prefix: str | None = None,
+    order: SortOrder = "asc",
+) -> list[Row[Any]]:
+    stmt = list_by_category_stmt(
+        category_id,
+        limit=limit,
+        after_id=after_id,
+        is_active=is_active,
+        code_prefix=code_prefix,
+        order=order,
+    )
+    return db.execute(stmt).all()
+
+
+def create_stmt(
+    db: Session | AsyncSession,
+    *,
+    category_id: int,
+    code: str,
+    description: str | None,
+    is_active: bool = True,
+) -> sqlite.Insert | postgresql.Insert:
+    """``INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING`` into an existing category.
+
+    The row is selected from ``expense_categories``, so a missing category inserts nothing
+    instead of failing the foreign key; a duplicate code inserts nothing too. Only when no
+    row comes back does the caller need `category_exists` to tell the two apart.
+    """
+
+    source = select(
+        _categories.c.id,
+        literal(code, _codes.c.code.type),
+        literal(description, _codes.c.description.type),
+        literal(is_active, _codes.c.is_active.type),
+    ).where(_categories.c.id == category_id)
+    return (
+        upsert_insert(db, _codes)
+        .from_select(["category_id", "code", "description", "is_active"], source)
+        .on_conflict_do_nothing(index_elements=["category_id", "code"])
+        .returning(*LIST_COLUMNS)
+    )
 
 
 def create(
@@ -22,12 +125,171 @@ def create(
     code: str,
     description: str | None,
     is_active: bool = True,
-) -> ExpenseCode:
-    obj = ExpenseCode(
+) -> Row[Any] | None:
+    stmt = create_stmt(db, category_id=category_id, code=code, description=description, is_active=is_active)
+    return db.execute(stmt).first()
+
+
+def category_exists_stmt(category_id: int) -> Select[tuple[bool]]:
+    return select(exists().where(_categories.c.id == category_id))
+
+
+def category_exists(db: Session, category_id: int) -> bool:
+    return bool(db.execute(category_exists_stmt(category_id)).scalar())
+
+
+def update_by_id_stmt(code_id: int, values: dict[str, Any]) -> Update | Select:
+    """``UPDATE ... WHERE id = :id RETURNING``: no row back means no such code (a plain read without ``values``)."""
+
+    if not values:
+        return select(*LIST_COLUMNS).where(_codes.c.id == code_id)
+    return update(_codes).where(_codes.c.id == code_id).values(**values).returning(*LIST_COLUMNS)
+
+
+def update_by_id(db: Session, code_id: int, values: dict[str, Any]) -> Row[Any] | None:
+    return db.execute(update_by_id_stmt(code_id, values)).first()
+
+
+def set_status_by_ids_stmt(ids: Sequence[int], is_active: bool) -> Update:
+    """One ``UPDATE`` for a set of ids, skipping codes already in the target state.
+
+    Returns the ``category_id`` of every changed row, so the caller knows which
+    categories' lists to invalidate (and, by counting, how many rows changed).
+    """
+
+    return (
+        update(_codes)
+        .where(_codes.c.id.in_(ids), _codes.c.is_active == (not is_active))
+        .values(is_active=is_active)
+        .returning(_codes.c.category_id)
+    )
+
+
+def set_status_by_ids(db: Session, ids: Sequence[int], is_active: bool) -> list[int]:
+    return list(db.execute(set_status_by_ids_stmt(ids, is_active)).scalars())
+
+
+def set_status_by_category_stmt(category_id: int, is_active: bool, *, code_prefix: str | None = None) -> Update:
+    """One ``UPDATE`` over a category's codes in the opposite state.
+
+    ``(category_id, is_active)`` equality is served by ``ix_expense_codes_category_id_is_active``,
+    so only the rows that change are visited.
+    """
+
+    stmt = update(_codes).where(_codes.c.category_id == category_id, _codes.c.is_active == (not is_active))
+    if code_prefix:
+        stmt = stmt.where(_codes.c.code.startswith(code_prefix, autoescape=True))
+    return stmt.values(is_active=is_active)
+
+
+def set_status_by_category(
+    db: Session, category_id: int, is_active: bool, *, code_prefix: str | None = None
+) -> int:
+    return db.execute(set_status_by_category_stmt(category_id, is_active, code_prefix=code_prefix)).rowcount
+
+
+def insert_skip_conflicts_stmt(db: Session | AsyncSession):
+    """``INSERT ... ON CONFLICT DO NOTHING RETURNING``, executed with a list of parameter sets.
+
+    SQLAlchemy's "insertmanyvalues" turns the executemany into multi-row ``VALUES``
+    statements from one cached compilation, which is far cheaper than compiling a
+    ``.values([...])`` statement per batch. Built on the Core table so the ORM bulk
+    persistence layer is bypassed.
+    """
+
+    return (
+        upsert_insert(db, _codes)
+        .on_conflict_do_nothing(index_elements=["category_id", "code"])
+        .returning(*LIST_COLUMNS)
+    )
+
+
+def insert_many_skip_conflicts(
+    db: Session,
+    rows: Sequence[dict[str, Any]],
+    *,
+    batch_size: int,
+) -> list[Row[Any]]:
+    """Insert ``rows``, ``batch_size`` rows per multi-row ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    Rows clashing with ``uq_expense_codes_category_id_code`` are skipped silently;
+    only the rows actually inserted come back from ``RETURNING``.
+    """
+
+    stmt = insert_skip_conflicts_stmt(db)
+    inserted: list[Row[Any]] = []
+    for start in range(0, len(rows), batch_size):
+        batch = list(rows[start : start + batch_size])
+        inserted.extend(db.execute(stmt, batch).all())
+    return inserted
+
+
+def search_stmt(
+    dialect_name: str,
+    match: str,
+    *,
+    category_id: int | None = None,
+    is_active: bool | None = None,
+    limit: int,
+) -> TextualSelect | Select:
+    """Ranked code search.
+
+    On SQLite ``match`` is an FTS5 query, ranked by BM25 with hits on ``code`` weighted
+    above hits on ``description``. Other backends get a plain prefix / substring filter
+    on the raw text until they have a full-text index of their own.
+    """
+
+    if dialect_name != "sqlite":
+        stmt = select(*LIST_COLUMNS).where(
+            or_(
+                _codes.c.code.istartswith(match, autoescape=True),
+                _codes.c.description.icontains(match, autoescape=True),
+            )
+        )
+        if category_id is not None:
+            stmt = stmt.where(_codes.c.category_id == category_id)
+        if is_active is not None:
+            stmt = stmt.where(_codes.c.is_active == is_active)
+        return stmt.order_by(_codes.c.code, _codes.c.id).limit(limit)
+
+    filters = ""
+    params: dict[str, Any] = {"match": match, "limit": limit}
+    if category_id is not None:
+        filters += " AND c.category_id = :category_id"
+        params["category_id"] = category_id
+    if is_active is not None:
+        filters += " AND c.is_active = :is_active"
+        params["is_active"] = is_active
+
+    return (
+        text(
+            f"""
+            SELECT c.id, c.category_id, c.code, c.description, c.is_active
+            FROM {FTS_TABLE}
+            JOIN expense_codes AS c ON c.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match{filters}
+            ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), c.id
+            LIMIT :limit
+            """
+        )
+        .bindparams(**params)
+        .columns(*LIST_COLUMNS)
+    )
+
+
+def search(
+    db: Session,
+    match: str,
+    *,
+    category_id: int | None = None,
+    is_active: bool | None = None,
+    limit: int,
+) -> list[Row[Any]]:
+    stmt = search_stmt(
+        db.get_bind().dialect.name,
+        match,
         category_id=category_id,
-        code=code,
-        description=description,
         is_active=is_active,
+        limit=limit,
     )
-    db.add(obj)
-    return obj
+    return db.execute(stmt).all()
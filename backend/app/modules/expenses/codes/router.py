@@ -1,15 +1,48 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Body, Depends, Query, Response
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from .schemas import CodeOut, CodeUpdate
+from app.core.serialization import json_bytes_response
+from app.db.session import get_db, get_read_db
+from ..coherence import sync_catalog
+from .schemas import (
+    MAX_VALIDATE_ITEMS,
+    CodeOut,
+    CodeSearchQuery,
+    CodeStatusResult,
+    CodeStatusUpdate,
+    CodeUpdate,
+    CodeValidationItem,
+    CodeValidationOut,
+    code_list_encoder,
+    code_validation_encoder,
+)
 from . import service as codes_service
 
 router = APIRouter(tags=["codes"])
 
+@router.get("/codes/search", response_model=list[CodeOut])
+def search_codes(query: Annotated[CodeSearchQuery, Query()], db: Session = Depends(get_read_db)) -> Response:
+    rows = codes_service.search_codes(db, query)
+    return json_bytes_response(code_list_encoder.encode_rows(rows))
+
 @router.put("/codes/{id}", response_model=CodeOut)
-def update_code(id: int, payload: CodeUpdate, db: Session = Depends(get_db)) -> CodeOut:
-    obj = codes_service.update_code(db, id, payload)
-    return CodeOut.model_validate(obj)
+def update_code(id: int, payload: CodeUpdate, db: Session = Depends(get_db)) -> Row[Any]:
+    # Validated and serialized once, by `response_model`.
+    return codes_service.update_code(db, id, payload)
+
+@router.post("/codes:status", response_model=CodeStatusResult)
+def set_codes_status(payload: CodeStatusUpdate, db: Session = Depends(get_db)) -> CodeStatusResult:
+    return codes_service.set_codes_status(db, payload)
+
+@router.post("/codes:validate", response_model=list[CodeValidationOut], dependencies=[Depends(sync_catalog)])
+def validate_codes(
+    payload: Annotated[list[CodeValidationItem], Body(min_length=1, max_length=MAX_VALIDATE_ITEMS)],
+    db: Session = Depends(get_read_db),
+) -> Response:
+    # One result per pair, in request order.
+    return json_bytes_response(code_validation_encoder.encode(codes_service.validate_codes(db, payload)))
@@ -1,7 +1,12 @@
 # backend/app/schemas/code.py
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict, Field, StrictBool
+from pydantic import BaseModel, ConfigDict, Field, StrictBool, model_validator
+from pydantic_core import PydanticCustomError
+from typing_extensions import TypedDict
+
+from app.core.pagination import MAX_PAGE_LIMIT, SortOrder
+from app.core.serialization import RecordListEncoder
 
 class CodeBase(BaseModel):
     code: str = Field(..., min_length=1, max_length=64)
@@ -25,3 +30,116 @@ class CodeOut(BaseModel):
     code: str
     description: str | None
     is_active: bool
+
+
+class CodeRecord(TypedDict):
+    """Wire shape of `CodeOut` (same keys, same order) for the row fast path."""
+
+    id: int
+    category_id: int
+    code: str
+    description: str | None
+    is_active: bool
+
+
+code_list_encoder = RecordListEncoder(CodeRecord)
+
+
+class CodeListQuery(BaseModel):
+    """Query parameters of ``GET /categories/{id}/codes``; without ``limit`` every row is returned."""
+
+    model_config = ConfigDict(frozen=True)
+
+    limit: int | None = Field(None, ge=1, le=MAX_PAGE_LIMIT)
+    after: str | None = None
+    is_active: bool | None = None
+    code_prefix: str | None = Field(None, max_length=64)
+    order: SortOrder = "asc"
+
+
+class CodeBulkError(BaseModel):
+    index: int
+    code: str
+    error: str
+    message: str
+
+
+class CodeBulkResult(BaseModel):
+    created: list[CodeOut]
+    errors: list[CodeBulkError]
+
+
+# Upper bound on ``ids`` in one status update; one bound parameter each.
+MAX_STATUS_IDS = 5000
+
+
+class CodeStatusUpdate(BaseModel):
+    """Body of ``POST /codes:status``: the codes to switch, by id or by category."""
+
+    is_active: StrictBool
+    ids: list[int] | None = Field(None, min_length=1, max_length=MAX_STATUS_IDS)
+    category_id: int | None = None
+    # Only with ``category_id``: restrict to codes starting with this prefix.
+    code_prefix: str | None = Field(None, min_length=1, max_length=64)
+
+    # Custom error type, so the error carries no exception object the 422 envelope can't serialize.
+    @model_validator(mode="after")
+    def _one_target(self) -> CodeStatusUpdate:
+        if (self.ids is None) == (self.category_id is None):
+            raise PydanticCustomError("status_target", "Give either ids or category_id.")
+        if self.code_prefix is not None and self.category_id is None:
+            raise PydanticCustomError("status_target", "code_prefix needs category_id.")
+        return self
+
+
+class CodeStatusResult(BaseModel):
+    # Codes whose status actually changed; codes already in the target state are not counted.
+    updated: int
+
+
+# Upper bound on the pairs in one ``POST /codes:validate``.
+MAX_VALIDATE_ITEMS = 10_000
+
+
+class CodeValidationItem(BaseModel):
+    """One ``(category, code)`` pair to check; the category by id or by name."""
+
+    category_id: int | None = None
+    category: str | None = Field(None, min_length=1, max_length=120)
+    code: str = Field(..., min_length=1, max_length=64)
+
+    @model_validator(mode="after")
+    def _one_category(self) -> CodeValidationItem:
+        if (self.category_id is None) == (self.category is None):
+            raise PydanticCustomError("validation_target", "Give either category_id or category.")
+        return self
+
+
+class CodeValidationOut(BaseModel):
+    valid: bool
+    # The resolved category; null when it does not exist.
+    category_id: int | None
+    code_id: int | None
+    # unknown_category, inactive_category or unknown_code (no active code of that value).
+    error: str | None
+
+
+class CodeValidationRecord(TypedDict):
+    """Wire shape of `CodeValidationOut`."""
+
+    valid: bool
+    category_id: int | None
+    code_id: int | None
+    error: str | None
+
+
+code_validation_encoder = RecordListEncoder(CodeValidationRecord)
+
+
+class CodeSearchQuery(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    q: str = Field(..., min_length=1, max_length=200)
+    category_id: int | None = None
+    is_active: bool | None = None
+    limit: int = Field(20, ge=1, le=100)
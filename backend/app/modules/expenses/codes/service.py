@@ -1,28 +1,135 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Row
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.errors import DatabaseError, NotFoundError
-from app.db.models import ExpenseCode
+from app.core.errors import DatabaseError, NotFoundError, ValidationError
+from app.db.hooks import on_commit
 
+from ..categories.service import category_not_found_error
+from ..changes import codes_changed
+from ..code_index import CodeIndexSnapshot, active_code_index
 from . import repo as codes_repo
-from .schemas import CodeUpdate
+from .schemas import (
+    CodeSearchQuery,
+    CodeStatusResult,
+    CodeStatusUpdate,
+    CodeUpdate,
+    CodeValidationItem,
+    CodeValidationRecord,
+)
+
 
+def code_not_found_error() -> NotFoundError:
+    return NotFoundError("not_found", "Expense code not found.")
 
-def update_code(db: Session, code_id: int, payload: CodeUpdate) -> ExpenseCode:
-    obj = codes_repo.get(db, code_id)
-    if obj is None:
-        raise NotFoundError("not_found", "Expense code not found.")
 
+def code_update_values(payload: CodeUpdate) -> dict[str, Any]:
+    values: dict[str, Any] = {}
     if payload.description is not None:
-        obj.description = payload.description
+        values["description"] = payload.description
     if payload.is_active is not None:
-        obj.is_active = payload.is_active
+        values["is_active"] = payload.is_active
+    return values
+
+
+def fts_query(raw: str) -> str:
+    """Turn user input into a safe FTS5 query: every word becomes a quoted prefix term.
+
+    ``air trav`` -> ``"air"* "trav"*`` (implicit AND). Quoting neutralises FTS5 operators
+    and syntax characters typed by the user.
+    """
+
+    terms = [word.replace('"', '""') for word in raw.split()]
+    terms = [term for term in terms if term.strip('"')]
+    if not terms:
+        raise ValidationError("empty_query", "Search query must not be empty.")
+    return " ".join(f'"{term}"*' for term in terms)
 
+
+def search_match(db_dialect: str, query: CodeSearchQuery) -> str:
+    return fts_query(query.q) if db_dialect == "sqlite" else query.q.strip()
+
+
+def search_codes(db: Session, query: CodeSearchQuery) -> list[Any]:
+    return codes_repo.search(
+        db,
+        search_match(db.get_bind().dialect.name, query),
+        category_id=query.category_id,
+        is_active=query.is_active,
+        limit=query.limit,
+    )
+
+
+def update_code(db: Session, code_id: int, payload: CodeUpdate) -> Row[Any]:
+    values = code_update_values(payload)
     try:
-        db.flush()
+        row = codes_repo.update_by_id(db, code_id, values)
     except SQLAlchemyError:
         raise DatabaseError("db_error", "Database error.")
+    if row is None:
+        raise code_not_found_error()
+
+    if values:
+        on_commit(db, partial(codes_changed, row.category_id, "code.updated", row))
+    return row
+
+
+def codes_status_changed(db: Session | AsyncSession, category_ids: Iterable[int]) -> None:
+    for category_id in set(category_ids):
+        on_commit(db, partial(codes_changed, category_id))
+
+
+def set_codes_status(db: Session, payload: CodeStatusUpdate) -> CodeStatusResult:
+    """Switch many codes on or off with one ``UPDATE``; no code is loaded."""
+
+    if payload.ids is not None:
+        category_ids = codes_repo.set_status_by_ids(db, payload.ids, payload.is_active)
+        codes_status_changed(db, category_ids)
+        return CodeStatusResult(updated=len(category_ids))
+
+    assert payload.category_id is not None
+    updated = codes_repo.set_status_by_category(
+        db, payload.category_id, payload.is_active, code_prefix=payload.code_prefix
+    )
+    if not updated and not codes_repo.category_exists(db, payload.category_id):
+        raise category_not_found_error()
+    codes_status_changed(db, [payload.category_id] if updated else [])
+    return CodeStatusResult(updated=updated)
+
+
+_NO_CODES: dict[str, int] = {}
+
+
+def check_codes(index: CodeIndexSnapshot, items: list[CodeValidationItem]) -> list[CodeValidationRecord]:
+    """Answer every pair from ``index`` (shared by the async service): two dict lookups each."""
+
+    categories, category_ids, codes = index.categories, index.category_ids, index.codes
+    results: list[CodeValidationRecord] = []
+    append = results.append
+    for item in items:
+        category_id = item.category_id
+        if category_id is None:
+            category_id = category_ids.get(item.category.strip())
+        category_active = categories.get(category_id)
+        if category_active is None:
+            append({"valid": False, "category_id": None, "code_id": None, "error": "unknown_category"})
+        elif not category_active:
+            append({"valid": False, "category_id": category_id, "code_id": None, "error": "inactive_category"})
+        else:
+            code_id = codes.get(category_id, _NO_CODES).get(item.code.strip())
+            if code_id is None:
+                append({"valid": False, "category_id": category_id, "code_id": None, "error": "unknown_code"})
+            else:
+                append({"valid": True, "category_id": category_id, "code_id": code_id, "error": None})
+    return results
+
 
-    return obj
+def validate_codes(db: Session, items: list[CodeValidationItem]) -> list[CodeValidationRecord]:
+    return check_codes(active_code_index.snapshot(db), items)
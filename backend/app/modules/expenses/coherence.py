@@ -0,0 +1,170 @@
+"""Cross-process cache coherence for multi-worker deployments.
+
+Each worker keeps serving lists from its own caches (`cache`), and ETags from the revisions
+it has read (`changes`). Writes made by this process invalidate them on commit; writes
+made by *other* processes are found by a `CatalogWatcher`:
+
+1. At most once per interval, and only when a cached read route is requested, it reads
+   ``PRAGMA data_version`` on a dedicated connection. SQLite changes that number whenever
+   another connection commits, and reading it costs a few microseconds, with no I/O.
+2. Only when it moved does the watcher look at what changed: the ``revision`` indexes give
+   the categories and code lists written since the last check (cost grows with the change,
+   not the catalog), and exactly those are invalidated and published as change events.
+   While `/events` has subscribers, `watch_catalog` keeps checking without read traffic.
+
+Staleness bound: a write committed by another worker shows up in this worker's responses
+within one interval (`CACHE_COHERENCE_INTERVAL_MS`) plus one check, normally well under a
+millisecond. Databases other than SQLite have no ``data_version``; there every check
+compares the latest revision instead (two index lookups).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Connection, Engine, exists, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.revisions import LATEST_REVISION
+from app.db.session import read_engine
+
+from .changes import catalog_events, catalog_replaced, external_changes
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogWatcher:
+    """Finds catalog writes committed by other processes and invalidates what they touched.
+
+    A write made by this process is seen once more here, which costs one extra cache miss
+    for the lists it touched and one generic change event; it never causes a stale read.
+    """
+
+    def __init__(self, db_engine: Engine, *, interval_seconds: float) -> None:
+        self._engine = db_engine
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._connection: Connection | None = None
+        self._data_version: int | None = None
+        self._revision: int | None = None
+        self._next_check = 0.0
+        self.checks = 0
+        self.syncs = 0
+
+    def due(self) -> bool:
+        return time.monotonic() >= self._next_check
+
+    def check(self) -> None:
+        """Invalidate whatever other processes changed since the last check (if one is due)."""
+
+        if not self.due() or not self._lock.acquire(blocking=False):
+            # Not due, or another thread is checking right now: serve from the caches.
+            return
+        try:
+            self._next_check = time.monotonic() + self.interval_seconds
+            self.checks += 1
+            self._sync()
+        except SQLAlchemyError:
+            logger.warning("cache coherence check failed; retrying on the next request", exc_info=True)
+            self._close_connection()
+        finally:
+            self._lock.release()
+
+    async def check_async(self) -> None:
+        # The threadpool hop is only paid when a check is due.
+        if self.due():
+            await run_in_threadpool(self.check)
+
+    def prime(self) -> None:
+        """Take the baseline; call before anything is cached (start-up)."""
+
+        with self._lock:
+            self._revision = None
+            self._data_version = None
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_connection()
+
+    def _sync(self) -> None:
+        if self._connection is None:
+            self._connection = self._engine.connect()
+        connection = self._connection
+        try:
+            self._sync_on(connection)
+        finally:
+            # End the (read) transaction each check, so no snapshot is held between checks.
+            connection.rollback()
+
+    def _sync_on(self, connection: Connection) -> None:
+        if connection.dialect.name == "sqlite":
+            data_version = connection.exec_driver_sql("PRAGMA data_version").scalar_one()
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+
+        # Writes that commit while this runs have revisions above `latest`; if they are
+        # (partly) seen now, the next check simply invalidates their lists once more.
+        latest = connection.execute(LATEST_REVISION).scalar_one()
+        last = self._revision
+        if last is None or latest < last:
+            if last is not None:
+                logger.warning("catalog revision went back (%d -> %d); dropping all caches", last, latest)
+            # No baseline yet (or a replaced database): nothing cached can be vouched for.
+            catalog_replaced()
+        elif latest > last:
+            categories = connection.execute(select(exists().where(ExpenseCategory.revision > last))).scalar()
+            category_ids = (
+                connection.execute(select(ExpenseCode.category_id).where(ExpenseCode.revision > last).distinct())
+                .scalars()
+                .all()
+            )
+            external_changes(categories=bool(categories), category_ids=category_ids)
+            self.syncs += 1
+        self._revision = latest
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._data_version = None
+
+
+# Poll floor for `watch_catalog`, which matters when checks run on every request (interval 0).
+WATCH_MIN_INTERVAL_SECONDS = 0.1
+
+
+# Watches the database the read routes are served from.
+catalog_watcher = CatalogWatcher(read_engine, interval_seconds=settings.cache_coherence_interval_ms / 1000)
+
+
+async def sync_catalog() -> None:
+    """Dependency of the cached read routes, sync and async alike.
+
+    ``async def`` so that it runs on the event loop: the common case (no check due) costs one
+    clock read, and the threadpool is only used when a check runs.
+    """
+
+    if settings.cache_coherence:
+        await catalog_watcher.check_async()
+
+
+async def watch_catalog() -> None:
+    """Background task: keep checking while `/events` has subscribers.
+
+    The read routes only check when they are requested, so without this a worker that only
+    holds event streams would never hear about other workers' writes.
+    """
+
+    interval = max(catalog_watcher.interval_seconds, WATCH_MIN_INTERVAL_SECONDS)
+    while True:
+        await asyncio.sleep(interval)
+        if catalog_events.subscribers:
+            await catalog_watcher.check_async()
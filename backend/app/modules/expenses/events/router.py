@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+from ..changes import catalog_events
+
+router = APIRouter(tags=["events"])
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx-style proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(last_event_id: str | None = Header(None)) -> StreamingResponse:
+    """Server-sent catalog change events (see "Change events" in the README).
+
+    ``async def`` on purpose: an idle stream is a parked coroutine, not a threadpool worker.
+    """
+
+    subscription = catalog_events.subscribe(last_event_id)
+    return StreamingResponse(
+        catalog_events.stream(subscription, keepalive_seconds=settings.events_keepalive_seconds),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
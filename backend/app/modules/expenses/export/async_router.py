@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import agzip_stream
+from app.core.config import settings
+from app.db.session import get_async_read_session_factory
+
+from . import service as export_service
+from .router import compress_export, export_headers
+
+router = APIRouter(tags=["export"])
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_catalog(
+    request: Request,
+    format: export_service.ExportFormat = Query("ndjson"),
+    session_factory: Callable[[], AsyncSession] = Depends(get_async_read_session_factory),
+) -> StreamingResponse:
+    chunks = export_service.aiter_catalog_export(session_factory, format)
+    gzipped = compress_export(request)
+    return StreamingResponse(
+        agzip_stream(chunks, level=settings.gzip_level) if gzipped else chunks,
+        media_type=export_service.MEDIA_TYPES[format],
+        headers=export_headers(format, gzipped=gzipped),
+    )
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from sqlalchemy import Select, select
+
+from app.db.models import ExpenseCategory, ExpenseCode
+
+
+def export_stmt() -> Select:
+    """Every category with its codes as flat rows, in (category id, code id) order.
+
+    One statement is one consistent snapshot. The outer join walks the category PK and
+    probes ``ix_expense_codes_category_id`` (which carries the rowid), so rows come out
+    already ordered: no temp B-tree, nothing materialised before the first row.
+    """
+
+    return (
+        select(
+            ExpenseCategory.id.label("category_id"),
+            ExpenseCategory.name.label("category_name"),
+            ExpenseCategory.is_active.label("category_is_active"),
+            ExpenseCode.id.label("code_id"),
+            ExpenseCode.code,
+            ExpenseCode.description,
+            ExpenseCode.is_active.label("code_is_active"),
+        )
+        .outerjoin(ExpenseCode, ExpenseCode.category_id == ExpenseCategory.id)
+        .order_by(ExpenseCategory.id, ExpenseCode.id)
+    )
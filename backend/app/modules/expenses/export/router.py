@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.compression import accepts_gzip, gzip_stream
+from app.core.config import settings
+from app.db.session import get_read_session_factory
+
+from . import service as export_service
+
+router = APIRouter(tags=["export"])
+
+
+def compress_export(request: Request) -> bool:
+    return settings.gzip_level > 0 and accepts_gzip(request.headers.get("accept-encoding"))
+
+
+def export_headers(fmt: export_service.ExportFormat, *, gzipped: bool) -> dict[str, str]:
+    headers = {"Content-Disposition": f'attachment; filename="expense-catalog.{fmt}"', "Vary": "Accept-Encoding"}
+    if gzipped:
+        # Compressed here, flushed per chunk; `GZipMiddleware` would buffer the stream instead,
+        # and leaves responses that already carry `Content-Encoding` alone.
+        headers["Content-Encoding"] = "gzip"
+    return headers
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_catalog(
+    request: Request,
+    format: export_service.ExportFormat = Query("ndjson"),
+    session_factory: Callable[[], Session] = Depends(get_read_session_factory),
+) -> StreamingResponse:
+    chunks = export_service.iter_catalog_export(session_factory, format)
+    gzipped = compress_export(request)
+    return StreamingResponse(
+        gzip_stream(chunks, level=settings.gzip_level) if gzipped else chunks,
+        media_type=export_service.MEDIA_TYPES[format],
+        headers=export_headers(format, gzipped=gzipped),
+    )
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from typing import Any, Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .repo import export_stmt
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows fetched per server-side cursor round trip; also the size of each streamed chunk.
+EXPORT_CHUNK_ROWS = 1000
+
+CSV_COLUMNS = (
+    "category_id",
+    "category_name",
+    "category_is_active",
+    "code_id",
+    "code",
+    "description",
+    "code_is_active",
+)
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class _NdjsonEncoder:
+    """One ``category`` line when a new category starts, then one ``code`` line per code."""
+
+    def __init__(self) -> None:
+        self._last_category_id: int | None = None
+        self._dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def header(self) -> str:
+        # NDJSON has no header line: its first bytes are the first chunk's lines.
+        return ""
+
+    def encode(self, rows: Sequence[Any]) -> str:
+        dumps = self._dumps
+        lines: list[str] = []
+        for row in rows:
+            if row.category_id != self._last_category_id:
+                self._last_category_id = row.category_id
+                lines.append(
+                    dumps(
+                        {
+                            "type": "category",
+                            "id": row.category_id,
+                            "name": row.category_name,
+                            "is_active": row.category_is_active,
+                        }
+                    )
+                )
+            if row.code_id is not None:
+                lines.append(
+                    dumps(
+                        {
+                            "type": "code",
+                            "id": row.code_id,
+                            "category_id": row.category_id,
+                            "code": row.code,
+                            "description": row.description,
+                            "is_active": row.code_is_active,
+                        }
+                    )
+                )
+        lines.append("")
+        return "\n".join(lines)
+
+
+class _CsvEncoder:
+    """Flat rows; a category without codes is a single row with empty code columns."""
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def _flush(self) -> str:
+        chunk = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+    def header(self) -> str:
+        self._writer.writerow(CSV_COLUMNS)
+        return self._flush()
+
+    def encode(self, rows: Sequence[Any]) -> str:
+        self._writer.writerows(rows)
+        return self._flush()
+
+
+def _encoder(fmt: ExportFormat) -> _NdjsonEncoder | _CsvEncoder:
+    return _NdjsonEncoder() if fmt == "ndjson" else _CsvEncoder()
+
+
+def _stream(encoder: _NdjsonEncoder | _CsvEncoder, partitions: Iterable[Sequence[Any]]) -> Iterator[str]:
+    for rows in partitions:
+        yield encoder.encode(rows)
+
+
+def iter_catalog_export(
+    session_factory: Callable[[], Session],
+    fmt: ExportFormat,
+    *,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Stream the catalog; memory stays bounded by ``chunk_rows`` whatever the catalog size.
+
+    The generator owns its session: it outlives the request dependencies and is closed
+    when the response finishes (or the client disconnects).
+    """
+
+    encoder = _encoder(fmt)
+    # CSV sends its header row before the query runs, so those clients see bytes at once.
+    yield encoder.header()
+
+    with session_factory() as db, db.begin():
+        result = db.execute(export_stmt(), execution_options={"yield_per": chunk_rows})
+        yield from _stream(encoder, result.partitions())
+
+
+async def aiter_catalog_export(
+    session_factory: Callable[[], AsyncSession],
+    fmt: ExportFormat,
+    *,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> AsyncIterator[str]:
+    encoder = _encoder(fmt)
+    yield encoder.header()
+
+    async with session_factory() as db, db.begin():
+        result = await db.stream(export_stmt(), execution_options={"yield_per": chunk_rows})
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
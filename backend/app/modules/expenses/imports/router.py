@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import io
+from collections.abc import Callable
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.streams import RequestBodyReader
+from app.db.session import get_session_factory
+
+from . import service as import_service
+from .schemas import ImportResult, RejectedRowOut
+
+router = APIRouter(tags=["import"])
+
+MAX_REPORTED_REJECTIONS = 1000
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_catalog(
+    request: Request,
+    format: import_service.ImportFormat = Query("csv"),
+    batch_size: int = Query(import_service.IMPORT_BATCH_SIZE, ge=1, le=import_service.MAX_IMPORT_BATCH_SIZE),
+    commit_every: int = Query(import_service.IMPORT_COMMIT_EVERY, ge=1),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> ImportResult:
+    """Import a CSV / NDJSON request body (send the file as the raw body, not multipart)."""
+
+    rejected: list[RejectedRowOut] = []
+
+    def on_reject(row: import_service.RejectedRow) -> None:
+        if len(rejected) < MAX_REPORTED_REJECTIONS:
+            rejected.append(RejectedRowOut(line=row.line, reason=row.reason, data=row.data))
+
+    def run() -> import_service.ImportReport:
+        # Rows are parsed and batched as the body arrives, not after it was received in full.
+        body = io.BufferedReader(RequestBodyReader(request.stream()))
+        stream = io.TextIOWrapper(body, encoding="utf-8-sig", newline="")
+        return import_service.import_catalog(
+            session_factory,
+            import_service.READERS[format](stream),
+            batch_size=batch_size,
+            commit_every=commit_every,
+            on_reject=on_reject,
+        )
+
+    # Parsing and DB writes are blocking: keep them off the event loop.
+    report = await run_in_threadpool(run)
+
+    return ImportResult(
+        **asdict(report),
+        rejected_rows=rejected,
+        rejected_rows_truncated=report.rejected > len(rejected),
+    )
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class RejectedRowOut(BaseModel):
+    line: int
+    reason: str
+    data: Any
+
+
+class ImportResult(BaseModel):
+    rows_read: int
+    categories_created: int
+    codes_created: int
+    rejected: int
+    commits: int
+    # At most `MAX_REPORTED_REJECTIONS`; use the CLI for a complete rejected-rows file.
+    rejected_rows: list[RejectedRowOut]
+    rejected_rows_truncated: bool
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Literal, TextIO
+
+from sqlalchemy.orm import Session
+
+from app.core.errors import ValidationError
+from app.db.hooks import on_commit
+
+from ..categories import repo as categories_repo
+from ..changes import categories_changed, codes_changed
+from ..codes import repo as codes_repo
+
+ImportFormat = Literal["csv", "ndjson"]
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_COMMIT_EVERY = 50_000
+# Codes buffered in memory before a flush; SQLAlchemy pages each flush into
+# multi-row statements that respect the driver's bound-parameter limit.
+MAX_IMPORT_BATCH_SIZE = 5000
+
+MAX_CATEGORY_NAME_LEN = 120
+MAX_CODE_LEN = 64
+
+# Column aliases, so a `GET /export?format=csv` file can be imported as-is.
+_ALIASES = {
+    "category_name": "category",
+    "code_is_active": "is_active",
+}
+_TRUE = {"1", "true", "yes", "y", "t"}
+_FALSE = {"0", "false", "no", "n", "f"}
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    category: str
+    category_is_active: bool
+    code: str | None
+    description: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class RejectedRow:
+    line: int
+    reason: str
+    data: Any
+
+
+@dataclass(slots=True)
+class ImportReport:
+    rows_read: int = 0
+    categories_created: int = 0
+    codes_created: int = 0
+    rejected: int = 0
+    commits: int = 0
+
+
+class RecordError(ValueError):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ImportBodyError(ValidationError):
+    """The body stopped parsing part-way; batches committed before that point stay stored."""
+
+    __slots__ = ("rows_committed",)
+
+    def __init__(self, code: str, message: str, *, rows_committed: int) -> None:
+        super().__init__(code, message)
+        self.rows_committed = rows_committed
+
+    def as_detail(self) -> dict[str, Any]:
+        return {**super().as_detail(), "rows_committed": self.rows_committed}
+
+
+# --- Readers: lazily yield (line number, raw record) ---
+
+
+def read_csv(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(stream: TextIO) -> Iterator[tuple[int, Any]]:
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except ValueError:
+            yield line_num, line.rstrip("\n")
+
+
+READERS: dict[str, Callable[[TextIO], Iterator[tuple[int, Any]]]] = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+def _parse_bool(value: Any, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise RecordError("invalid_boolean")
+
+
+def parse_record(raw: Any) -> ImportRecord:
+    if not isinstance(raw, dict):
+        raise RecordError("invalid_record")
+
+    data = {_ALIASES.get(key, key): value for key, value in raw.items() if key is not None}
+    if data.get("type") == "code":
+        # NDJSON export lines reference categories by id, which is meaningless in another DB.
+        raise RecordError("unsupported_record")
+
+    category = str(data.get("category") or data.get("name") or "").strip()
+    if not category:
+        raise RecordError("missing_category")
+    if len(category) > MAX_CATEGORY_NAME_LEN:
+        raise RecordError("category_too_long")
+
+    code = str(data.get("code") or "").strip() or None
+    if code is not None and len(code) > MAX_CODE_LEN:
+        raise RecordError("code_too_long")
+
+    description = data.get("description")
+    return ImportRecord(
+        category=category,
+        category_is_active=_parse_bool(data.get("category_is_active"), True),
+        code=code,
+        description=str(description) if description not in (None, "") else None,
+        is_active=_parse_bool(data.get("is_active"), True),
+    )
+
+
+# --- Import ---
+
+
+def import_catalog(
+    session_factory: Callable[[], Session],
+    rows: Iterable[tuple[int, Any]],
+    *,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    commit_every: int = IMPORT_COMMIT_EVERY,
+    on_reject: Callable[[RejectedRow], None] = lambda _row: None,
+    on_progress: Callable[[ImportReport], None] = lambda _report: None,
+) -> ImportReport:
+    """Load categories and codes from ``rows`` with set-based inserts.
+
+    Category names resolve through an in-memory map (one query up front, one
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` per new name). Codes are buffered and
+    written ``batch_size`` at a time with a multi-row insert that skips existing
+    ``(category_id, code)`` pairs; the transaction is committed every ``commit_every`` rows.
+    Rows that fail validation or already exist go to ``on_reject``. A body that cannot be
+    decoded or parsed raises ``ImportBodyError`` after rolling back the uncommitted batch.
+    """
+
+    batch_size = max(1, min(batch_size, MAX_IMPORT_BATCH_SIZE))
+    commit_every = max(1, commit_every)
+    report = ImportReport()
+    rows_committed = 0
+
+    with session_factory() as db:
+        category_ids = categories_repo.name_to_id(db)
+        pending: dict[tuple[int, str], tuple[int, Any, ImportRecord]] = {}
+        touched: set[int] = set()
+        categories_touched = False
+
+        def reject(line: int, reason: str, data: Any) -> None:
+            report.rejected += 1
+            on_reject(RejectedRow(line=line, reason=reason, data=data))
+
+        def flush_codes() -> None:
+            if not pending:
+                return
+            values = [
+                {
+                    "category_id": category_id,
+                    "code": code,
+                    "description": record.description,
+                    "is_active": record.is_active,
+                }
+                for (category_id, code), (_line, _raw, record) in pending.items()
+            ]
+            inserted = codes_repo.insert_many_skip_conflicts(db, values, batch_size=len(values))
+            created = {(row.category_id, row.code) for row in inserted}
+            for key, (line, raw, _record) in pending.items():
+                if key in created:
+                    touched.add(key[0])
+                else:
+                    reject(line, "duplicate_code", raw)
+            report.codes_created += len(inserted)
+            pending.clear()
+
+        def commit() -> None:
+            nonlocal categories_touched, rows_committed
+            flush_codes()
+            if categories_touched:
+                on_commit(db, categories_changed)
+            for category_id in touched:
+                on_commit(db, partial(codes_changed, category_id))
+            db.commit()
+            categories_touched = False
+            touched.clear()
+            rows_committed = report.rows_read
+            report.commits += 1
+            on_progress(report)
+
+        try:
+            for line, raw in rows:
+                report.rows_read += 1
+                try:
+                    record = parse_record(raw)
+                except RecordError as exc:
+                    reject(line, exc.reason, raw)
+                else:
+                    category_id = category_ids.get(record.category)
+                    if category_id is None:
+                        category_id, created = categories_repo.insert_or_get_id(
+                            db, name=record.category, is_active=record.category_is_active
+                        )
+                        category_ids[record.category] = category_id
+                        if created:
+                            report.categories_created += 1
+                            categories_touched = True
+
+                    if record.code is not None:
+                        key = (category_id, record.code)
+                        if key in pending:
+                            reject(line, "duplicate_code", raw)
+                        else:
+                            pending[key] = (line, raw, record)
+                            if len(pending) >= batch_size:
+                                flush_codes()
+
+                if report.rows_read % commit_every == 0:
+                    commit()
+        except UnicodeDecodeError as exc:
+            db.rollback()
+            raise ImportBodyError(
+                "invalid_encoding",
+                f"Body is not valid UTF-8 after row {report.rows_read}; "
+                f"{rows_committed} rows were committed before it.",
+                rows_committed=rows_committed,
+            ) from exc
+        except csv.Error as exc:
+            db.rollback()
+            raise ImportBodyError(
+                "malformed_csv",
+                f"Malformed CSV after row {report.rows_read} ({exc}); "
+                f"{rows_committed} rows were committed before it.",
+                rows_committed=rows_committed,
+            ) from exc
+
+        commit()
+
+    return report
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+from app.core.compression import EncodedBody, encode_body, encoded_response
+from app.core.config import settings
+from app.core.etag import gzip_etag, set_etag
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+from .cache import payload_cache
+
+
+@dataclass(frozen=True, slots=True)
+class Payload:
+    """A finished list / catalog response: encoded body plus its paging header."""
+
+    body: EncodedBody
+    next_cursor: str | None = None
+
+
+def build_payload(body: bytes, next_cursor: str | None = None) -> Payload:
+    return Payload(
+        encode_body(body, minimum_size=settings.gzip_minimum_size, level=settings.gzip_level),
+        next_cursor,
+    )
+
+
+def cached_payload(key: tuple[Hashable, ...], load: Callable[[], Payload]) -> Payload:
+    """The payload under ``key``; on a miss ``load`` queries, serializes and compresses it once."""
+
+    payload = payload_cache.get(key)
+    if payload is None:
+        generation = payload_cache.generation
+        payload = load()
+        payload_cache.set(key, payload, generation=generation)
+    return payload
+
+
+async def cached_payload_async(key: tuple[Hashable, ...], load: Callable[[], Awaitable[Payload]]) -> Payload:
+    payload = payload_cache.get(key)
+    if payload is None:
+        generation = payload_cache.generation
+        payload = await load()
+        payload_cache.set(key, payload, generation=generation)
+    return payload
+
+
+def payload_response(request: Request, payload: Payload, etag: str) -> Response:
+    response = encoded_response(payload.body, request.headers.get("accept-encoding"))
+    # The gzip bytes are a different representation: they get their own strong tag.
+    set_etag(response, gzip_etag(etag) if "content-encoding" in response.headers else etag)
+    if payload.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = payload.next_cursor
+    return response
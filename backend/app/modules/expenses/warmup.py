@@ -0,0 +1,40 @@
+"""Start-up warm-up for the hot read paths.
+
+Runs each list / search statement once against the real database before the first request,
+so the SQLAlchemy compiled-statement cache, mapper configuration and SQLite's schema parse
+are paid during start-up instead of by the first users. Every statement selects (at most)
+one row and bypasses the read cache, so nothing is cached that a request could observe.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .categories import async_repo as categories_async_repo
+from .categories import repo as categories_repo
+from .codes import async_repo as codes_async_repo
+from .codes import repo as codes_repo
+from .codes.service import fts_query
+
+# Matches nothing: warm-up only needs the statements compiled and planned.
+_NO_CATEGORY = 0
+_SEARCH_PROBE = "warmup"
+
+
+def _search_match(dialect_name: str) -> str:
+    return fts_query(_SEARCH_PROBE) if dialect_name == "sqlite" else _SEARCH_PROBE
+
+
+def warm_up(db: Session) -> None:
+    categories_repo.list(db, limit=1)
+    codes_repo.list_by_category(db, _NO_CATEGORY, limit=1)
+    categories_repo.get(db, _NO_CATEGORY)
+    codes_repo.search(db, _search_match(db.get_bind().dialect.name), limit=1)
+
+
+async def warm_up_async(db: AsyncSession) -> None:
+    await categories_async_repo.list(db, limit=1)
+    await codes_async_repo.list_by_category(db, _NO_CATEGORY, limit=1)
+    await categories_async_repo.get(db, _NO_CATEGORY)
+    await codes_async_repo.search(db, _search_match(db.get_bind().dialect.name), limit=1)
@@ -0,0 +1,486 @@
+"""Latency / throughput benchmark of the expense API.
+
+Drives the real ``create_app()`` either in-process through httpx's ASGI transport
+(``--target asgi``: no network, measures the app itself) or over HTTP against a uvicorn
+subprocess (``--target uvicorn``: includes the server and socket stack). Every scenario runs
+at each dataset size (number of codes) and concurrency level, against a fresh clone of a
+synthetic dataset (`app.db.synthetic`, cached under ``--snapshot-dir``), and reports
+p50 / p95 / p99 latency and throughput.
+
+    cd backend
+    python -m benchmarks.api --sizes 1000,20000 --concurrency 1,16 --output bench.json
+    python -m benchmarks.api --baseline benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks.api --save-baseline benchmarks/baseline.json
+
+With ``--baseline`` the run fails (exit status 1) when a scenario's p95 grows, or its
+throughput drops, by more than ``--threshold`` relative to the stored result. Baselines are
+machine-specific: regenerate them on the machine that gates deploys.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import build_engine
+from app.db.synthetic import WORDS, SyntheticSpec, ensure_snapshot, restore_snapshot
+
+TARGETS = ("asgi", "uvicorn")
+# Average category size; actual sizes are Zipf-skewed (see `app.db.synthetic`).
+CODES_PER_CATEGORY = 100
+SEARCH_TERMS = tuple(word[:4] for word in WORDS[:20])
+# Generated datasets are kept here and cloned for every run.
+SNAPSHOT_DIR = Path(tempfile.gettempdir()) / "expense-api-bench"
+
+
+@dataclass(frozen=True, slots=True)
+class Dataset:
+    size: int
+    categories: int
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    method: str
+    url: str
+    json: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    # Builds request ``i`` of a run; must be deterministic for a given (dataset, i).
+    build: Callable[[Dataset, int, random.Random], Call]
+    # Share of ``--requests`` this scenario runs (whole-catalog reads are much heavier).
+    weight: float = 1.0
+
+
+def _category(dataset: Dataset, rng: random.Random) -> int:
+    return rng.randint(1, dataset.categories)
+
+
+SCENARIOS = (
+    Scenario("list_categories", lambda d, i, rng: Call("GET", "/categories?limit=100")),
+    Scenario("list_codes", lambda d, i, rng: Call("GET", f"/categories/{_category(d, rng)}/codes?limit=50")),
+    Scenario("search_codes", lambda d, i, rng: Call("GET", f"/codes/search?q={rng.choice(SEARCH_TERMS)}")),
+    Scenario(
+        "create_code",
+        lambda d, i, rng: Call("POST", f"/categories/{_category(d, rng)}/codes", {"code": f"NEW-{i}-{rng.random()}"}),
+    ),
+    Scenario(
+        "update_code",
+        lambda d, i, rng: Call("PUT", f"/codes/{rng.randint(1, d.size)}", {"description": f"updated {i}"}),
+    ),
+    Scenario(
+        "bulk_codes",
+        lambda d, i, rng: Call(
+            "POST",
+            f"/categories/{_category(d, rng)}/codes:bulk",
+            [{"code": f"BULK-{i}-{j}-{rng.random()}"} for j in range(100)],
+        ),
+        weight=0.2,
+    ),
+    Scenario("catalog", lambda d, i, rng: Call("GET", "/catalog"), weight=0.05),
+    Scenario("export_ndjson", lambda d, i, rng: Call("GET", "/export?format=ndjson"), weight=0.05),
+)
+
+
+@dataclass(slots=True)
+class Result:
+    target: str
+    scenario: str
+    size: int
+    concurrency: int
+    requests: int
+    errors: int
+    seconds: float
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    @property
+    def key(self) -> tuple[str, str, int, int]:
+        return (self.target, self.scenario, self.size, self.concurrency)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (``q`` in 0..100) of already sorted values."""
+
+    if not sorted_values:
+        return math.nan
+    rank = (len(sorted_values) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+# --- Dataset ---
+
+
+def dataset_spec(size: int) -> SyntheticSpec:
+    return SyntheticSpec(categories=max(1, math.ceil(size / CODES_PER_CATEGORY)), codes=size, seed=size)
+
+
+def seed_database(path: Path, size: int, snapshot_dir: Path = SNAPSHOT_DIR) -> Dataset:
+    """Clone the synthetic snapshot for ``size`` codes (generated on first use) to ``path``."""
+
+    spec = dataset_spec(size)
+    restore_snapshot(ensure_snapshot(spec, snapshot_dir), path)
+    return Dataset(size=size, categories=spec.categories)
+
+
+# --- Targets ---
+
+
+@asynccontextmanager
+async def asgi_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """``create_app()`` with its DB dependencies pointed at ``url``; no lifespan, no network."""
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.session import (
+        build_async_engine,
+        get_async_db,
+        get_async_read_db,
+        get_async_read_session_factory,
+        get_async_session_factory,
+        get_db,
+        get_read_db,
+        get_read_session_factory,
+        get_session_factory,
+        to_async_url,
+    )
+    from app.db.uow import AsyncUnitOfWork, UnitOfWork
+    from app.main import create_app
+    from app.modules.expenses.cache import caches
+    from app.modules.expenses.code_index import active_code_index
+    from app.modules.expenses.coherence import CatalogWatcher, sync_catalog
+
+    for cache in caches.values():
+        cache.clear()
+    active_code_index.clear()
+
+    engine = build_engine(url, settings)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    # Same per-request coherence cost as production, watching the benchmark database.
+    watcher = CatalogWatcher(engine, interval_seconds=settings.cache_coherence_interval_ms / 1000)
+    watcher.prime()
+
+    def override_get_db() -> Iterator[Session]:
+        with UnitOfWork(session_factory) as uow:
+            yield uow.session
+
+    def override_get_read_db() -> Iterator[Session]:
+        with UnitOfWork(session_factory, read_only=True) as uow:
+            yield uow.session
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    app.dependency_overrides[sync_catalog] = watcher.check_async
+
+    async_engine = None
+    if settings.db_async:
+        async_engine = build_async_engine(to_async_url(url), settings)
+        async_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncUnitOfWork(async_factory) as uow:
+                yield uow.session
+
+        async def override_get_async_read_db():
+            async with AsyncUnitOfWork(async_factory, read_only=True) as uow:
+                yield uow.session
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        app.dependency_overrides[get_async_read_db] = override_get_async_read_db
+        app.dependency_overrides[get_async_session_factory] = lambda: async_factory
+        app.dependency_overrides[get_async_read_session_factory] = lambda: async_factory
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+        ) as client:
+            yield client
+    finally:
+        if async_engine is not None:
+            await async_engine.dispose()
+        watcher.close()
+        engine.dispose()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """A uvicorn subprocess serving ``app.main:app`` on ``url``; waits for ``/health``."""
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "DATABASE_URL": url},
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None, limits=limits) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.1)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# --- Driver ---
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    calls: list[Call],
+    concurrency: int,
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    pending = iter(calls)
+
+    async def worker() -> None:
+        nonlocal errors
+        for call in pending:
+            start = time.perf_counter()
+            resp = await client.request(call.method, call.url, json=call.json)
+            await resp.aread()
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    target: str,
+    scenario: Scenario,
+    dataset: Dataset,
+    *,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+) -> Result:
+    count = max(concurrency, math.ceil(requests * scenario.weight))
+    rng = random.Random(f"{scenario.name}-{dataset.size}-{concurrency}")
+    calls = [scenario.build(dataset, i, rng) for i in range(warmup + count)]
+
+    if warmup:
+        await _drive(client, calls[:warmup], concurrency)
+    latencies, errors, seconds = await _drive(client, calls[warmup:], concurrency)
+
+    ms = sorted(value * 1000 for value in latencies)
+    return Result(
+        target=target,
+        scenario=scenario.name,
+        size=dataset.size,
+        concurrency=concurrency,
+        requests=len(ms),
+        errors=errors,
+        seconds=round(seconds, 4),
+        throughput_rps=round(len(ms) / seconds, 1),
+        mean_ms=round(sum(ms) / len(ms), 3),
+        p50_ms=round(percentile(ms, 50), 3),
+        p95_ms=round(percentile(ms, 95), 3),
+        p99_ms=round(percentile(ms, 99), 3),
+    )
+
+
+def run(
+    *,
+    target: str,
+    sizes: list[int],
+    concurrency: list[int],
+    requests: int,
+    warmup: int,
+    scenarios: list[Scenario],
+    snapshot_dir: Path = SNAPSHOT_DIR,
+) -> list[Result]:
+    make_client = asgi_client if target == "asgi" else uvicorn_client
+    results: list[Result] = []
+    for size in sizes:
+        for scenario in scenarios:
+            for level in concurrency:
+                # Fresh DB per run: writes from one scenario must not skew the next.
+                with tempfile.TemporaryDirectory() as tmp:
+                    path = Path(tmp) / "bench.db"
+                    dataset = seed_database(path, size, snapshot_dir)
+                    url = f"sqlite:///{path}"
+
+                    async def measure() -> Result:
+                        async with make_client(url) as client:
+                            return await run_scenario(
+                                client,
+                                target,
+                                scenario,
+                                dataset,
+                                concurrency=level,
+                                requests=requests,
+                                warmup=warmup,
+                            )
+
+                    result = asyncio.run(measure())
+                results.append(result)
+                print(_format_row(result), flush=True)
+    return results
+
+
+# --- Reporting / baseline ---
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    key: tuple[str, str, int, int]
+    metric: str
+    baseline: float
+    current: float
+
+
+def compare(current: list[Result], baseline: list[Result], threshold: float) -> list[Regression]:
+    """Scenarios whose p95 rose, or throughput fell, by more than ``threshold`` (0.25 = 25%)."""
+
+    by_key = {result.key: result for result in baseline}
+    regressions: list[Regression] = []
+    for result in current:
+        base = by_key.get(result.key)
+        if base is None:
+            continue
+        if result.p95_ms > base.p95_ms * (1 + threshold):
+            regressions.append(Regression(result.key, "p95_ms", base.p95_ms, result.p95_ms))
+        if result.throughput_rps < base.throughput_rps * (1 - threshold):
+            regressions.append(Regression(result.key, "throughput_rps", base.throughput_rps, result.throughput_rps))
+    return regressions
+
+
+def save_results(path: Path, results: list[Result]) -> None:
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "db_async": settings.db_async,
+        "results": [asdict(result) for result in results],
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> list[Result]:
+    return [Result(**row) for row in json.loads(path.read_text())["results"]]
+
+
+_HEADER = (
+    f"{'target':<9}{'scenario':<17}{'size':>8}{'conc':>6}{'reqs':>7}{'err':>5}"
+    f"{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+)
+
+
+def _format_row(r: Result) -> str:
+    return (
+        f"{r.target:<9}{r.scenario:<17}{r.size:>8}{r.concurrency:>6}{r.requests:>7}{r.errors:>5}"
+        f"{r.throughput_rps:>10.1f}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}"
+    )
+
+
+def _int_list(raw: str) -> list[int]:
+    return [int(part) for part in raw.split(",") if part]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=TARGETS, default="asgi")
+    parser.add_argument("--sizes", type=_int_list, default=[1_000, 20_000], help="codes per dataset")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 16])
+    parser.add_argument("--requests", type=int, default=200, help="requests per run (scaled by scenario weight)")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR, help="cache of generated datasets")
+    parser.add_argument("--scenarios", default="", help="comma-separated subset of: " + ",".join(s.name for s in SCENARIOS))
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a stored results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression (default 25%%)")
+    parser.add_argument("--save-baseline", type=Path, help="write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    names = {name for name in args.scenarios.split(",") if name}
+    unknown = names - {s.name for s in SCENARIOS}
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scenarios = [s for s in SCENARIOS if not names or s.name in names]
+    # `create_app()` configures INFO logging; one httpx line per request would drown the report.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(_HEADER)
+    results = run(
+        target=args.target,
+        sizes=args.sizes,
+        concurrency=args.concurrency,
+        requests=args.requests,
+        warmup=args.warmup,
+        scenarios=scenarios,
+        snapshot_dir=args.snapshot_dir,
+    )
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            save_results(path, results)
+
+    if args.baseline is None:
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.threshold)
+    for reg in regressions:
+        target, scenario, size, level = reg.key
+        print(
+            f"REGRESSION {target} {scenario} size={size} concurrency={level}: "
+            f"{reg.metric} {reg.baseline} -> {reg.current}",
+            file=sys.stderr,
+        )
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} of {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
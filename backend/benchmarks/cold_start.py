@@ -0,0 +1,141 @@
+"""Cold-start time: how long a process takes from launch until it can serve.
+
+Two measurements against a clone of a synthetic dataset (`app.db.synthetic`):
+
+- ``schema``: the start-up schema step alone, in-process with a fresh engine per run. The
+  ``legacy`` strategy is what start-up used to do (``create_all`` + search index backfill + an
+  "is it empty?" seed probe); ``bootstrap`` is `app.db.schema.bootstrap_schema` on an
+  already-versioned database.
+- ``process``: ``--workers`` uvicorn processes launched at the same time on one database,
+  timed until each answers ``GET /health``. This includes interpreter start and imports.
+
+    cd backend
+    python -m benchmarks.cold_start --size 20000 --runs 20 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+from sqlalchemy import Engine, select
+
+from app.core.config import settings
+from app.db.models import Base, ExpenseCategory
+from app.db.schema import bootstrap_schema
+from app.db.search import install_search_index
+from app.db.session import build_engine
+
+from .api import SNAPSHOT_DIR, _free_port, seed_database
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def legacy_startup(db_engine: Engine) -> None:
+    Base.metadata.create_all(bind=db_engine)
+    with db_engine.begin() as connection:
+        install_search_index(connection)
+    with db_engine.connect() as connection:
+        connection.execute(select(ExpenseCategory.id).limit(1)).first()
+
+
+def bootstrap_startup(db_engine: Engine) -> None:
+    bootstrap_schema(db_engine)
+
+
+STRATEGIES: dict[str, Callable[[Engine], None]] = {"legacy": legacy_startup, "bootstrap": bootstrap_startup}
+
+
+def measure_schema(url: str, runs: int) -> dict[str, list[float]]:
+    """Milliseconds per run of each strategy; every run gets a fresh engine (new connection)."""
+
+    # Stamp the version first, so `bootstrap` measures the steady-state check.
+    first = build_engine(url, settings)
+    bootstrap_schema(first)
+    first.dispose()
+
+    timings: dict[str, list[float]] = {name: [] for name in STRATEGIES}
+    for _ in range(runs):
+        for name, strategy in STRATEGIES.items():
+            db_engine = build_engine(url, settings)
+            started = time.perf_counter()
+            strategy(db_engine)
+            timings[name].append((time.perf_counter() - started) * 1000)
+            db_engine.dispose()
+    return timings
+
+
+def measure_processes(url: str, workers: int, timeout: float = 60.0) -> list[float]:
+    """Milliseconds from launch to the first ``/health`` 200, per uvicorn process."""
+
+    ports = [_free_port() for _ in range(workers)]
+    started = time.perf_counter()
+    servers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env={**os.environ, "DATABASE_URL": url},
+            cwd=BACKEND_DIR,
+        )
+        for port in ports
+    ]
+    ready: dict[int, float] = {}
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while len(ready) < workers:
+                for port, server in zip(ports, servers):
+                    if port in ready:
+                        continue
+                    if server.poll() is not None:
+                        raise RuntimeError(f"uvicorn on port {port} exited with {server.returncode}")
+                    try:
+                        if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                            ready[port] = (time.perf_counter() - started) * 1000
+                    except httpx.TransportError:
+                        pass
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.005)
+    finally:
+        for server in servers:
+            server.terminate()
+        for server in servers:
+            server.wait(timeout=10)
+    return [ready[port] for port in ports]
+
+
+def _summary(values: list[float]) -> str:
+    return f"median {statistics.median(values):8.2f} ms  max {max(values):8.2f} ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20_000, help="codes in the dataset")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn processes started together; 0 skips")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR, help="cache of generated datasets")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cold-start.db"
+        seed_database(path, args.size, args.snapshot_dir)
+        url = f"sqlite:///{path}"
+
+        for name, values in measure_schema(url, args.runs).items():
+            print(f"schema  {name:<10} {_summary(values)}")
+        if args.workers:
+            print(f"process x{args.workers:<8} {_summary(measure_processes(url, args.workers))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""Compare read/write throughput of the SQLite tuning profiles.
+
+Runs the same mixed workload (writer threads inserting codes one commit at a time,
+reader threads listing a page of codes) against a fresh file DB per profile.
+
+    cd backend
+    python -m benchmarks.sqlite_profile --seconds 5 --writers 4 --readers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.db.session import build_engine
+
+PROFILES = ("legacy", "production")
+
+
+@dataclass
+class Result:
+    profile: str
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def _run(profile: str, *, seconds: float, writers: int, readers: int, preload: int) -> Result:
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = replace(settings, sqlite_profile=profile, db_pool_size=writers + readers, db_max_overflow=0)
+        engine = build_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", cfg)
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as db:
+            category = ExpenseCategory(name="Bench", is_active=True)
+            db.add(category)
+            db.flush()
+            category_id = category.id
+            db.execute(
+                insert(ExpenseCode),
+                [{"category_id": category_id, "code": f"SEED{i}", "is_active": True} for i in range(preload)],
+            )
+            db.commit()
+
+        result = Result(profile)
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def writer(n: int) -> None:
+            i = 0
+            while not stop.is_set():
+                try:
+                    with Session(engine) as db:
+                        db.execute(
+                            insert(ExpenseCode).values(
+                                category_id=category_id, code=f"W{n}-{i}", description="bench", is_active=True
+                            )
+                        )
+                        db.commit()
+                    with lock:
+                        result.writes += 1
+                except OperationalError:
+                    with lock:
+                        result.errors += 1
+                i += 1
+
+        def reader() -> None:
+            stmt = select(ExpenseCode).where(ExpenseCode.category_id == category_id).order_by(ExpenseCode.id).limit(100)
+            while not stop.is_set():
+                try:
+                    with Session(engine) as db:
+                        db.execute(stmt).scalars().all()
+                    with lock:
+                        result.reads += 1
+                except OperationalError:
+                    with lock:
+                        result.errors += 1
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        result.seconds = time.perf_counter() - started
+        engine.dispose()
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--preload", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'reads/s':>12}{'writes/s':>12}{'errors':>10}")
+    for profile in PROFILES:
+        r = _run(profile, seconds=args.seconds, writers=args.writers, readers=args.readers, preload=args.preload)
+        print(f"{r.profile:<12}{r.reads / r.seconds:>12.0f}{r.writes / r.seconds:>12.0f}{r.errors:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 
 import sys
 from pathlib import Path
 
 import pytest
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
@@ -18,26 +20,54 @@ if str(ROOT_DIR) not in sys.path:
     # without an explicit PYTHONPATH.
     sys.path.insert(0, str(ROOT_DIR))
 
+from app.core.config import settings
 from app.core.errors import register_error_handlers
+from app.core.metrics import MetricsMiddleware, metrics_response, registry as metrics_registry
 from app.db.models import Base
-from app.db.session import get_db
+from app.db.session import (
+    get_async_db,
+    get_async_read_db,
+    get_async_read_session_factory,
+    get_async_session_factory,
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+    instrument_engine,
+)
+from app.db.uow import AsyncUnitOfWork, UnitOfWork
+from app.modules.expenses.cache import caches
+from app.modules.expenses.changes import catalog_events
+from app.modules.expenses.code_index import active_code_index
+from app.modules.expenses.coherence import sync_catalog
+from app.modules.expenses.catalog.async_router import router as catalog_async_router
+from app.modules.expenses.catalog.router import router as catalog_router
+from app.modules.expenses.categories.async_router import router as categories_async_router
 from app.modules.expenses.categories.router import router as categories_router
+from app.modules.expenses.codes.async_router import router as codes_async_router
 from app.modules.expenses.codes.router import router as codes_router
+from app.modules.expenses.events.router import router as events_router
+from app.modules.expenses.export.async_router import router as export_async_router
+from app.modules.expenses.export.router import router as export_router
+from app.modules.expenses.imports.router import router as import_router
 
 
-@pytest.fixture()
-def client() -> Iterator[TestClient]:
-    """FastAPI TestClient wired to an in-memory SQLite DB.
+def _with_middleware(app: FastAPI) -> FastAPI:
+    app.add_middleware(
+        GZipMiddleware, minimum_size=settings.gzip_minimum_size, compresslevel=settings.gzip_level
+    )
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_response, methods=["GET"], include_in_schema=False)
+    return app
 
-    Tests expect transactional isolation and deterministic data, so each test gets
-    its own database.
-    """
 
+def _sync_app() -> FastAPI:
     engine = create_engine(
         "sqlite+pysqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    instrument_engine(engine)
     TestingSessionLocal = sessionmaker(
         bind=engine,
         autoflush=False,
@@ -58,12 +88,91 @@ def client() -> Iterator[TestClient]:
         finally:
             db.close()
 
+    # No replica in tests: read-only sessions on the same database.
+    def override_get_read_db() -> Iterator[Session]:
+        with UnitOfWork(TestingSessionLocal, read_only=True) as uow:
+            yield uow.session
+
     app = FastAPI()
     register_error_handlers(app)
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_read_session_factory] = lambda: TestingSessionLocal
+    # One process per test database: nothing for the coherence watcher to find.
+    app.dependency_overrides[sync_catalog] = lambda: None
 
     app.include_router(categories_router)
     app.include_router(codes_router)
+    app.include_router(catalog_router)
+    app.include_router(export_router)
+    app.include_router(import_router)
+    app.include_router(events_router)
+    return _with_middleware(app)
+
+
+def _async_app(db_path: Path) -> FastAPI:
+    # A file DB: aiosqlite connections are bound to the event loop that opened them,
+    # so each request gets a fresh connection (NullPool) rather than a shared in-memory one.
+    sync_engine = create_engine(f"sqlite:///{db_path}", poolclass=NullPool)
+    instrument_engine(sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    SyncSessionLocal = sessionmaker(bind=sync_engine, autoflush=False, expire_on_commit=False)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    instrument_engine(engine.sync_engine)
+    TestingSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db() -> AsyncIterator[AsyncSession]:
+        db = TestingSessionLocal()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+    async def override_get_async_read_db() -> AsyncIterator[AsyncSession]:
+        async with AsyncUnitOfWork(TestingSessionLocal, read_only=True) as uow:
+            yield uow.session
+
+    app = FastAPI()
+    register_error_handlers(app)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_read_db
+    app.dependency_overrides[get_async_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_async_read_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[sync_catalog] = lambda: None
+    # Routes that stay sync in async mode (e.g. import) use the same file DB.
+    app.dependency_overrides[get_session_factory] = lambda: SyncSessionLocal
+
+    app.include_router(categories_async_router)
+    app.include_router(codes_async_router)
+    app.include_router(catalog_async_router)
+    app.include_router(export_async_router)
+    app.include_router(import_router)
+    app.include_router(events_router)
+    return _with_middleware(app)
+
+
+@pytest.fixture(params=["sync", "async"])
+def client(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[TestClient]:
+    """FastAPI TestClient wired to a fresh SQLite DB.
+
+    Tests expect transactional isolation and deterministic data, so each test gets
+    its own database. Every test runs against both the sync (threadpool) routers and
+    the async (AsyncSession) routers, which must behave identically.
+    """
+
+    # The caches are process-wide; start every test (and its fresh DB) cold.
+    for cache in caches.values():
+        cache.clear()
+    active_code_index.clear()
+    catalog_events.reset()
+    metrics_registry.reset()
+    app = _sync_app() if request.param == "sync" else _async_app(tmp_path / "test.db")
 
     with TestClient(app) as c:
         yield c
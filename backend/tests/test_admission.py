@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.admission import READ, WRITE, AdmissionLimiter, AdmissionMiddleware
+from app.core.metrics import registry as metrics_registry
+
+
+def test_slots_go_to_waiters_in_order_and_full_queues_shed() -> None:
+    limiter = AdmissionLimiter(WRITE, limit=1, queue_size=2, queue_timeout=5)
+
+    async def scenario() -> list[str]:
+        order: list[str] = []
+        assert await limiter.acquire()
+
+        async def queued(name: str) -> None:
+            assert await limiter.acquire()
+            order.append(name)
+            limiter.release()
+
+        waiters = [asyncio.create_task(queued(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        assert limiter.stats().queued == 2
+        assert not await limiter.acquire()  # queue full: shed at once
+
+        limiter.release()
+        await asyncio.gather(*waiters)
+        return order
+
+    assert asyncio.run(scenario()) == ["first", "second"]
+    stats = limiter.stats()
+    assert (stats.in_flight, stats.queued, stats.admitted, stats.shed) == (0, 0, 3, 1)
+
+
+def test_waiting_past_the_timeout_sheds() -> None:
+    limiter = AdmissionLimiter(READ, limit=1, queue_size=4, queue_timeout=0.01)
+
+    async def scenario() -> bool:
+        await limiter.acquire()
+        admitted = await limiter.acquire()
+        limiter.release()
+        return admitted
+
+    assert asyncio.run(scenario()) is False
+    assert limiter.stats().shed == 1
+    assert limiter.stats().in_flight == 0
+
+
+def test_cancelled_waiter_passes_its_slot_on() -> None:
+    limiter = AdmissionLimiter(WRITE, limit=1, queue_size=4, queue_timeout=5)
+
+    async def scenario() -> None:
+        await limiter.acquire()
+        gone = asyncio.create_task(limiter.acquire())
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        gone.cancel()  # e.g. the client disconnected while queued
+        await asyncio.sleep(0)
+        limiter.release()
+        assert await waiting
+        limiter.release()
+
+    asyncio.run(scenario())
+    assert (limiter.stats().in_flight, limiter.stats().queued) == (0, 0)
+
+
+def _app(reads: AdmissionLimiter, writes: AdmissionLimiter, gate: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/items")
+    async def write() -> dict[str, bool]:
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/items")
+    async def read() -> list[int]:
+        return []
+
+    @app.post("/items:validate")
+    async def lookup() -> list[int]:
+        return []
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(
+        AdmissionMiddleware,
+        reads=reads,
+        writes=writes,
+        retry_after_seconds=3,
+        read_posts=("/items:validate",),
+        exempt=("/health",),
+    )
+    return app
+
+
+def test_over_limit_writes_get_503_while_reads_go_through() -> None:
+    metrics_registry.reset()
+    reads = AdmissionLimiter(READ, limit=1, queue_size=0, queue_timeout=1)
+    writes = AdmissionLimiter(WRITE, limit=1, queue_size=0, queue_timeout=1)
+
+    async def scenario() -> None:
+        gate = asyncio.Event()
+        transport = httpx.ASGITransport(app=_app(reads, writes, gate))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.create_task(client.post("/items"))
+            while writes.stats().in_flight == 0:
+                await asyncio.sleep(0)
+
+            shed = await client.post("/items")
+            assert shed.status_code == 503
+            assert shed.headers["retry-after"] == "3"
+            assert shed.json()["detail"]["code"] == "overloaded"
+
+            # Reads, read-only POSTs and exempt paths have their own budget.
+            assert (await client.get("/items")).status_code == 200
+            assert (await client.post("/items:validate")).status_code == 200
+            assert (await client.get("/health")).status_code == 200
+
+            gate.set()
+            assert (await slow).status_code == 200
+            assert (await client.post("/items")).status_code == 200
+
+    asyncio.run(scenario())
+    assert (writes.stats().shed, writes.stats().in_flight, reads.stats().admitted) == (1, 0, 2)
+    assert 'admission_shed_total{class="write",reason="queue_full"} 1.0' in metrics_registry.render()
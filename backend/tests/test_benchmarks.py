@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from benchmarks.api import SCENARIOS, Result, compare, percentile, run
+
+
+def _result(**overrides) -> Result:
+    base = Result(
+        target="asgi",
+        scenario="list_codes",
+        size=1000,
+        concurrency=1,
+        requests=100,
+        errors=0,
+        seconds=1.0,
+        throughput_rps=100.0,
+        mean_ms=10.0,
+        p50_ms=9.0,
+        p95_ms=20.0,
+        p99_ms=30.0,
+    )
+    return replace(base, **overrides)
+
+
+def test_percentile_interpolates() -> None:
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+
+
+def test_compare_flags_latency_and_throughput_regressions() -> None:
+    baseline = [_result(), _result(scenario="catalog")]
+    current = [
+        _result(p95_ms=24.0, throughput_rps=80.0),  # within 25%
+        _result(scenario="catalog", p95_ms=26.0, throughput_rps=70.0),
+        _result(scenario="export_ndjson", p95_ms=999.0),  # no baseline entry
+    ]
+
+    regressions = compare(current, baseline, threshold=0.25)
+    assert [(r.key[1], r.metric) for r in regressions] == [("catalog", "p95_ms"), ("catalog", "throughput_rps")]
+
+
+def test_every_scenario_runs_in_process_without_errors(tmp_path: Path) -> None:
+    results = run(
+        target="asgi",
+        sizes=[50],
+        concurrency=[2],
+        requests=4,
+        warmup=0,
+        scenarios=list(SCENARIOS),
+        snapshot_dir=tmp_path,
+    )
+
+    assert [r.scenario for r in results] == [s.name for s in SCENARIOS]
+    assert all(r.errors == 0 and r.requests >= 2 for r in results)
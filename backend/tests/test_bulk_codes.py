@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _create_category(client: TestClient, name: str = "Travel") -> int:
+    resp = client.post("/categories", json={"name": name})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_bulk_create_codes_ok(client: TestClient) -> None:
+    category_id = _create_category(client)
+
+    resp = client.post(
+        f"/categories/{category_id}/codes:bulk",
+        json=[{"code": "FLIGHT", "description": "Air travel"}, {"code": " HOTEL "}],
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["errors"] == []
+    assert [(c["code"], c["description"], c["is_active"]) for c in data["created"]] == [
+        ("FLIGHT", "Air travel", True),
+        ("HOTEL", None, True),
+    ]
+    assert all(c["category_id"] == category_id for c in data["created"])
+
+    listed = client.get(f"/categories/{category_id}/codes").json()
+    assert [c["code"] for c in listed] == ["FLIGHT", "HOTEL"]
+
+
+def test_bulk_create_codes_reports_per_item_errors(client: TestClient) -> None:
+    category_id = _create_category(client)
+    client.post(f"/categories/{category_id}/codes", json={"code": "FLIGHT"})
+
+    resp = client.post(
+        f"/categories/{category_id}/codes:bulk",
+        json=[{"code": "FLIGHT"}, {"code": "HOTEL"}, {"code": "   "}, {"code": "HOTEL"}],
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [c["code"] for c in data["created"]] == ["HOTEL"]
+    assert [(e["index"], e["error"]) for e in data["errors"]] == [
+        (0, "duplicate_code"),
+        (2, "empty_code"),
+        (3, "duplicate_code"),
+    ]
+
+
+def test_bulk_create_codes_spans_several_batches(client: TestClient) -> None:
+    category_id = _create_category(client)
+    payload = [{"code": f"C{i:04d}"} for i in range(1200)]
+
+    resp = client.post(f"/categories/{category_id}/codes:bulk", json=payload)
+    assert resp.status_code == 200
+    assert len(resp.json()["created"]) == 1200
+    assert len(client.get(f"/categories/{category_id}/codes").json()) == 1200
+
+
+def test_bulk_create_codes_category_not_found_returns_404(client: TestClient) -> None:
+    resp = client.post("/categories/999999/codes:bulk", json=[{"code": "MEAL"}])
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["code"] == "not_found"
+
+
+def test_bulk_create_codes_empty_list_returns_422(client: TestClient) -> None:
+    category_id = _create_category(client)
+    resp = client.post(f"/categories/{category_id}/codes:bulk", json=[])
+    assert resp.status_code == 422
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import TTLCache
+from app.modules.expenses.cache import payload_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_lru_eviction_and_counters() -> None:
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    gen = cache.generation
+    cache.set(("a",), 1, generation=gen)
+    cache.set(("b",), 2, generation=gen)
+    assert cache.get(("a",)) == 1  # "a" becomes most recently used
+    cache.set(("c",), 3, generation=gen)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+def test_ttl_cache_expires_entries() -> None:
+    clock = _Clock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set(("a",), 1, generation=cache.generation)
+
+    clock.now = 4.9
+    assert cache.get(("a",)) == 1
+    clock.now = 5.0
+    assert cache.get(("a",)) is None
+    assert cache.stats().evictions == 1
+
+
+def test_ttl_cache_drops_values_loaded_before_an_invalidation() -> None:
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    gen = cache.generation
+    cache.invalidate_prefix(("codes", 1))  # a write committed while we were reading
+    cache.set(("codes", 1, "q"), "stale", generation=gen)
+    assert cache.get(("codes", 1, "q")) is None
+
+
+def test_ttl_cache_invalidate_prefix_is_scoped() -> None:
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    gen = cache.generation
+    cache.set(("codes", 1, "q"), "one", generation=gen)
+    cache.set(("codes", 2, "q"), "two", generation=gen)
+
+    cache.invalidate_prefix(("codes", 1))
+    assert cache.get(("codes", 1, "q")) is None
+    assert cache.get(("codes", 2, "q")) == "two"
+
+
+def test_list_categories_served_from_cache_until_write_commits(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+
+    assert [c["name"] for c in client.get("/categories").json()] == ["Meals"]
+    assert [c["name"] for c in client.get("/categories").json()] == ["Meals"]
+    # The repeat is answered from the encoded response.
+    assert payload_cache.stats().hits == 1
+
+    created = client.post("/categories", json={"name": "Travel"}).json()
+    assert [c["name"] for c in client.get("/categories").json()] == ["Meals", "Travel"]
+
+    client.put(f"/categories/{created['id']}", json={"is_active": False})
+    listed = client.get("/categories").json()
+    assert listed[1]["is_active"] is False
+
+
+def test_cache_counters_are_exported_as_metrics(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+    client.get("/categories")
+    client.get("/categories")
+
+    stats = payload_cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    metrics = client.get("/metrics").text
+    assert 'cache_hits_total{cache="payloads"} 1.0' in metrics
+    assert 'cache_entries{cache="payloads"} 1.0' in metrics
+    assert "# TYPE cache_misses_total counter" in metrics
+
+
+def test_failed_write_does_not_invalidate(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+    client.get("/categories")
+    invalidations = payload_cache.stats().invalidations
+
+    resp = client.post("/categories", json={"name": "Meals"})
+    assert resp.status_code == 400
+    assert payload_cache.stats().invalidations == invalidations
+
+
+def test_code_writes_invalidate_only_their_category(client: TestClient) -> None:
+    cat1 = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    cat2 = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    code = client.post(f"/categories/{cat1}/codes", json={"code": "LUNCH"}).json()
+    client.post(f"/categories/{cat2}/codes", json={"code": "FLIGHT"})
+
+    client.get(f"/categories/{cat1}/codes")
+    client.get(f"/categories/{cat2}/codes")
+
+    client.put(f"/codes/{code['id']}", json={"description": "Updated"})
+    hits = payload_cache.stats().hits
+
+    assert client.get(f"/categories/{cat2}/codes").json()[0]["code"] == "FLIGHT"
+    assert payload_cache.stats().hits == hits + 1
+    assert client.get(f"/categories/{cat1}/codes").json()[0]["description"] == "Updated"
+    assert payload_cache.stats().hits == hits + 1
+
+    client.post(f"/categories/{cat1}/codes:bulk", json=[{"code": "DINNER"}])
+    assert [c["code"] for c in client.get(f"/categories/{cat1}/codes").json()] == ["LUNCH", "DINNER"]
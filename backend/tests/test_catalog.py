@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.modules.expenses.catalog import service as catalog_service
+
+
+def _seed(client: TestClient) -> tuple[int, int]:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    office = client.post("/categories", json={"name": "Office"}).json()["id"]
+    client.post(f"/categories/{travel}/codes:bulk", json=[{"code": "FLIGHT"}, {"code": "HOTEL"}])
+    supplies = client.post(f"/categories/{office}/codes", json={"code": "SUPPLIES"}).json()["id"]
+    client.put(f"/codes/{supplies}", json={"is_active": False})
+    client.put(f"/categories/{office}", json={"is_active": False})
+    return travel, office
+
+
+def test_catalog_returns_categories_with_nested_codes(client: TestClient) -> None:
+    travel, office = _seed(client)
+
+    resp = client.get("/catalog")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [(c["id"], c["name"], c["is_active"]) for c in data] == [
+        (travel, "Travel", True),
+        (office, "Office", False),
+    ]
+    assert [code["code"] for code in data[0]["codes"]] == ["FLIGHT", "HOTEL"]
+    assert [code["code"] for code in data[1]["codes"]] == ["SUPPLIES"]
+    assert data[1]["codes"][0]["category_id"] == office
+
+
+def test_catalog_is_active_filter_applies_to_categories_and_codes(client: TestClient) -> None:
+    travel, office = _seed(client)
+
+    active = client.get("/catalog", params={"is_active": True}).json()
+    assert [c["id"] for c in active] == [travel]
+
+    inactive = client.get("/catalog", params={"is_active": False}).json()
+    assert [c["id"] for c in inactive] == [office]
+    assert [code["code"] for code in inactive[0]["codes"]] == ["SUPPLIES"]
+
+
+def test_catalog_conditional_get(client: TestClient) -> None:
+    _seed(client)
+    etag = client.get("/catalog").headers["ETag"]
+    assert client.get("/catalog", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/categories", json={"name": "Meals"})
+    assert client.get("/catalog", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_catalog_query_count_does_not_grow_with_categories() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for i in range(50):
+            category = ExpenseCategory(name=f"Cat {i}", is_active=True)
+            category.codes = [ExpenseCode(code=f"C{j}", is_active=True) for j in range(3)]
+            db.add(category)
+        db.commit()
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with Session(engine) as db:
+        categories = catalog_service.get_catalog(db)
+        assert sum(len(c["codes"]) for c in categories) == 150
+
+    assert len(statements) == 2
+
+
+def test_changes_returns_rows_written_since_cursor(client: TestClient) -> None:
+    travel, office = _seed(client)
+
+    full = client.get("/catalog/changes", params={"since": 0}).json()
+    assert full["has_more"] is False
+    assert [c["id"] for c in full["categories"]] == [travel, office]
+    assert sorted(c["code"] for c in full["codes"]) == ["FLIGHT", "HOTEL", "SUPPLIES"]
+
+    unchanged = client.get("/catalog/changes", params={"since": full["revision"]}).json()
+    assert unchanged == {"revision": full["revision"], "has_more": False, "categories": [], "codes": []}
+
+    hotel = next(c for c in full["codes"] if c["code"] == "HOTEL")
+    client.put(f"/codes/{hotel['id']}", json={"is_active": False})
+    client.put(f"/categories/{travel}", json={"name": "Travel & Transport"})
+
+    delta = client.get("/catalog/changes", params={"since": full["revision"]}).json()
+    assert delta["revision"] == full["revision"] + 2
+    assert delta["categories"] == [{"id": travel, "name": "Travel & Transport", "is_active": True}]
+    assert delta["codes"] == [{**hotel, "is_active": False}]
+
+
+def test_changes_pages_never_split_a_revision(client: TestClient) -> None:
+    travel, _office = _seed(client)
+    # One statement, one revision: all three codes must arrive in the same page.
+    client.post("/codes:status", json={"is_active": False, "category_id": travel})
+    client.post("/codes:status", json={"is_active": True, "category_id": travel})
+
+    since, pages = 0, []
+    while True:
+        page = client.get("/catalog/changes", params={"since": since, "limit": 1}).json()
+        pages.append(page)
+        assert page["revision"] > since
+        since = page["revision"]
+        if not page["has_more"]:
+            break
+
+    final = client.get("/catalog/changes", params={"since": 0}).json()
+    assert len(pages) > 1
+    assert since == final["revision"]
+    assert sorted(c["id"] for page in pages for c in page["codes"]) == sorted(c["id"] for c in final["codes"])
+    # The last write touched every Travel code; they come back together, in the last page.
+    assert {c["code"] for c in pages[-1]["codes"]} == {"FLIGHT", "HOTEL"}
+
+
+def test_changes_since_ahead_of_catalog_is_rejected(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Travel"})
+
+    resp = client.get("/catalog/changes", params={"since": 99})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "since_ahead"
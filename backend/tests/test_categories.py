@@ -22,3 +22,37 @@ def test_update_category_not_found_returns_404(client: TestClient) -> None:
     resp = client.put("/categories/999999", json={"name": "Updated", "is_active": False})
     assert resp.status_code == 404
     assert resp.json()["detail"]["code"] == "not_found"
+
+
+def test_update_category_not_found_wins_over_invalid_body(client: TestClient) -> None:
+    resp = client.put("/categories/999999", json={"name": "   "})
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["code"] == "not_found"
+
+    category_id = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    resp = client.put(f"/categories/{category_id}", json={"name": "   "})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "empty_name"
+
+
+def test_update_category_cascade_codes_reports_count(client: TestClient) -> None:
+    category_id = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    for code in ("LUNCH", "DINNER"):
+        client.post(f"/categories/{category_id}/codes", json={"code": code})
+
+    resp = client.put(f"/categories/{category_id}", json={"name": "Food"})
+    assert resp.json() == {"id": category_id, "name": "Food", "is_active": True}
+
+    resp = client.put(f"/categories/{category_id}?cascade_codes=true", json={"is_active": False})
+    assert resp.status_code == 200
+    assert resp.json() == {"id": category_id, "name": "Food", "is_active": False, "codes_updated": 2}
+    codes = client.get(f"/categories/{category_id}/codes").json()
+    assert [c["is_active"] for c in codes] == [False, False]
+
+
+def test_update_category_cascade_needs_status(client: TestClient) -> None:
+    category_id = client.post("/categories", json={"name": "Meals"}).json()["id"]
+
+    resp = client.put(f"/categories/{category_id}?cascade_codes=true", json={"name": "Food"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "cascade_without_status"
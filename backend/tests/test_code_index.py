@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.modules.expenses.code_index import ActiveCodeIndex
+from app.modules.expenses.codes.schemas import CodeValidationItem
+from app.modules.expenses.codes.service import check_codes
+
+
+def _seed(client: TestClient) -> tuple[int, int, int]:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    meals = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    taxi = client.post(f"/categories/{travel}/codes", json={"code": "TAXI"}).json()["id"]
+    client.post(f"/categories/{meals}/codes", json={"code": "LUNCH"})
+    return travel, meals, taxi
+
+
+def test_validate_answers_every_pair_in_order(client: TestClient) -> None:
+    travel, meals, taxi = _seed(client)
+    client.put(f"/categories/{meals}", json={"is_active": False})
+
+    resp = client.post(
+        "/codes:validate",
+        json=[
+            {"category_id": travel, "code": "TAXI"},
+            {"category": " Travel ", "code": "TAXI "},
+            {"category_id": travel, "code": "taxi"},  # codes are case-sensitive
+            {"category_id": meals, "code": "LUNCH"},
+            {"category": "Nope", "code": "TAXI"},
+            {"category_id": 999, "code": "TAXI"},
+        ],
+    )
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"valid": True, "category_id": travel, "code_id": taxi, "error": None},
+        {"valid": True, "category_id": travel, "code_id": taxi, "error": None},
+        {"valid": False, "category_id": travel, "code_id": None, "error": "unknown_code"},
+        {"valid": False, "category_id": meals, "code_id": None, "error": "inactive_category"},
+        {"valid": False, "category_id": None, "code_id": None, "error": "unknown_category"},
+        {"valid": False, "category_id": None, "code_id": None, "error": "unknown_category"},
+    ]
+
+
+def test_validate_sees_writes_immediately(client: TestClient) -> None:
+    travel, _, taxi = _seed(client)
+    pairs = [{"category_id": travel, "code": "TAXI"}, {"category_id": travel, "code": "BUS"}]
+    assert [r["valid"] for r in client.post("/codes:validate", json=pairs).json()] == [True, False]
+
+    client.put(f"/codes/{taxi}", json={"is_active": False})
+    client.post(f"/categories/{travel}/codes:bulk", json=[{"code": "BUS"}])
+    assert [r["valid"] for r in client.post("/codes:validate", json=pairs).json()] == [False, True]
+
+    client.put(f"/categories/{travel}", json={"name": "Transport"})
+    result = client.post("/codes:validate", json=[{"category": "Transport", "code": "BUS"}]).json()
+    assert result[0]["valid"] is True
+
+
+def test_validate_rejects_bad_items(client: TestClient) -> None:
+    for body in ([], [{"code": "TAXI"}], [{"category_id": 1, "category": "Travel", "code": "TAXI"}]):
+        assert client.post("/codes:validate", json=body).status_code == 422
+
+
+def _database() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ExpenseCategory), [{"id": i, "name": f"C{i}"} for i in range(1, 101)])
+        conn.execute(
+            insert(ExpenseCode),
+            [{"category_id": i % 100 + 1, "code": f"CODE-{i}", "is_active": i % 10 != 0} for i in range(20_000)],
+        )
+    return Session(engine)
+
+
+def test_index_reloads_only_the_stale_category() -> None:
+    db = _database()
+    index = ActiveCodeIndex()
+    snapshot = index.snapshot(db)
+    assert sum(map(len, snapshot.codes.values())) == 18_000
+    assert index.snapshot(db) is snapshot  # nothing stale: no reload
+
+    db.execute(ExpenseCode.__table__.update().where(ExpenseCode.code == "CODE-1").values(is_active=False))
+    index.codes_changed(2)
+    patched = index.snapshot(db)
+    assert "CODE-1" not in patched.codes[2]
+    assert "CODE-1" in snapshot.codes[2]  # published snapshots are never mutated
+    assert patched.codes[3] is snapshot.codes[3]
+    assert index.reloads == 2
+
+
+def test_reload_overtaken_by_a_write_is_published_and_the_write_stays_stale() -> None:
+    db = _database()
+    index = ActiveCodeIndex()
+    index.snapshot(db)
+    index.codes_changed(2)
+
+    original_load = index._load
+    reloaded: list[frozenset[int] | None] = []
+
+    def load_then_write(db, base, reload):
+        reloaded.append(reload.category_ids)
+        fresh = original_load(db, base, reload)
+        if len(reloaded) == 1:
+            index.codes_changed(3)  # a write commits while the reload reads
+        return fresh
+
+    index._load = load_then_write
+    published = index.snapshot(db)
+    assert index.snapshot(db) is not published  # category 3 is still stale: reloaded alone
+    assert index.snapshot(db) is index.snapshot(db)
+    assert reloaded == [frozenset({2}), frozenset({3})]
+
+
+def test_reload_started_before_a_clear_is_not_published() -> None:
+    db = _database()
+    index = ActiveCodeIndex()
+    original_load = index._load
+
+    def load_then_clear(*args):
+        fresh = original_load(*args)
+        index.clear()  # e.g. the database was replaced while the reload read
+        return fresh
+
+    index._load = load_then_clear
+    index.snapshot(db)
+    index._load = original_load
+    index.snapshot(db)  # nothing was published: loads again
+    assert index.reloads == 2
+
+
+def test_batch_check_costs_microseconds_per_item() -> None:
+    db = _database()
+    snapshot = ActiveCodeIndex().snapshot(db)
+    items = [CodeValidationItem(category_id=i % 100 + 1, code=f"CODE-{i}") for i in range(10_000)]
+
+    started = time.perf_counter()
+    results = check_codes(snapshot, items)
+    per_item = (time.perf_counter() - started) / len(items)
+
+    assert sum(r["valid"] for r in results) == 9_000
+    assert per_item < 20e-6
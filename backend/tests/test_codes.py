@@ -67,6 +67,12 @@ def test_create_code_category_not_found_returns_404(client: TestClient) -> None:
     assert resp.json()["detail"]["code"] == "not_found"
 
 
+def test_create_code_category_not_found_wins_over_empty_code(client: TestClient) -> None:
+    resp = client.post("/categories/999999/codes", json={"code": "   "})
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["code"] == "not_found"
+
+
 def test_update_code_ok_updates_fields(client: TestClient) -> None:
     category_id = _create_category(client)
     created = _create_code(client, category_id, code="MEAL")
@@ -134,3 +140,53 @@ def test_create_code_blank_after_strip_returns_400(client: TestClient) -> None:
     resp = client.post(f"/categories/{category_id}/codes", json={"code": "   "})
     assert resp.status_code == 400
     assert resp.json()["detail"]["code"] == "empty_code"
+
+
+def _statuses(client: TestClient, category_id: int) -> dict[str, bool]:
+    return {c["code"]: c["is_active"] for c in client.get(f"/categories/{category_id}/codes").json()}
+
+
+def test_set_codes_status_by_ids_counts_only_changed_rows(client: TestClient) -> None:
+    meals, transport = _create_category(client, "Meals"), _create_category(client, "Transport")
+    lunch = _create_code(client, meals, "LUNCH")["id"]
+    dinner = _create_code(client, meals, "DINNER")["id"]
+    taxi = _create_code(client, transport, "TAXI")["id"]
+    client.put(f"/codes/{dinner}", json={"is_active": False})
+    assert _statuses(client, meals) == {"LUNCH": True, "DINNER": False}  # cached page
+
+    resp = client.post("/codes:status", json={"ids": [lunch, dinner, taxi, 999], "is_active": False})
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 2}  # DINNER was already off, 999 does not exist
+
+    # Both categories' cached lists were invalidated.
+    assert _statuses(client, meals) == {"LUNCH": False, "DINNER": False}
+    assert _statuses(client, transport) == {"TAXI": False}
+
+
+def test_set_codes_status_by_category_with_prefix(client: TestClient) -> None:
+    category_id = _create_category(client)
+    for code in ("MEAL-1", "MEAL-2", "SNACK"):
+        _create_code(client, category_id, code)
+
+    resp = client.post(
+        "/codes:status", json={"category_id": category_id, "code_prefix": "MEAL", "is_active": False}
+    )
+    assert resp.json() == {"updated": 2}
+    assert _statuses(client, category_id) == {"MEAL-1": False, "MEAL-2": False, "SNACK": True}
+
+    resp = client.post("/codes:status", json={"category_id": category_id, "is_active": False})
+    assert resp.json() == {"updated": 1}
+
+
+def test_set_codes_status_validation(client: TestClient) -> None:
+    resp = client.post("/codes:status", json={"category_id": 999, "is_active": True})
+    assert resp.status_code == 404
+    assert resp.json()["detail"]["code"] == "not_found"
+
+    for body in (
+        {"is_active": True},
+        {"ids": [1], "category_id": 1, "is_active": True},
+        {"ids": [1], "code_prefix": "A", "is_active": True},
+        {"ids": [], "is_active": True},
+    ):
+        assert client.post("/codes:status", json=body).status_code == 422
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, insert, update
+
+from app.core.config import settings
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.schema import bootstrap_schema
+from app.db.session import build_engine
+from app.modules.expenses.cache import (
+    caches,
+    categories_payload_key,
+    codes_payload_key,
+    codes_revision_key,
+    payload_cache,
+    revision_cache,
+)
+from app.modules.expenses.categories.schemas import CategoryListQuery
+from app.modules.expenses import changes, coherence
+from app.modules.expenses.coherence import CatalogWatcher, sync_catalog
+
+
+@pytest.fixture
+def engines(tmp_path: Path) -> Iterator[tuple[Engine, Engine]]:
+    """Two engines on one database file: this worker's and another worker's."""
+
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    ours, theirs = build_engine(url, settings), build_engine(url, settings)
+    bootstrap_schema(ours)
+    with theirs.begin() as connection:
+        connection.execute(insert(ExpenseCategory), [{"id": 1, "name": "Travel"}, {"id": 2, "name": "Meals"}])
+    for cache in caches.values():
+        cache.clear()
+    yield ours, theirs
+    ours.dispose()
+    theirs.dispose()
+
+
+CATEGORIES = categories_payload_key(CategoryListQuery(), "etag")
+
+
+def _cache_lists() -> None:
+    generation = payload_cache.generation
+    for category_id in (1, 2):
+        payload_cache.set(codes_payload_key(category_id, "etag"), "payload", generation=generation)
+        revision_cache.set(codes_revision_key(category_id), 0, generation=revision_cache.generation)
+    payload_cache.set(CATEGORIES, "payload", generation=generation)
+
+
+def test_other_workers_writes_invalidate_only_what_they_touched(engines: tuple[Engine, Engine]) -> None:
+    ours, theirs = engines
+    watcher = CatalogWatcher(ours, interval_seconds=0)
+    watcher.prime()
+    _cache_lists()
+
+    watcher.check()  # nothing written since the baseline
+    assert payload_cache.get(codes_payload_key(1, "etag")) == "payload"
+
+    with theirs.begin() as connection:
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TAXI"}])
+    watcher.check()
+
+    assert payload_cache.get(codes_payload_key(1, "etag")) is None
+    assert revision_cache.get(codes_revision_key(1)) is None  # new ETag for that list
+    assert payload_cache.get(codes_payload_key(2, "etag")) == "payload"
+    assert payload_cache.get(CATEGORIES) == "payload"
+
+    with theirs.begin() as connection:
+        connection.execute(update(ExpenseCategory).where(ExpenseCategory.id == 2).values(is_active=False))
+    watcher.check()
+    assert payload_cache.get(CATEGORIES) is None
+    assert payload_cache.get(codes_payload_key(2, "etag")) == "payload"
+    watcher.close()
+
+
+def test_other_workers_writes_are_published_as_events(
+    engines: tuple[Engine, Engine], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ours, theirs = engines
+    published: list[tuple[str, dict]] = []
+    monkeypatch.setattr(changes.catalog_events, "publish", lambda event, data: published.append((event, data)))
+    watcher = CatalogWatcher(ours, interval_seconds=0)
+    watcher.prime()
+
+    with theirs.begin() as connection:
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TAXI"}, {"category_id": 2, "code": "TEA"}])
+        connection.execute(update(ExpenseCategory).where(ExpenseCategory.id == 2).values(is_active=False))
+    watcher.check()
+
+    assert sorted(published, key=str) == [
+        ("categories.changed", {}),
+        ("codes.changed", {"category_id": 1}),
+        ("codes.changed", {"category_id": 2}),
+    ]
+    watcher.close()
+
+
+def test_checks_are_rate_limited(engines: tuple[Engine, Engine]) -> None:
+    ours, theirs = engines
+    watcher = CatalogWatcher(ours, interval_seconds=3600)
+    watcher.prime()
+    watcher.check()
+    _cache_lists()
+
+    with theirs.begin() as connection:
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TAXI"}])
+    watcher.check()  # within the interval: served from the caches as they are
+    assert watcher.checks == 1
+    assert payload_cache.get(codes_payload_key(1, "etag")) == "payload"
+    watcher.close()
+
+
+def test_replaced_database_drops_everything(engines: tuple[Engine, Engine]) -> None:
+    ours, theirs = engines
+    with theirs.begin() as connection:
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TAXI"}])
+    watcher = CatalogWatcher(ours, interval_seconds=0)
+    watcher.prime()
+    _cache_lists()
+
+    # E.g. restored from an older backup: revisions went back.
+    with theirs.begin() as connection:
+        connection.execute(ExpenseCode.__table__.delete())
+    watcher.check()
+
+    assert payload_cache.stats().size == revision_cache.stats().size == 0
+    watcher.close()
+
+
+def test_dependency_only_leaves_the_event_loop_when_a_check_is_due(
+    engines: tuple[Engine, Engine], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ours, _ = engines
+    watcher = CatalogWatcher(ours, interval_seconds=3600)
+    watcher.prime()
+    hops: list[object] = []
+
+    async def run_in_threadpool(func):
+        hops.append(func)
+        return func()
+
+    monkeypatch.setattr(coherence, "catalog_watcher", watcher)
+    monkeypatch.setattr(coherence, "run_in_threadpool", run_in_threadpool)
+
+    asyncio.run(sync_catalog())  # first check is due
+    asyncio.run(sync_catalog())  # within the interval: answered on the loop
+    assert (len(hops), watcher.checks) == (1, 1)
+    watcher.close()
+
+
+@pytest.mark.parametrize("subscribers", [0, 1])
+def test_watch_catalog_checks_only_while_events_have_subscribers(
+    engines: tuple[Engine, Engine], monkeypatch: pytest.MonkeyPatch, subscribers: int
+) -> None:
+    ours, _ = engines
+    watcher = CatalogWatcher(ours, interval_seconds=0)
+    watcher.prime()
+    monkeypatch.setattr(coherence, "catalog_watcher", watcher)
+    monkeypatch.setattr(coherence, "catalog_events", type("Broker", (), {"subscribers": subscribers})())
+    monkeypatch.setattr(coherence, "WATCH_MIN_INTERVAL_SECONDS", 0.01)
+
+    async def run_briefly() -> None:
+        task = asyncio.create_task(coherence.watch_catalog())
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(run_briefly())
+    assert (watcher.checks > 0) == bool(subscribers)
+    watcher.close()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.core.compression import accepts_gzip, encode_body, gzip_stream
+from app.core.etag import gzip_etag
+from app.modules.expenses.cache import payload_cache
+
+GZIP = {"Accept-Encoding": "gzip"}
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_accepts_gzip_honours_q_values() -> None:
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
+
+
+def test_encode_body_respects_threshold_and_level() -> None:
+    body = b'{"code":"MEAL"}' * 200
+    assert gzip.decompress(encode_body(body, minimum_size=1024, level=6).gzip) == body
+    assert encode_body(body[:100], minimum_size=1024, level=6).gzip is None
+    assert encode_body(body, minimum_size=1024, level=0).gzip is None
+
+
+def _category_with_codes(client: TestClient, n: int) -> int:
+    category_id = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.post(
+        f"/categories/{category_id}/codes:bulk",
+        json=[{"code": f"TRAVEL-{i:04d}", "description": "Domestic airfare and hotel"} for i in range(n)],
+    )
+    return category_id
+
+
+def test_lists_are_served_precompressed_until_a_write(client: TestClient) -> None:
+    category_id = _category_with_codes(client, 100)
+    url = f"/categories/{category_id}/codes"
+
+    first = client.get(url, headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert int(first.headers["content-length"]) < len(first.content) // 4
+    assert len(first.json()) == 100
+
+    hits = payload_cache.stats().hits
+    plain = client.get(url, headers=IDENTITY)
+    assert "content-encoding" not in plain.headers
+    assert plain.content == first.content
+    # Same resource, different bytes: the gzip body has its own strong tag.
+    assert first.headers["etag"] == gzip_etag(plain.headers["etag"])
+    assert payload_cache.stats().hits == hits + 1
+
+    for etag in (first.headers["etag"], plain.headers["etag"]):
+        revalidated = client.get(url, headers={**GZIP, "If-None-Match": etag})
+        assert (revalidated.status_code, revalidated.headers["etag"]) == (304, etag)
+
+    client.put(f"/codes/{first.json()[0]['id']}", json={"is_active": False})
+    after = client.get(url, headers=GZIP)
+    assert after.headers["etag"] != first.headers["etag"]
+    assert after.json()[0]["is_active"] is False
+    assert payload_cache.stats().hits == hits + 1
+
+
+def test_small_and_uncached_responses(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+    assert "content-encoding" not in client.get("/categories", headers=GZIP).headers
+
+    # Responses outside the payload cache go through the middleware.
+    _category_with_codes(client, 100)
+    search = client.get("/codes/search", params={"q": "airfare", "limit": 100}, headers=GZIP)
+    assert search.headers["content-encoding"] == "gzip"
+    assert len(search.json()) == 100
+
+
+def test_streamed_gzip_is_decodable_after_every_chunk() -> None:
+    chunks = ["", '{"type":"category"}\n' * 200, '{"type":"code"}\n' * 200]
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    compressed = gzip_stream(chunks, level=6)
+    for chunk in chunks:
+        # Nothing is held back in the compressor: each chunk decodes as soon as it is sent.
+        assert decoder.decompress(next(compressed)) == chunk.encode()
+    decoder.decompress(b"".join(compressed))
+    assert decoder.eof
+
+
+def test_export_is_compressed_per_chunk_not_by_the_middleware(client: TestClient) -> None:
+    _category_with_codes(client, 100)
+    resp = client.get("/export", headers=GZIP)
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert len(resp.text.splitlines()) == 101
+
+    assert "content-encoding" not in client.get("/export", headers=IDENTITY).headers
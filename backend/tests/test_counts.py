@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select, text
+
+from app.db.counts import count_drift, rebuild_code_counts
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.db.revisions import LATEST_REVISION
+
+
+def _counts(client: TestClient) -> dict[str, tuple[int, int]]:
+    rows = client.get("/categories", params={"include_counts": True}).json()
+    return {r["name"]: (r["active_codes"], r["inactive_codes"]) for r in rows}
+
+
+def test_counts_follow_every_code_write_path(client: TestClient) -> None:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    meals = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    assert _counts(client) == {"Travel": (0, 0), "Meals": (0, 0)}
+    assert "active_codes" not in client.get("/categories").json()[0]
+
+    taxi = client.post(f"/categories/{travel}/codes", json={"code": "TAXI"}).json()["id"]
+    client.post(f"/categories/{travel}/codes:bulk", json=[{"code": "FLIGHT"}, {"code": "TAXI"}, {"code": "HOTEL"}])
+    client.post(f"/categories/{meals}/codes", json={"code": "LUNCH"})
+    assert _counts(client) == {"Travel": (3, 0), "Meals": (1, 0)}  # cached list refreshed
+
+    client.put(f"/codes/{taxi}", json={"is_active": False})
+    client.put(f"/codes/{taxi}", json={"description": "Cabs"})  # no count change
+    assert _counts(client) == {"Travel": (2, 1), "Meals": (1, 0)}
+
+    client.post("/codes:status", json={"category_id": travel, "code_prefix": "FL", "is_active": False})
+    assert _counts(client) == {"Travel": (1, 2), "Meals": (1, 0)}
+
+    client.put(f"/categories/{meals}?cascade_codes=true", json={"is_active": False})
+    assert _counts(client) == {"Travel": (1, 2), "Meals": (0, 1)}
+
+
+def test_counts_list_etag_moves_with_code_writes(client: TestClient) -> None:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    plain = client.get("/categories").headers["etag"]
+    counted = client.get("/categories", params={"include_counts": True}).headers["etag"]
+    assert plain != counted
+
+    client.post(f"/categories/{travel}/codes", json={"code": "TAXI"})
+    assert client.get("/categories").headers["etag"] == plain
+    resp = client.get("/categories", params={"include_counts": True}, headers={"If-None-Match": counted})
+    assert resp.status_code == 200
+    assert resp.json()[0]["active_codes"] == 1
+
+
+def test_rebuild_repairs_drifted_counters() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ExpenseCategory), [{"id": 1, "name": "Travel"}, {"id": 2, "name": "Meals"}])
+        conn.execute(
+            insert(ExpenseCode),
+            [
+                {"category_id": 1, "code": "TAXI", "is_active": True},
+                {"category_id": 1, "code": "BUS", "is_active": False},
+            ],
+        )
+        assert count_drift(conn) == 0
+
+        # E.g. rows written while the triggers were missing.
+        conn.execute(text("UPDATE expense_categories SET active_codes = 7, inactive_codes = 0 WHERE id = 1"))
+        assert count_drift(conn) == 1
+        revisions = conn.execute(select(ExpenseCategory.revision).order_by(ExpenseCategory.id)).scalars().all()
+        latest = conn.execute(LATEST_REVISION).scalar_one()
+
+        assert rebuild_code_counts(conn) == 1
+        assert rebuild_code_counts(conn) == 0
+        rows = conn.execute(
+            select(ExpenseCategory.active_codes, ExpenseCategory.inactive_codes, ExpenseCategory.revision)
+            .order_by(ExpenseCategory.id)
+        ).all()
+    # The repaired category gets a new revision, so `include_counts` lists and their ETags move;
+    # the other one is not written.
+    assert rows == [(1, 1, latest + 1), (0, 0, revisions[1])]
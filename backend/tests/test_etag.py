@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.etag import matching_etag
+from app.modules.expenses.cache import caches
+
+
+def test_matching_etag_handles_lists_and_weak_tags() -> None:
+    assert matching_etag('"a", W/"b"', '"b"') == '"b"'
+    assert matching_etag('"a"', '"a"') == '"a"'
+    assert matching_etag('"a"', '"b"') is None
+    assert matching_etag("*", '"a"') is None
+    assert matching_etag(None, '"a"') is None
+
+
+def test_gzip_variant_matches_its_base_tag() -> None:
+    assert matching_etag('"x", W/"a-gz"', '"a"') == '"a-gz"'
+    assert matching_etag('"a"', '"a"') == '"a"'
+    assert matching_etag('"a-gz"', '"b"') is None
+
+
+def test_list_categories_conditional_get(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+
+    first = client.get("/categories")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    cached = client.get("/categories", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    client.post("/categories", json={"name": "Travel"})
+    changed = client.get("/categories", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_etag_depends_on_query(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+
+    all_etag = client.get("/categories").headers["ETag"]
+    resp = client.get("/categories", params={"is_active": True}, headers={"If-None-Match": all_etag})
+    assert resp.status_code == 200
+
+
+def test_codes_etag_is_per_category(client: TestClient) -> None:
+    cat1 = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    cat2 = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.post(f"/categories/{cat1}/codes", json={"code": "LUNCH"})
+
+    etag1 = client.get(f"/categories/{cat1}/codes").headers["ETag"]
+    client.post(f"/categories/{cat2}/codes", json={"code": "FLIGHT"})
+
+    resp = client.get(f"/categories/{cat1}/codes", headers={"If-None-Match": etag1})
+    assert resp.status_code == 304
+
+    code_id = client.get(f"/categories/{cat1}/codes").json()[0]["id"]
+    client.put(f"/codes/{code_id}", json={"is_active": False})
+    resp = client.get(f"/categories/{cat1}/codes", headers={"If-None-Match": etag1})
+    assert resp.status_code == 200
+    assert resp.json()[0]["is_active"] is False
+
+
+def test_failed_write_keeps_etag(client: TestClient) -> None:
+    client.post("/categories", json={"name": "Meals"})
+    etag = client.get("/categories").headers["ETag"]
+
+    assert client.post("/categories", json={"name": "Meals"}).status_code == 400
+    assert client.get("/categories", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_etags_come_from_the_database_not_the_process(client: TestClient) -> None:
+    category = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    client.post(f"/categories/{category}/codes", json={"code": "LUNCH"})
+    urls = ("/categories", f"/categories/{category}/codes", "/catalog")
+    etags = [client.get(url).headers["ETag"] for url in urls]
+
+    # Another worker, or this one after a restart, starts cold and derives the same tags.
+    for cache in caches.values():
+        cache.clear()
+    for url, etag in zip(urls, etags):
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.events import KEEPALIVE_FRAME, RESYNC_FRAME, EventBroker
+from app.modules.expenses.changes import catalog_events
+
+
+def _frames(body: bytes) -> list[dict[str, str]]:
+    frames = []
+    for chunk in body.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in chunk.splitlines() if not line.startswith(":"))
+        if fields:
+            frames.append(fields)
+    return frames
+
+
+async def _drain(broker: EventBroker, subscription, keepalive_seconds: float = 5) -> list[bytes]:
+    return [frame async for frame in broker.stream(subscription, keepalive_seconds=keepalive_seconds)]
+
+
+def test_publish_fans_out_to_every_subscriber() -> None:
+    broker = EventBroker(queue_size=8, replay_size=8)
+
+    async def scenario() -> list[list[bytes]]:
+        subscriptions = [broker.subscribe() for _ in range(3)]
+        # Published from another thread, as services do from the threadpool.
+        publisher = threading.Thread(target=lambda: broker.publish("code.created", {"revision": 1}))
+        publisher.start()
+        publisher.join()
+        await asyncio.sleep(0)
+        broker.close()
+        return await asyncio.gather(*(_drain(broker, s) for s in subscriptions))
+
+    results = asyncio.run(scenario())
+    assert [[_frames(f)[0]["event"] for f in frames] for frames in results] == [["code.created"]] * 3
+    assert broker.subscribers == 0
+
+
+def test_slow_subscriber_is_told_to_resync_and_dropped() -> None:
+    broker = EventBroker(queue_size=2, replay_size=8)
+
+    async def scenario() -> list[bytes]:
+        subscription = broker.subscribe()
+        for revision in range(5):
+            broker.publish("codes.changed", {"revision": revision})
+        await asyncio.sleep(0)
+        return await _drain(broker, subscription)
+
+    # Nothing buffered past the bound: only the resync notice is delivered.
+    assert asyncio.run(scenario()) == [RESYNC_FRAME]
+    assert broker.subscribers == 0
+
+
+def test_last_event_id_replays_missed_events() -> None:
+    broker = EventBroker(queue_size=8, replay_size=2)
+    for revision in range(1, 4):
+        broker.publish("codes.changed", {"revision": revision})
+
+    async def resume(last_event_id: str) -> list[bytes]:
+        subscription = broker.subscribe(last_event_id)
+        broker.close()
+        await asyncio.sleep(0)
+        return await _drain(broker, subscription)
+
+    replayed = asyncio.run(resume(f"{broker.epoch}:1"))
+    assert [json.loads(_frames(f)[0]["data"])["revision"] for f in replayed] == [2, 3]
+    # Too far back for the replay buffer, or an id from another process: resync.
+    assert asyncio.run(resume(f"{broker.epoch}:0")) == [RESYNC_FRAME]
+    assert asyncio.run(resume("stale:3")) == [RESYNC_FRAME]
+    # Already up to date.
+    assert asyncio.run(resume(f"{broker.epoch}:3")) == []
+
+
+def test_idle_stream_sends_keepalive() -> None:
+    broker = EventBroker(queue_size=8, replay_size=8)
+
+    async def scenario() -> list[bytes]:
+        subscription = broker.subscribe()
+        asyncio.get_running_loop().call_later(0.05, broker.close)
+        return await _drain(broker, subscription, keepalive_seconds=0.01)
+
+    frames = asyncio.run(scenario())
+    assert frames and set(frames) == {KEEPALIVE_FRAME}
+
+
+def test_events_stream_writes_after_commit(client: TestClient) -> None:
+    responses = []
+    reader = threading.Thread(target=lambda: responses.append(client.get("/events")))
+    reader.start()
+    deadline = time.monotonic() + 5
+    while catalog_events.subscribers == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    category = client.post("/categories", json={"name": "Meals"}).json()
+    client.post("/categories", json={"name": "Meals"})  # rejected: no event
+    code = client.post(f"/categories/{category['id']}/codes", json={"code": "M-1"}).json()
+    client.put(f"/codes/{code['id']}", json={"description": "Lunch"})
+
+    catalog_events.close()
+    reader.join(timeout=5)
+    (response,) = responses
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    frames = _frames(response.content)
+    assert [f["event"] for f in frames] == ["category.created", "code.created", "code.updated"]
+    data = [json.loads(f["data"]) for f in frames]
+    assert data[0]["row"] == category
+    assert data[2]["row"]["description"] == "Lunch"
+    assert data[2]["category_id"] == category["id"]
+    assert [f["id"] for f in frames] == [f"{catalog_events.epoch}:{seq}" for seq in (1, 2, 3)]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.db.models import Base
+from app.modules.expenses.export.repo import export_stmt
+
+
+def _seed(client: TestClient) -> tuple[int, int]:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    empty = client.post("/categories", json={"name": "Empty, \"quoted\""}).json()["id"]
+    client.post(
+        f"/categories/{travel}/codes:bulk",
+        json=[{"code": "FLIGHT", "description": "Air travel"}, {"code": "HOTEL"}],
+    )
+    return travel, empty
+
+
+def test_export_ndjson(client: TestClient) -> None:
+    travel, empty = _seed(client)
+
+    resp = client.get("/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [(line["type"], line["id"]) for line in lines][0] == ("category", travel)
+    assert [line.get("code") for line in lines if line["type"] == "code"] == ["FLIGHT", "HOTEL"]
+    assert lines[1] == {
+        "type": "code",
+        "id": lines[1]["id"],
+        "category_id": travel,
+        "code": "FLIGHT",
+        "description": "Air travel",
+        "is_active": True,
+    }
+    assert lines[-1] == {"type": "category", "id": empty, "name": 'Empty, "quoted"', "is_active": True}
+
+
+def test_export_csv(client: TestClient) -> None:
+    travel, empty = _seed(client)
+
+    resp = client.get("/export", params={"format": "csv"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="expense-catalog.csv"' in resp.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [(r["category_id"], r["code"]) for r in rows] == [
+        (str(travel), "FLIGHT"),
+        (str(travel), "HOTEL"),
+        (str(empty), ""),
+    ]
+    assert rows[2]["category_name"] == 'Empty, "quoted"'
+
+
+def test_export_unknown_format_returns_422(client: TestClient) -> None:
+    assert client.get("/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_query_needs_no_sort_step() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    sql = str(export_stmt().compile(engine, compile_kwargs={"literal_binds": True}))
+
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "TEMP B-TREE" not in plan
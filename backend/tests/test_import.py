@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.streams import RequestBodyReader
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.modules.expenses.imports import service as import_service
+
+
+def test_import_csv_creates_categories_and_codes(client: TestClient) -> None:
+    existing = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.post(f"/categories/{existing}/codes", json={"code": "FLIGHT"})
+
+    body = (
+        "category,code,description,is_active,category_is_active\n"
+        "Travel,FLIGHT,dup of existing,,\n"
+        "Travel,HOTEL,Accommodation,true,\n"
+        "Meals,LUNCH,,false,\n"
+        "Meals,LUNCH,dup in file,,\n"
+        ",ORPHAN,,,\n"
+        "Office,,,,no\n"
+        "Meals,DINNER,,maybe,\n"
+    )
+    resp = client.post("/import", params={"format": "csv", "batch_size": 2, "commit_every": 3}, content=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["rows_read"] == 7
+    assert data["categories_created"] == 2
+    assert data["codes_created"] == 2
+    assert data["rejected"] == 4
+    assert data["commits"] == 3
+    assert sorted((r["line"], r["reason"]) for r in data["rejected_rows"]) == [
+        (2, "duplicate_code"),
+        (5, "duplicate_code"),
+        (6, "missing_category"),
+        (8, "invalid_boolean"),
+    ]
+
+    categories = {c["name"]: c for c in client.get("/categories").json()}
+    assert categories["Office"]["is_active"] is False
+    assert [c["code"] for c in client.get(f"/categories/{existing}/codes").json()] == ["FLIGHT", "HOTEL"]
+    meals_codes = client.get(f"/categories/{categories['Meals']['id']}/codes").json()
+    assert [(c["code"], c["is_active"]) for c in meals_codes] == [("LUNCH", False)]
+
+
+def test_import_ndjson(client: TestClient) -> None:
+    lines = [
+        json.dumps({"category": "Travel", "code": "FLIGHT", "description": "Air"}),
+        "not json",
+        json.dumps({"category": "Travel", "code": "TAXI", "is_active": False}),
+    ]
+    resp = client.post("/import", params={"format": "ndjson"}, content="\n".join(lines) + "\n")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert (data["codes_created"], data["rejected"]) == (2, 1)
+    assert data["rejected_rows"][0]["reason"] == "invalid_record"
+
+
+def test_import_rejects_non_utf8_body_after_committed_batches(client: TestClient) -> None:
+    # Decoding happens per buffered read, so the bad bytes sit well past the first buffer.
+    rows = "".join(f"Travel,CODE{i:05d}\n" for i in range(1000)).encode()
+    body = b"category,code\n" + rows + b"\xff\xfe,LUNCH\n"
+    resp = client.post("/import", params={"format": "csv", "commit_every": 100}, content=body)
+    assert resp.status_code == 400
+    detail = resp.json()["detail"]
+    assert detail["code"] == "invalid_encoding"
+    assert 0 < detail["rows_committed"] < 1000
+    assert detail["rows_committed"] % 100 == 0
+    assert [c["name"] for c in client.get("/categories").json()] == ["Travel"]
+
+
+def test_import_rejects_non_utf8_body(client: TestClient) -> None:
+    resp = client.post("/import", params={"format": "csv"}, content=b"category,code\n\xff\xfe,LUNCH\n")
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "invalid_encoding"
+    assert resp.json()["detail"]["rows_committed"] == 0
+    assert client.get("/categories").json() == []
+
+
+def test_export_csv_round_trips_through_import(client: TestClient) -> None:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.post(f"/categories/{travel}/codes:bulk", json=[{"code": "FLIGHT"}, {"code": "HOTEL"}])
+    exported = client.get("/export", params={"format": "csv"}).text
+
+    resp = client.post("/import", params={"format": "csv"}, content=exported)
+    data = resp.json()
+    assert (data["codes_created"], data["rejected"]) == (0, 2)
+
+
+def test_import_catalog_reports_progress_per_commit(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    rows = ((i + 2, {"category": f"Cat {i % 3}", "code": f"C{i}"}) for i in range(25))
+    progress: list[int] = []
+    report = import_service.import_catalog(
+        factory,
+        rows,
+        batch_size=4,
+        commit_every=10,
+        on_progress=lambda r: progress.append(r.rows_read),
+    )
+
+    assert progress == [10, 20, 25]
+    assert (report.categories_created, report.codes_created, report.rejected) == (3, 25, 0)
+    with Session(engine) as db:
+        assert db.scalar(select(ExpenseCode.id).order_by(ExpenseCode.id.desc()).limit(1)) == 25
+        assert len(db.scalars(select(ExpenseCategory)).all()) == 3
+
+
+def test_request_body_is_parsed_as_it_arrives() -> None:
+    events: list[str] = []
+
+    async def body():
+        for chunk in (b"category,code\nTravel,", b"TAXI\n", b"Meals,LUNCH\n"):
+            events.append("chunk")
+            yield chunk
+
+    def parse() -> None:
+        stream = io.TextIOWrapper(io.BufferedReader(RequestBodyReader(body())), encoding="utf-8", newline="")
+        for _line, row in import_service.read_csv(stream):
+            events.append(row["code"])
+
+    async def scenario() -> None:
+        await anyio.to_thread.run_sync(parse)
+
+    anyio.run(scenario)
+    # Each row is handed on as soon as its line is complete, before later chunks are received.
+    assert events == ["chunk", "chunk", "TAXI", "chunk", "LUNCH"]
+
+
+@pytest.mark.parametrize(
+    ("raw", "reason"),
+    [
+        ({"category": "x" * 121}, "category_too_long"),
+        ({"category": "A", "code": "x" * 65}, "code_too_long"),
+        ({"type": "code", "category_id": 1, "code": "X"}, "unsupported_record"),
+        ("garbage", "invalid_record"),
+    ],
+)
+def test_parse_record_rejections(raw: object, reason: str) -> None:
+    with pytest.raises(import_service.RecordError) as exc:
+        import_service.parse_record(raw)
+    assert exc.value.reason == reason
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, _Metric, db_pool_checkout_wait
+from app.db.session import TimedQueuePool, build_engine
+
+
+def _sample(body: str, series: str) -> float | None:
+    match = re.search(rf"^{re.escape(series)} (\S+)$", body, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def test_registry_renders_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight.")
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc(('/a"b',))
+    requests.inc(('/a"b',), 2)
+    latency.observe(0.05)
+    latency.observe(0.1)
+    latency.observe(3.0)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3.0',
+        "# HELP in_flight In flight.",
+        "# TYPE in_flight gauge",
+        "in_flight 0.0",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 3.15",
+        "latency_seconds_count 3",
+    ]
+    in_flight.inc()
+    assert "in_flight 1.0" in registry.render()
+
+
+def test_metric_types_must_implement_reset() -> None:
+    class Incomplete(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "No reset.")
+
+
+def test_metrics_record_route_latency_and_sql_per_request(client: TestClient) -> None:
+    category = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.post(f"/categories/{category}/codes", json={"code": "FLIGHT"})
+    client.get(f"/categories/{category}/codes")
+    client.get("/categories/999/codes")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+
+    route = 'method="GET",route="/categories/{id}/codes"'
+    assert _sample(body, f'http_requests_total{{{route},status="200"}}') == 1
+    assert _sample(body, f'http_requests_total{{{route},status="404"}}') == 1
+    assert _sample(body, f"http_request_duration_seconds_count{{{route}}}") == 2
+    # A page with rows costs one statement; only an empty page adds the category existence check.
+    # Each list read first since its last change also looks up its revision (for the ETag).
+    assert _sample(body, f"http_request_db_statements_sum{{{route}}}") == (1 + 1) + (2 + 1)
+    assert _sample(body, f"http_request_db_seconds_count{{{route}}}") == 2
+    assert _sample(body, 'http_request_db_statements_count{method="POST",route="/categories"}') == 1
+    assert _sample(body, "http_requests_in_flight") == 1  # the /metrics request itself
+
+
+def test_unmatched_paths_share_one_label(client: TestClient) -> None:
+    client.get("/nope/1")
+    client.get("/nope/2")
+
+    body = client.get("/metrics").text
+    assert _sample(body, 'http_requests_total{method="GET",route="<unmatched>",status="404"}') == 2
+
+
+def test_pool_checkout_wait_is_recorded(tmp_path: Path) -> None:
+    db_engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}", replace(settings, metrics_enabled=True))
+    assert isinstance(db_engine.pool, TimedQueuePool)
+
+    db_pool_checkout_wait.reset()
+    with db_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    db_engine.dispose()
+
+    assert 'db_pool_checkout_wait_seconds_count 1' in "\n".join(db_pool_checkout_wait.render())
+
+
+def test_single_row_writes_cost_one_statement(client: TestClient) -> None:
+    category = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    client.put(f"/categories/{category}", json={"name": "Trips"})
+    code = client.post(f"/categories/{category}/codes", json={"code": "FLIGHT"}).json()["id"]
+    client.put(f"/codes/{code}", json={"is_active": False})
+    # Failure paths: a duplicate costs nothing extra; only telling "no category" from
+    # "duplicate code" needs a second look.
+    assert client.post("/categories", json={"name": "Trips"}).status_code == 400  # duplicate_name
+    assert client.put("/codes/999", json={"is_active": True}).status_code == 404
+    assert client.post("/categories/999/codes", json={"code": "X"}).status_code == 404
+
+    body = client.get("/metrics").text
+    statements = "http_request_db_statements_sum{{method=\"{}\",route=\"{}\"}}"
+    assert _sample(body, statements.format("POST", "/categories")) == 1 + 1
+    assert _sample(body, statements.format("PUT", "/categories/{id}")) == 1
+    assert _sample(body, statements.format("PUT", "/codes/{id}")) == 1 + 1
+    assert _sample(body, statements.format("POST", "/categories/{id}/codes")) == 1 + 2
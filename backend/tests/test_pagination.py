@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+
+def _create_category(client: TestClient, name: str) -> int:
+    resp = client.post("/categories", json={"name": name})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def test_list_categories_without_limit_returns_everything(client: TestClient) -> None:
+    for name in ("Meals", "Travel", "Office"):
+        _create_category(client, name)
+
+    resp = client.get("/categories")
+    assert resp.status_code == 200
+    assert [c["name"] for c in resp.json()] == ["Meals", "Travel", "Office"]
+    assert NEXT_CURSOR_HEADER not in resp.headers
+
+
+def test_list_categories_keyset_pages(client: TestClient) -> None:
+    names = [f"Cat {i}" for i in range(5)]
+    for name in names:
+        _create_category(client, name)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        resp = client.get("/categories", params=params)
+        assert resp.status_code == 200
+        seen.extend(c["name"] for c in resp.json())
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params = {"limit": 2, "after": cursor}
+
+    assert seen == names
+
+
+def test_list_categories_desc_order(client: TestClient) -> None:
+    for name in ("A", "B", "C"):
+        _create_category(client, name)
+
+    first = client.get("/categories", params={"limit": 2, "order": "desc"})
+    assert [c["name"] for c in first.json()] == ["C", "B"]
+
+    second = client.get(
+        "/categories",
+        params={"limit": 2, "order": "desc", "after": first.headers[NEXT_CURSOR_HEADER]},
+    )
+    assert [c["name"] for c in second.json()] == ["A"]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+def test_list_categories_filters(client: TestClient) -> None:
+    _create_category(client, "Travel")
+    _create_category(client, "Transport")
+    meals = _create_category(client, "Meals")
+    client.put(f"/categories/{meals}", json={"is_active": False})
+
+    inactive = client.get("/categories", params={"is_active": False}).json()
+    assert [c["name"] for c in inactive] == ["Meals"]
+
+    prefixed = client.get("/categories", params={"name_prefix": "Tra"}).json()
+    assert [c["name"] for c in prefixed] == ["Travel", "Transport"]
+
+
+def test_list_categories_invalid_cursor_returns_400(client: TestClient) -> None:
+    resp = client.get("/categories", params={"limit": 2, "after": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "invalid_cursor"
+
+
+def test_list_categories_limit_out_of_range_returns_422(client: TestClient) -> None:
+    resp = client.get("/categories", params={"limit": 0})
+    assert resp.status_code == 422
+
+
+def test_list_codes_keyset_pages_with_filters(client: TestClient) -> None:
+    category_id = _create_category(client, "Travel")
+    ids = []
+    for code in ("FLIGHT", "FUEL", "HOTEL", "FERRY"):
+        resp = client.post(f"/categories/{category_id}/codes", json={"code": code})
+        ids.append(resp.json()["id"])
+    client.put(f"/codes/{ids[1]}", json={"is_active": False})
+
+    first = client.get(
+        f"/categories/{category_id}/codes",
+        params={"limit": 1, "is_active": True, "code_prefix": "F"},
+    )
+    assert [c["code"] for c in first.json()] == ["FLIGHT"]
+
+    second = client.get(
+        f"/categories/{category_id}/codes",
+        params={
+            "limit": 1,
+            "is_active": True,
+            "code_prefix": "F",
+            "after": first.headers[NEXT_CURSOR_HEADER],
+        },
+    )
+    assert [c["code"] for c in second.json()] == ["FERRY"]
+    assert NEXT_CURSOR_HEADER not in second.headers
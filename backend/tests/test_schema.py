@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import revisions
+from app.db.models import Base, ExpenseCategory, ExpenseCode
+from app.db.schema import (
+    SCHEMA_VERSION,
+    _write_schema_state,
+    bootstrap_schema,
+    migration_lock,
+    read_schema_state,
+    schema_fingerprint,
+    schema_version_table,
+)
+from app.db.search import FTS_TABLE
+from app.db.session import build_engine, warm_pool
+from app.modules.expenses.warmup import warm_up
+
+
+@pytest.fixture
+def db_engine(tmp_path: Path) -> Iterator[Engine]:
+    db_engine = build_engine(f"sqlite:///{tmp_path / 'schema.db'}", settings)
+    yield db_engine
+    db_engine.dispose()
+
+
+def test_fresh_database_is_created_and_stamped(db_engine: Engine) -> None:
+    report = bootstrap_schema(db_engine)
+    assert (report.action, report.from_version, report.to_version) == ("created", None, SCHEMA_VERSION)
+
+    with db_engine.connect() as connection:
+        state = read_schema_state(connection)
+        tables = set(inspect(connection).get_table_names())
+    assert state is not None
+    assert (state.version, state.fingerprint) == (SCHEMA_VERSION, schema_fingerprint(db_engine.dialect))
+    assert {"expense_categories", "expense_codes", FTS_TABLE} <= tables
+
+    assert bootstrap_schema(db_engine).action == "checked"
+
+
+def test_unversioned_database_is_migrated_in_place(db_engine: Engine) -> None:
+    # A database from before versioning: tables and data, no search index, no version row.
+    Base.metadata.create_all(db_engine)
+    with db_engine.begin() as connection:
+        connection.execute(insert(ExpenseCategory), [{"name": "Travel", "is_active": True}])
+
+    report = bootstrap_schema(db_engine)
+    assert (report.action, report.from_version) == ("migrated", 0)
+
+    with db_engine.connect() as connection:
+        assert read_schema_state(connection).version == SCHEMA_VERSION
+        assert connection.execute(select(ExpenseCategory.name)).scalars().all() == ["Travel"]
+        assert inspect(connection).has_table(FTS_TABLE)
+
+
+def test_drift_is_reported_but_not_migrated(db_engine: Engine, caplog: pytest.LogCaptureFixture) -> None:
+    bootstrap_schema(db_engine)
+    with db_engine.begin() as connection:
+        connection.execute(update(schema_version_table).values(fingerprint="edited-by-hand"))
+
+    with caplog.at_level(logging.WARNING, logger="app.db.schema"):
+        assert bootstrap_schema(db_engine).action == "checked"
+    assert "fingerprint mismatch" in caplog.text
+
+    caplog.clear()
+    with db_engine.begin() as connection:
+        connection.execute(update(schema_version_table).values(version=SCHEMA_VERSION + 1))
+    with caplog.at_level(logging.WARNING, logger="app.db.schema"):
+        report = bootstrap_schema(db_engine)
+    assert (report.action, report.to_version) == ("checked", SCHEMA_VERSION + 1)
+    assert "newer than this release" in caplog.text
+
+
+def test_waiting_worker_skips_migration_done_by_lock_holder(db_engine: Engine) -> None:
+    reports = []
+    waiter = threading.Thread(target=lambda: reports.append(bootstrap_schema(db_engine)))
+
+    with migration_lock(db_engine) as connection:
+        waiter.start()
+        time.sleep(0.2)
+        assert not reports  # blocked on the lock
+        Base.metadata.create_all(bind=connection)
+        _write_schema_state(connection, SCHEMA_VERSION, schema_fingerprint(db_engine.dialect))
+    waiter.join(timeout=10)
+
+    # It re-checked under the lock and found the schema current.
+    assert [report.action for report in reports] == ["checked"]
+
+
+def test_warm_up_opens_pool_and_runs_hot_statements(db_engine: Engine) -> None:
+    bootstrap_schema(db_engine)
+
+    assert warm_pool(db_engine, 3) == 3
+    assert db_engine.pool.checkedin() == 3
+
+    with Session(db_engine) as db:
+        warm_up(db)
+
+
+def test_revision_columns_are_added_to_a_v1_database(db_engine: Engine) -> None:
+    bootstrap_schema(db_engine)
+    with db_engine.begin() as connection:
+        # Back to the v1 layout, with a row written before revisions existed.
+        for table in ("expense_categories", "expense_codes"):
+            connection.execute(text(f"DROP INDEX ix_{table}_revision"))
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN revision"))
+        connection.execute(text("INSERT INTO expense_categories (name, is_active) VALUES ('Travel', 1)"))
+        connection.execute(update(schema_version_table).values(version=1))
+
+    report = bootstrap_schema(db_engine)
+    assert (report.action, report.from_version, report.to_version) == ("migrated", 1, SCHEMA_VERSION)
+
+    with db_engine.begin() as connection:
+        for table in ("expense_categories", "expense_codes"):
+            assert f"ix_{table}_revision" in {index["name"] for index in inspect(connection).get_indexes(table)}
+        connection.execute(insert(ExpenseCategory), [{"name": "Meals", "is_active": True}])
+        rows = connection.execute(select(ExpenseCategory.name, ExpenseCategory.revision).order_by("id")).all()
+    assert rows == [("Travel", 1), ("Meals", 2)]
+
+
+def test_revisions_come_from_the_counter_where_writers_are_concurrent() -> None:
+    stmt = update(ExpenseCode).values(is_active=False)
+    assert "SELECT catalog_revision.value" in str(stmt.compile(dialect=postgresql.dialect()))
+    rendered = str(stmt.compile(dialect=sqlite.dialect()))
+    assert "catalog_revision" not in rendered and "max(revision)" in rendered
+
+
+def test_each_writing_transaction_bumps_the_revision_counter_once(
+    db_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The counter logic is dialect-independent; run it on SQLite (which normally skips it).
+    bootstrap_schema(db_engine)
+    monkeypatch.setattr(revisions, "uses_revision_counter", lambda _dialect: True)
+    counter = select(revisions.revision_counter_table.c.value)
+    with db_engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO expense_categories (id, name, is_active, revision) VALUES (1, 'Travel', 1, 1)")
+        )
+        revisions.install_revision_counter(connection)  # continues from the rows already there
+        assert connection.execute(counter).scalar_one() == 1
+
+    with db_engine.begin() as connection:
+        connection.execute(insert(ExpenseCategory), [{"name": "Meals"}])
+        connection.execute(update(ExpenseCategory).values(is_active=False))
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TAXI"}])
+    with db_engine.begin() as connection:
+        connection.execute(select(ExpenseCategory.id)).all()  # reads take no revision
+    with db_engine.begin() as connection:
+        assert connection.execute(counter).scalar_one() == 2
+        connection.execute(update(ExpenseCode).values(is_active=False))
+        assert connection.execute(counter).scalar_one() == 3
+        # A savepoint rollback can undo the bump, so the next write takes the counter again.
+        with connection.begin_nested() as savepoint:
+            connection.execute(update(ExpenseCode).values(description="x"))
+            savepoint.rollback()
+        connection.execute(update(ExpenseCode).values(description="y"))
+        assert connection.execute(counter).scalar_one() == 4
+
+
+def test_code_counts_are_added_to_a_v2_database(db_engine: Engine) -> None:
+    bootstrap_schema(db_engine)
+    with db_engine.begin() as connection:
+        # Back to the v2 layout, with codes written before the counters existed.
+        for trigger in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER expense_codes_count_{trigger}"))
+        for name in ("active_codes", "inactive_codes"):
+            connection.execute(text(f"ALTER TABLE expense_categories DROP COLUMN {name}"))
+        connection.execute(
+            text("INSERT INTO expense_categories (id, name, is_active, revision) VALUES (1, 'Travel', 1, 1)")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO expense_codes (category_id, code, is_active, revision) "
+                "VALUES (1, 'TAXI', 1, 1), (1, 'BUS', 0, 1)"
+            )
+        )
+        connection.execute(update(schema_version_table).values(version=2))
+
+    report = bootstrap_schema(db_engine)
+    assert (report.action, report.from_version) == ("migrated", 2)
+
+    with db_engine.begin() as connection:
+        connection.execute(insert(ExpenseCode), [{"category_id": 1, "code": "TRAM"}])
+        counts = connection.execute(select(ExpenseCategory.active_codes, ExpenseCategory.inactive_codes)).one()
+    assert counts == (2, 1)  # backfilled, then kept by the triggers
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.errors import ValidationError
+from app.db.models import Base
+from app.db.schema import bootstrap_schema
+from app.db.search import drop_search_index
+from app.modules.expenses.codes.service import fts_query
+
+
+def _seed(client: TestClient) -> tuple[int, int]:
+    travel = client.post("/categories", json={"name": "Travel"}).json()["id"]
+    meals = client.post("/categories", json={"name": "Meals"}).json()["id"]
+    client.post(
+        f"/categories/{travel}/codes:bulk",
+        json=[
+            {"code": "FLIGHT", "description": "Air travel"},
+            {"code": "HOTEL", "description": "Accommodation while travelling"},
+            {"code": "TRAVEL-MISC", "description": "Other"},
+        ],
+    )
+    client.post(f"/categories/{meals}/codes", json={"code": "FLIGHT-MEAL", "description": "Food in flight"})
+    return travel, meals
+
+
+def test_search_prefix_matches_code_and_description(client: TestClient) -> None:
+    _seed(client)
+
+    codes = [c["code"] for c in client.get("/codes/search", params={"q": "fli"}).json()]
+    assert set(codes) == {"FLIGHT", "FLIGHT-MEAL"}
+
+    # A hit on the code ranks above a hit on the description only.
+    codes = [c["code"] for c in client.get("/codes/search", params={"q": "trav"}).json()]
+    assert codes[0] == "TRAVEL-MISC"
+    assert set(codes) == {"TRAVEL-MISC", "FLIGHT", "HOTEL"}
+
+
+def test_search_scoped_to_category_and_active(client: TestClient) -> None:
+    travel, meals = _seed(client)
+
+    in_meals = client.get("/codes/search", params={"q": "flight", "category_id": meals}).json()
+    assert [c["code"] for c in in_meals] == ["FLIGHT-MEAL"]
+
+    flight = next(c for c in client.get(f"/categories/{travel}/codes").json() if c["code"] == "FLIGHT")
+    client.put(f"/codes/{flight['id']}", json={"is_active": False})
+    active = client.get("/codes/search", params={"q": "flight", "is_active": True}).json()
+    assert [c["code"] for c in active] == ["FLIGHT-MEAL"]
+    assert active[0]["is_active"] is True
+
+
+def test_search_index_follows_description_updates(client: TestClient) -> None:
+    travel, _ = _seed(client)
+    hotel = next(c for c in client.get(f"/categories/{travel}/codes").json() if c["code"] == "HOTEL")
+
+    client.put(f"/codes/{hotel['id']}", json={"description": "Lodging"})
+    assert client.get("/codes/search", params={"q": "accommodation"}).json() == []
+    assert [c["code"] for c in client.get("/codes/search", params={"q": "lodg"}).json()] == ["HOTEL"]
+
+
+def test_search_survives_fts_syntax_in_query(client: TestClient) -> None:
+    _seed(client)
+    resp = client.get("/codes/search", params={"q": 'flight" OR NEAR(*'})
+    assert resp.status_code == 200
+
+
+def test_search_blank_query_returns_400(client: TestClient) -> None:
+    resp = client.get("/codes/search", params={"q": '  "" '})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["code"] == "empty_query"
+
+
+def test_fts_query_quotes_terms() -> None:
+    assert fts_query('air  tr"av') == '"air"* "tr""av"*'
+    with pytest.raises(ValidationError):
+        fts_query("   ")
+
+
+def test_bootstrap_backfills_search_index_of_existing_database(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        drop_search_index(conn)  # a database created before the index existed
+        conn.execute(text("INSERT INTO expense_categories (id, name, is_active, revision) VALUES (1, 'Travel', 1, 1)"))
+        conn.execute(text("INSERT INTO expense_codes (category_id, code, is_active, revision) VALUES (1, 'TAXI', 1, 1)"))
+
+    # No `schema_version` row: adopted as a pre-versioning database and migrated.
+    assert bootstrap_schema(engine).action == "migrated"
+    assert bootstrap_schema(engine).action == "checked"
+
+    with engine.connect() as conn:
+        hits = conn.execute(text("SELECT rowid FROM expense_codes_fts WHERE expense_codes_fts MATCH 'taxi'")).all()
+    assert len(hits) == 1
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.modules.expenses.catalog.schemas import CatalogCategoryOut, CatalogCategoryRecord, catalog_encoder
+from app.modules.expenses.categories.schemas import CategoryOut, CategoryRecord
+from app.modules.expenses.codes.schemas import CodeOut, CodeRecord, code_list_encoder
+
+# Quotes, backslashes, control characters, non-ASCII and astral-plane characters.
+AWKWARD = 'a"b\\c\n\t\x00\x1f\x7f é € 😀  '
+
+
+def _model_bytes(models: list) -> bytes:
+    """What FastAPI renders for ``response_model=list[Model]``."""
+
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def test_records_mirror_response_models() -> None:
+    assert list(CodeRecord.__annotations__) == list(CodeOut.model_fields)
+    assert list(CategoryRecord.__annotations__) == list(CategoryOut.model_fields)
+    assert list(CatalogCategoryRecord.__annotations__) == list(CatalogCategoryOut.model_fields)
+
+
+def test_encoder_is_byte_compatible_with_response_model() -> None:
+    codes = [
+        {"id": 1, "category_id": 7, "code": AWKWARD, "description": None, "is_active": True},
+        {"id": 2, "category_id": 7, "code": "X", "description": AWKWARD, "is_active": False},
+    ]
+    assert code_list_encoder.encode(codes) == _model_bytes([CodeOut(**c) for c in codes])
+
+    catalog = [{"id": 7, "name": AWKWARD, "is_active": True, "codes": codes}]
+    assert catalog_encoder.encode(catalog) == _model_bytes([CatalogCategoryOut(**c) for c in catalog])
+
+
+def test_list_endpoints_serve_json_bytes(client: TestClient) -> None:
+    category = client.post("/categories", json={"name": AWKWARD}).json()
+    code = client.post(f"/categories/{category['id']}/codes", json={"code": "Z1", "description": AWKWARD}).json()
+
+    resp = client.get("/categories")
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.content == _model_bytes([CategoryOut(**category)])
+
+    resp = client.get(f"/categories/{category['id']}/codes")
+    assert resp.content == _model_bytes([CodeOut(**code)])
+
+    resp = client.get("/codes/search", params={"q": "z1"})
+    assert resp.content == _model_bytes([CodeOut(**code)])
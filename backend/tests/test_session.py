@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.errors import register_error_handlers
+from app.db.models import ExpenseCategory
+from app.db.schema import bootstrap_schema
+from app.db.session import build_engine, engine_options, get_db, get_read_db, sqlite_pragmas
+from app.db.uow import UnitOfWork
+from app.modules.expenses.cache import payload_cache
+from app.modules.expenses.categories.router import router as categories_router
+
+
+def test_production_profile_applies_pragmas(tmp_path: Path) -> None:
+    cfg = replace(settings, sqlite_profile="production", sqlite_busy_timeout_ms=1234)
+    db_engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}", cfg)
+
+    with db_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    db_engine.dispose()
+
+
+def test_legacy_profile_only_enables_foreign_keys() -> None:
+    assert sqlite_pragmas(replace(settings, sqlite_profile="legacy")) == ["PRAGMA foreign_keys=ON"]
+
+
+def test_pool_options_skip_sizing_for_in_memory_sqlite() -> None:
+    cfg = replace(settings, db_pool_size=7, db_max_overflow=3, db_pool_pre_ping=True)
+
+    assert engine_options("sqlite:///:memory:", cfg) == {"pool_pre_ping": True}
+    options = engine_options("sqlite:///./app.db", cfg)
+    assert (options["pool_size"], options["max_overflow"]) == (7, 3)
+
+
+def _file_engine(path: Path, *, read_only: bool = False):
+    url = f"sqlite:///file:{path}?mode=ro&uri=true" if read_only else f"sqlite:///{path}"
+    return build_engine(url, settings)
+
+
+def test_list_routes_read_from_replica_and_writes_go_to_primary(tmp_path: Path) -> None:
+    primary, replica = _file_engine(tmp_path / "primary.db"), _file_engine(tmp_path / "replica.db")
+    for db_engine in (primary, replica):
+        bootstrap_schema(db_engine)
+    with replica.begin() as conn:
+        conn.execute(insert(ExpenseCategory), [{"name": "Replicated", "is_active": True}])
+
+    write_factory = sessionmaker(bind=primary, expire_on_commit=False)
+    read_factory = sessionmaker(bind=replica, expire_on_commit=False)
+
+    def override_get_db() -> Iterator[Session]:
+        with UnitOfWork(write_factory) as uow:
+            yield uow.session
+
+    def override_get_read_db() -> Iterator[Session]:
+        with UnitOfWork(read_factory, read_only=True) as uow:
+            yield uow.session
+
+    app = FastAPI()
+    register_error_handlers(app)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.include_router(categories_router)
+
+    payload_cache.clear()
+    with TestClient(app) as client:
+        created = client.post("/categories", json={"name": "Written"})
+        assert created.status_code == 201
+        # The write's own response reads from the primary...
+        assert created.json()["name"] == "Written"
+        # ...list routes from the replica, which has not caught up.
+        assert [c["name"] for c in client.get("/categories").json()] == ["Replicated"]
+    payload_cache.clear()
+
+    with primary.connect() as conn:
+        assert conn.execute(select(ExpenseCategory.name)).scalars().all() == ["Written"]
+    primary.dispose()
+    replica.dispose()
+
+
+def test_read_only_unit_of_work_never_commits(tmp_path: Path) -> None:
+    path = tmp_path / "app.db"
+    primary = _file_engine(path)
+    bootstrap_schema(primary)
+    read_only = _file_engine(path, read_only=True)
+
+    with UnitOfWork(sessionmaker(bind=primary), read_only=True) as uow:
+        uow.session.add(ExpenseCategory(name="Discarded", is_active=True))
+        uow.session.flush()
+    with pytest.raises(OperationalError, match="readonly"):
+        with UnitOfWork(sessionmaker(bind=read_only)) as uow:
+            uow.session.add(ExpenseCategory(name="Rejected", is_active=True))
+
+    with read_only.connect() as conn:
+        assert conn.execute(select(ExpenseCategory.id)).first() is None
+    primary.dispose()
+    read_only.dispose()
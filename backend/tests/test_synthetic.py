@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+
+from app.db.counts import count_drift
+from app.db.models import ExpenseCategory, ExpenseCode
+from app.db.search import FTS_TABLE
+from app.db.synthetic import (
+    SyntheticSpec,
+    category_sizes,
+    ensure_snapshot,
+    generate,
+    generate_database,
+    restore_snapshot,
+)
+
+SPEC = SyntheticSpec(categories=40, codes=2_000, seed=7)
+
+
+def _dump(url: str) -> tuple[list, list]:
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        categories = conn.execute(select(ExpenseCategory.__table__).order_by(ExpenseCategory.id)).all()
+        codes = conn.execute(select(ExpenseCode.__table__).order_by(ExpenseCode.id)).all()
+    engine.dispose()
+    return categories, codes
+
+
+def _generate(tmp_path: Path, name: str, spec: SyntheticSpec) -> str:
+    url = f"sqlite:///{tmp_path / name}"
+    engine = create_engine(url)
+    generate_database(engine, spec)
+    engine.dispose()
+    return url
+
+
+def test_generation_is_deterministic_per_seed(tmp_path: Path) -> None:
+    first = _dump(_generate(tmp_path, "a.db", SPEC))
+    assert first == _dump(_generate(tmp_path, "b.db", SPEC))
+    assert first != _dump(_generate(tmp_path, "c.db", SyntheticSpec(categories=40, codes=2_000, seed=8)))
+
+
+def test_catalog_shape_is_skewed_and_mixed(tmp_path: Path) -> None:
+    categories, codes = _dump(_generate(tmp_path, "a.db", SPEC))
+
+    assert len(categories) == 40 and len(codes) == 2_000
+    sizes = sorted(category_sizes(SPEC, random.Random(0)), reverse=True)
+    assert sum(sizes) == 2_000
+    assert sizes[0] > 10 * sizes[len(sizes) // 2]  # a few huge categories, a long tail
+
+    assert {c.is_active for c in categories} == {True, False}
+    assert {c.is_active for c in codes} == {True, False}
+    descriptions = [c.description for c in codes]
+    assert None in descriptions
+    assert max(len(d) for d in descriptions if d) > 200
+
+
+def test_search_index_is_rebuilt_after_load(tmp_path: Path) -> None:
+    engine = create_engine(_generate(tmp_path, "a.db", SPEC))
+    with engine.connect() as conn:
+        indexed = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'hotel'")).scalar()
+        expected = conn.execute(
+            select(func.count()).select_from(ExpenseCode).where(ExpenseCode.description.like("%hotel%"))
+        ).scalar()
+        # Triggers are back in place for later writes.
+        triggers = conn.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'expense_codes_fts_%'")
+        ).scalar()
+        drift = count_drift(conn)
+    engine.dispose()
+    assert indexed == expected > 0
+    assert triggers == 3
+    assert drift == 0  # code counters rebuilt as well
+
+
+def test_refuses_non_empty_catalog(tmp_path: Path) -> None:
+    engine = create_engine(_generate(tmp_path, "a.db", SPEC))
+    with engine.begin() as conn, pytest.raises(ValueError, match="empty catalog"):
+        generate(conn, SPEC)
+    engine.dispose()
+
+
+def test_snapshot_is_generated_once_and_cloned(tmp_path: Path) -> None:
+    snapshot = ensure_snapshot(SPEC, tmp_path / "snapshots")
+    mtime = snapshot.stat().st_mtime_ns
+    assert ensure_snapshot(SPEC, tmp_path / "snapshots").stat().st_mtime_ns == mtime
+    assert [p.name for p in snapshot.parent.iterdir()] == [SPEC.snapshot_name]
+
+    clone = restore_snapshot(snapshot, tmp_path / "run" / "app.db")
+    categories, codes = _dump(f"sqlite:///{clone}")
+    assert (len(categories), len(codes)) == (40, 2_000)